@@ -17,6 +17,7 @@ limitations under the License.
 from . import langtrace
 from .extensions.langtrace_filesystem import LangTraceFileSystem
 from .utils.prompt_registry import get_prompt_from_registry
+from .utils.runtime_config import reload_config
 from .utils.with_root_span import (
     SendUserFeedback,
     inject_additional_attributes,
@@ -32,4 +33,5 @@ __all__ = [
     "get_prompt_from_registry",
     "SendUserFeedback",
     "LangTraceFileSystem",
+    "reload_config",
 ]
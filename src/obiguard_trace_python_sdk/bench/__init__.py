@@ -0,0 +1,3 @@
+"""
+Benchmarks for the SDK itself. Run ``python -m obiguard_trace_python_sdk.bench --help``.
+"""
@@ -0,0 +1,56 @@
+import argparse
+import json
+import sys
+
+from . import attributes, overhead, pricing, prompt_tokens, startup, streaming
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m obiguard_trace_python_sdk.bench")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    startup.add_arguments(
+        subparsers.add_parser(
+            "startup", help="Import and init() wall time, RSS and import cost"
+        )
+    )
+    attributes.add_arguments(
+        subparsers.add_parser(
+            "attributes", help="Per-call cost of building span attributes"
+        )
+    )
+    overhead.add_arguments(
+        subparsers.add_parser(
+            "overhead", help="Instrumented vs raw call overhead per call"
+        )
+    )
+    streaming.add_arguments(
+        subparsers.add_parser(
+            "streaming", help="Per-chunk StreamWrapper cost on synthetic streams"
+        )
+    )
+    prompt_tokens.add_arguments(
+        subparsers.add_parser(
+            "prompt_tokens", help="Prompt token counting over a multi-turn replay"
+        )
+    )
+
+    pricing.add_arguments(
+        subparsers.add_parser(
+            "pricing", help="Cost stamping of exported span batches"
+        )
+    )
+
+    args = parser.parse_args(argv)
+    report = args.run(args)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
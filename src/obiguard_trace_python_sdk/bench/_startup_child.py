@@ -0,0 +1,199 @@
+"""
+Measures one cold start of the SDK. Run by `bench.startup` as a plain script in
+a fresh interpreter so nothing from the SDK is imported before measuring; do
+not import this module from the package.
+"""
+
+import contextlib
+import importlib.abc
+import io
+import json
+import os
+import sys
+import time
+
+# Running a file by path puts its directory first on sys.path; drop it so the
+# bench modules cannot shadow anything.
+sys.path.pop(0)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+    return None
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, profiler, name):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler.enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.exit(self._name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """
+    In-process equivalent of ``-X importtime``: self and cumulative time of
+    every module executed while installed on ``sys.meta_path``.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self._stack = []
+        self._resolving = set()
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self._resolving:
+            return None
+        self._resolving.add(fullname)
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                find_spec = getattr(finder, "find_spec", None)
+                if finder is self or find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._resolving.discard(fullname)
+
+        if spec is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self, fullname)
+        return spec
+
+    def enter(self):
+        # [start, time spent in nested imports]
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def exit(self, name):
+        start, children = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][1] += cumulative
+        self.records[name] = {
+            "self_ms": round((cumulative - children) * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+
+    def snapshot(self):
+        return dict(self.records)
+
+
+def top_modules(records, limit):
+    ordered = sorted(records.items(), key=lambda item: -item[1]["self_ms"])
+    return [dict(module=name, **timing) for name, timing in ordered[:limit]]
+
+
+def main():
+    options = json.loads(sys.argv[1])
+    os.environ.setdefault("LANGTRACE_SDK_VERSION_CHECK", "false")
+    os.environ.setdefault("LANGTRACE_ERROR_REPORTING", "False")
+
+    profiler = ImportProfiler()
+    profiler.install()
+    baseline_rss = current_rss_kb()
+
+    start = time.perf_counter()
+    import obiguard_trace_python_sdk  # noqa: F401
+
+    import_ms = (time.perf_counter() - start) * 1000
+    import_rss = current_rss_kb()
+    import_modules = profiler.snapshot()
+    profiler.records = {}
+
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    from obiguard_trace_python_sdk import langtrace
+
+    instrumentors = []
+    instrument_package = langtrace.instrument_package
+
+    def timed_instrument_package(name, instrumentation):
+        modules_before = len(sys.modules)
+        rss_before = current_rss_kb()
+        started = time.perf_counter()
+        instrument_package(name, instrumentation)
+        instrumentors.append(
+            {
+                "name": name,
+                "wall_ms": round((time.perf_counter() - started) * 1000, 3),
+                "modules_imported": len(sys.modules) - modules_before,
+                "rss_delta_kb": (
+                    current_rss_kb() - rss_before if rss_before is not None else None
+                ),
+            }
+        )
+
+    langtrace.instrument_package = timed_instrument_package
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        langtrace.init(
+            custom_remote_exporter=InMemorySpanExporter(),
+            batch=False,
+            **options["init_kwargs"],
+        )
+    init_ms = (time.perf_counter() - start) * 1000
+    init_rss = current_rss_kb()
+    profiler.uninstall()
+
+    limit = options["top_modules"]
+    result = {
+        "import": {
+            "wall_ms": round(import_ms, 3),
+            "rss_kb": import_rss,
+            "rss_delta_kb": (
+                import_rss - baseline_rss if baseline_rss is not None else None
+            ),
+            "modules_imported": len(import_modules),
+            "top_modules": top_modules(import_modules, limit),
+        },
+        "init": {
+            "wall_ms": round(init_ms, 3),
+            "rss_kb": init_rss,
+            "rss_delta_kb": (
+                init_rss - import_rss if import_rss is not None else None
+            ),
+            "modules_imported": len(profiler.records),
+            "top_modules": top_modules(profiler.records, limit),
+            "instrumentors": sorted(instrumentors, key=lambda i: -i["wall_ms"]),
+        },
+    }
+    sys.stdout.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Per-call cost of building the static span attributes of an LLM call.
+"""
+
+import importlib.metadata
+import timeit
+
+from langtrace.trace_attributes import SpanAttributes
+
+from ..constants import LANGTRACE_SDK_NAME
+from ..utils.llm import get_langtrace_attributes
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--number", type=int, default=20000, help="Calls per measurement"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements per case")
+    parser.set_defaults(run=run)
+
+
+def uncached_langtrace_attributes(version, service_provider, vendor_type="llm"):
+    # What every traced call paid before the templates: a metadata lookup and
+    # a fresh dict.
+    return {
+        SpanAttributes.LANGTRACE_SDK_NAME: LANGTRACE_SDK_NAME,
+        SpanAttributes.LANGTRACE_VERSION: importlib.metadata.version(
+            LANGTRACE_SDK_NAME
+        ),
+        SpanAttributes.LANGTRACE_SERVICE_VERSION: version,
+        SpanAttributes.LANGTRACE_SERVICE_NAME: service_provider,
+        SpanAttributes.LANGTRACE_SERVICE_TYPE: vendor_type,
+        SpanAttributes.LLM_SYSTEM: service_provider.lower(),
+    }
+
+
+def measure(func, number, repeat):
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return round(best / number * 1e9, 1)
+
+
+def run(args):
+    request_attributes = {SpanAttributes.LLM_REQUEST_MODEL: "gpt-4o"}
+    cases = {
+        "uncached": lambda: {
+            **uncached_langtrace_attributes("1.0.0", "OpenAI"),
+            **request_attributes,
+        },
+        "template": lambda: {
+            **get_langtrace_attributes("1.0.0", "OpenAI"),
+            **request_attributes,
+        },
+    }
+    results = {
+        name: {"ns_per_call": measure(func, args.number, args.repeat)}
+        for name, func in cases.items()
+    }
+    results["template"]["speedup"] = round(
+        results["uncached"]["ns_per_call"] / results["template"]["ns_per_call"], 1
+    )
+    return {"benchmark": "attributes", "number": args.number, "cases": results}
@@ -0,0 +1,78 @@
+"""
+Per-call overhead of an instrumented call over the raw call, with span
+attributes built by the fast path, with pydantic validation turned on, and
+with the span dropped by the sampler.
+"""
+
+import timeit
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+
+from ..instrumentation.chroma.patch import collection_patch
+from ..utils.runtime_config import get_config, reload_config
+from .attributes import measure
+
+
+class _DroppingExporter(SpanExporter):
+    def export(self, spans):
+        return SpanExportResult.SUCCESS
+
+
+class _Collection:
+    name = "bench"
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--number", type=int, default=5000, help="Calls per measurement"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements per case")
+    parser.set_defaults(run=run)
+
+
+def raw_add(ids=None, documents=None):
+    return None
+
+
+def traced_add(sampler=None):
+    provider = TracerProvider(sampler=sampler)
+    provider.add_span_processor(SimpleSpanProcessor(_DroppingExporter()))
+    traced = collection_patch("ADD", "1.0.0", provider.get_tracer(__name__))
+    return provider, traced
+
+
+def run(args):
+    instance = _Collection()
+    kwargs = {"ids": ["1", "2"], "documents": ["hello", "world"]}
+    results = {
+        "raw": {
+            "ns_per_call": measure(lambda: raw_add(**kwargs), args.number, args.repeat)
+        }
+    }
+    cases = (
+        ("instrumented", None, False),
+        ("instrumented_validated", None, True),
+        ("instrumented_unsampled", ALWAYS_OFF, False),
+    )
+    previous = get_config()
+    try:
+        for name, sampler, enabled in cases:
+            provider, traced = traced_add(sampler)
+            reload_config(validate_span_attributes=enabled)
+            ns_per_call = measure(
+                lambda: traced(raw_add, instance, (), kwargs), args.number, args.repeat
+            )
+            provider.shutdown()
+            results[name] = {
+                "ns_per_call": ns_per_call,
+                "overhead_ns": round(ns_per_call - results["raw"]["ns_per_call"], 1),
+            }
+    finally:
+        reload_config(**previous._asdict())
+    return {"benchmark": "overhead", "number": args.number, "cases": results}
@@ -0,0 +1,101 @@
+"""
+Cost of pricing exported span batches: the time `CostSpanExporter` adds to
+each export, with NumPy and with the pure Python fallback.
+"""
+
+import random
+import time
+
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.sdk.trace import ReadableSpan
+
+from ..utils import pricing
+from ..utils.pricing import batch_costs, get_price_table, price_spans
+
+MODELS = (
+    ("openai", "gpt-4o-2024-08-06"),
+    ("openai", "gpt-4o-mini"),
+    ("anthropic", "claude-3-5-sonnet-20241022"),
+    ("gemini", "gemini-2.0-flash"),
+    ("aws bedrock", "us.anthropic.claude-3-5-haiku-20241022-v1:0"),
+    ("groq", "llama-3.1-8b-instant"),
+)
+
+
+def add_arguments(parser):
+    parser.add_argument("--spans", type=int, default=512, help="Spans per batch")
+    parser.add_argument("--repeat", type=int, default=200, help="Batches per case")
+    parser.set_defaults(run=run)
+
+
+def llm_spans(count, seed=0):
+    rng = random.Random(seed)
+    spans = []
+    for _ in range(count):
+        provider, model = rng.choice(MODELS)
+        spans.append(
+            ReadableSpan(
+                name="chat",
+                attributes={
+                    SpanAttributes.LLM_SYSTEM: provider,
+                    SpanAttributes.LLM_RESPONSE_MODEL: model,
+                    SpanAttributes.LLM_USAGE_PROMPT_TOKENS: rng.randint(10, 8000),
+                    SpanAttributes.LLM_USAGE_COMPLETION_TOKENS: rng.randint(1, 2000),
+                },
+            )
+        )
+    return spans
+
+
+def time_batches(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat
+
+
+def run(args):
+    spans = llm_spans(args.spans)
+    price_table = get_price_table()
+    price_spans(spans, price_table)
+
+    # The columns `price_spans` passes to `batch_costs`, built once.
+    rates = {}
+    columns = pricing.array("d"), pricing.array("d"), pricing.array("d")
+    rate_index = pricing.array("q")
+    for span in spans:
+        span_rates = price_table.rates(
+            span.attributes[SpanAttributes.LLM_SYSTEM],
+            span.attributes[SpanAttributes.LLM_RESPONSE_MODEL],
+        )
+        columns[0].append(span.attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS])
+        columns[1].append(span.attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS])
+        columns[2].append(0)
+        rate_index.append(rates.setdefault(span_rates, len(rates)))
+    rates = list(rates)
+
+    report = {
+        "benchmark": "pricing",
+        "spans": args.spans,
+        "numpy_installed": pricing._numpy() is not None,
+    }
+    vectorize_min = pricing.VECTORIZE_MIN
+    for case, threshold in (("numpy", vectorize_min), ("python", args.spans + 1)):
+        if case == "numpy" and not report["numpy_installed"]:
+            continue
+        pricing.VECTORIZE_MIN = threshold
+        try:
+            costs = time_batches(
+                lambda: batch_costs(*columns, rate_index, rates), args.repeat
+            )
+            export = time_batches(
+                lambda: price_spans(spans, price_table), args.repeat
+            )
+        finally:
+            pricing.VECTORIZE_MIN = vectorize_min
+        report[case] = {
+            "batch_costs_us": round(costs * 1e6, 1),
+            "price_spans_us": round(export * 1e6, 1),
+            "price_spans_us_per_span": round(export * 1e6 / args.spans, 3),
+        }
+    return report
@@ -0,0 +1,77 @@
+"""
+Prompt token counting over a replayed multi-turn conversation: every turn
+sends the whole history, as chat clients do. Compares counting each message
+from scratch with the prompt token cache.
+"""
+
+import json
+import random
+import time
+
+from ..utils.llm import calculate_prompt_tokens, calculate_prompt_tokens_batch
+from ..utils.prompt_token_cache import prompt_token_cache
+
+WORDS = (
+    "the model streams tokens back while the caller renders them and the span "
+    "records usage latency cost retries context window prompt completion"
+).split()
+
+
+def add_arguments(parser):
+    parser.add_argument("--turns", type=int, default=50, help="Conversation turns")
+    parser.add_argument(
+        "--words", type=int, default=150, help="Words per synthetic message"
+    )
+    parser.add_argument("--model", default="gpt-4", help="Model of the requests")
+    parser.add_argument("--repeat", type=int, default=3, help="Measurements per case")
+    parser.set_defaults(run=run)
+
+
+def conversation(turns, words, seed=0):
+    rng = random.Random(seed)
+    messages = [{"role": "system", "content": "You are a helpful assistant."}]
+    requests = []
+    for _ in range(turns):
+        messages.append(
+            {"role": "user", "content": " ".join(rng.choices(WORDS, k=words))}
+        )
+        requests.append(list(messages))
+        messages.append(
+            {"role": "assistant", "content": " ".join(rng.choices(WORDS, k=words))}
+        )
+    return requests
+
+
+def replay_uncached(requests, model):
+    started = time.perf_counter()
+    for messages in requests:
+        sum(
+            calculate_prompt_tokens(json.dumps(str(message)), model)
+            for message in messages
+        )
+    return time.perf_counter() - started
+
+
+def replay_cached(requests, model):
+    prompt_token_cache.clear()
+    started = time.perf_counter()
+    for messages in requests:
+        calculate_prompt_tokens_batch(
+            [json.dumps(str(message)) for message in messages], model
+        )
+    return time.perf_counter() - started
+
+
+def run(args):
+    requests = conversation(args.turns, args.words)
+    uncached = min(replay_uncached(requests, args.model) for _ in range(args.repeat))
+    cached = min(replay_cached(requests, args.model) for _ in range(args.repeat))
+    return {
+        "benchmark": "prompt_tokens",
+        "turns": args.turns,
+        "model": args.model,
+        "uncached_ms": round(uncached * 1e3, 2),
+        "cached_ms": round(cached * 1e3, 2),
+        "speedup": round(uncached / cached, 1),
+        "cache": prompt_token_cache.stats(),
+    }
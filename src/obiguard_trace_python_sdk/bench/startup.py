@@ -0,0 +1,97 @@
+"""
+Cold-start benchmark: wall time and RSS of ``import obiguard_trace_python_sdk``
+and of ``init()`` under several ``disable_instrumentations`` configurations,
+broken down per instrumentor and per imported module.
+
+Every run happens in a fresh interpreter, so results are not skewed by modules
+this process has already imported.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+from ..version import __version__
+
+CHILD_SCRIPT = os.path.join(os.path.dirname(__file__), "_startup_child.py")
+
+SCENARIOS = {
+    "all": {},
+    "none": {"disable_instrumentations": {"all_except": []}},
+    "openai_only": {"disable_instrumentations": {"all_except": ["openai"]}},
+    "lazy": {"lazy_instrumentation": True},
+}
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="init() configuration to measure; repeatable (default: all of them)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Fresh interpreter runs per scenario"
+    )
+    parser.add_argument(
+        "--top-modules",
+        type=int,
+        default=25,
+        help="Number of slowest modules to report per phase",
+    )
+    parser.set_defaults(run=run)
+
+
+def run_child(init_kwargs, top_modules):
+    options = json.dumps({"init_kwargs": init_kwargs, "top_modules": top_modules})
+    completed = subprocess.run(
+        [sys.executable, CHILD_SCRIPT, options],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"startup benchmark run failed:\n{completed.stderr.strip()}"
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs, phase):
+    wall = [r[phase]["wall_ms"] for r in runs]
+    return {
+        "wall_ms_median": round(statistics.median(wall), 3),
+        "wall_ms_min": min(wall),
+        "wall_ms_max": max(wall),
+        "rss_kb_median": statistics.median(
+            [r[phase]["rss_kb"] or 0 for r in runs]
+        ),
+    }
+
+
+def run(args):
+    scenarios = args.scenario or list(SCENARIOS)
+    report = {
+        "benchmark": "startup",
+        "sdk_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "scenarios": {},
+    }
+    for name in scenarios:
+        runs = [
+            run_child(SCENARIOS[name], args.top_modules) for _ in range(args.repeat)
+        ]
+        # Per-module and per-instrumentor breakdowns come from the median run.
+        median_run = sorted(runs, key=lambda r: r["init"]["wall_ms"])[len(runs) // 2]
+        report["scenarios"][name] = {
+            "init_kwargs": SCENARIOS[name],
+            "import": summarize(runs, "import"),
+            "init": summarize(runs, "init"),
+            "breakdown": median_run,
+        }
+    return report
@@ -0,0 +1,201 @@
+"""
+Per-chunk cost of `StreamWrapper` on synthetic streams of every vendor it
+handles, with the vendor's chunk processor and with the generic fallback that
+probes every known chunk shape, and the time spent closing a stream whose
+completion tokens have to be counted because it reported no usage. That
+stream is also read with a token accounting processor active, which moves
+the counting off the caller's thread.
+"""
+
+import time
+from types import SimpleNamespace as NS
+
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+
+from ..utils.llm import StreamWrapper
+from ..utils.token_accounting import TokenAccountingSpanProcessor
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--chunks", type=int, default=10000, help="Chunks per synthetic stream"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements per case")
+    parser.set_defaults(run=run)
+
+
+def openai_chunk(text, usage=None):
+    delta = NS(content=text, function_call=None, tool_calls=None)
+    return NS(model="gpt-4o", choices=[NS(delta=delta)], usage=usage)
+
+
+def openai_stream(n):
+    usage = NS(prompt_tokens=12, completion_tokens=n)
+    return [openai_chunk("tok") for _ in range(n - 1)] + [openai_chunk("", usage)]
+
+
+def groq_stream(n):
+    # Groq sends `x_groq` with the request id first and with the usage last.
+    chunks = [openai_chunk("tok") for _ in range(n - 1)] + [openai_chunk("")]
+    for chunk in chunks:
+        chunk.x_groq = None
+    chunks[0].x_groq = NS(id="req_bench", usage=None)
+    usage = NS(prompt_tokens=12, completion_tokens=n)
+    chunks[-1].x_groq = NS(id="req_bench", usage=usage)
+    return chunks
+
+
+def openai_stream_without_usage(n):
+    return [openai_chunk(" tok") for _ in range(n)]
+
+
+def openai_responses_stream(n):
+    completed = NS(
+        type="response.completed",
+        response=NS(
+            model="gpt-4o",
+            output_text="tok" * n,
+            usage=NS(input_tokens=12, output_tokens=n),
+        ),
+    )
+    deltas = [NS(type="response.output_text.delta", delta="tok") for _ in range(n - 1)]
+    return deltas + [completed]
+
+
+def mistral_stream(n):
+    return [NS(data=chunk) for chunk in openai_stream(n)]
+
+
+def anthropic_stream(n):
+    start = NS(
+        type="message_start",
+        message=NS(model="claude-3-5-sonnet", usage=NS(input_tokens=12)),
+    )
+    deltas = [
+        NS(type="content_block_delta", delta=NS(type="text_delta", text="tok"))
+        for _ in range(n - 2)
+    ]
+    end = NS(
+        type="message_delta",
+        delta=NS(stop_reason="end_turn"),
+        usage=NS(output_tokens=n),
+    )
+    return [start] + deltas + [end]
+
+
+def cohere_stream(n):
+    deltas = [
+        NS(type="content-delta", delta=NS(message=NS(content=NS(text="tok"))))
+        for _ in range(n - 1)
+    ]
+    billed_units = NS(input_tokens=12.0, output_tokens=float(n))
+    end = NS(type="message-end", delta=NS(usage=NS(billed_units=billed_units)))
+    return deltas + [end]
+
+
+def vertexai_stream(n):
+    def chunk(usage=None):
+        part = NS(text="tok")
+        return NS(
+            text="tok",
+            candidates=[NS(content=NS(parts=[part]))],
+            usage_metadata=usage,
+        )
+
+    usage = NS(prompt_token_count=12, candidates_token_count=n)
+    return [chunk() for _ in range(n - 1)] + [chunk(usage)]
+
+
+def ollama_stream(n):
+    chunks = [
+        {"model": "llama3", "message": {"role": "assistant", "content": "tok"}}
+        for _ in range(n - 1)
+    ]
+    return chunks + [{"model": "llama3", "prompt_eval_count": 12, "eval_count": n}]
+
+
+STREAMS = {
+    "openai": openai_stream,
+    "groq": groq_stream,
+    "openai_responses": openai_responses_stream,
+    "mistral": mistral_stream,
+    "anthropic": anthropic_stream,
+    "cohere": cohere_stream,
+    "vertexai": vertexai_stream,
+    "ollama": ollama_stream,
+}
+
+
+def consume(tracer, chunks, vendor):
+    span = tracer.start_span("bench")
+    started = time.perf_counter()
+    for _ in StreamWrapper(iter(chunks), span, vendor=vendor):
+        pass
+    return time.perf_counter() - started
+
+
+def raw(chunks):
+    started = time.perf_counter()
+    for _ in iter(chunks):
+        pass
+    return time.perf_counter() - started
+
+
+def close_latency(tracer, chunks):
+    """Time of the final `__next__` call, which ends the span."""
+    span = tracer.start_span("bench")
+    stream = StreamWrapper(iter(chunks), span, vendor="openai")
+    for _ in range(len(chunks)):
+        next(stream)
+    started = time.perf_counter()
+    next(stream, None)
+    return time.perf_counter() - started
+
+
+def deferred_request_path(chunks, repeat):
+    """Time to read a stream without usage while counting is deferred."""
+    provider = TracerProvider()
+    processor = TokenAccountingSpanProcessor(SpanProcessor())
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer(__name__)
+    try:
+        return min(consume(tracer, chunks, "openai") for _ in range(repeat))
+    finally:
+        processor.shutdown()
+
+
+def run(args):
+    # Spans are recorded but never exported.
+    tracer = TracerProvider().get_tracer(__name__)
+    results = {}
+    for vendor, build in STREAMS.items():
+        chunks = build(args.chunks)
+        baseline = min(raw(chunks) for _ in range(args.repeat))
+        cases = {"generic": "generic", "specialized": vendor, "detected": None}
+        timings = {
+            name: min(consume(tracer, chunks, case) for _ in range(args.repeat))
+            for name, case in cases.items()
+        }
+        results[vendor] = {
+            name: {
+                "ns_per_chunk": round((elapsed - baseline) / args.chunks * 1e9, 1)
+            }
+            for name, elapsed in timings.items()
+        }
+        results[vendor]["specialized"]["speedup"] = round(
+            (timings["generic"] - baseline) / (timings["specialized"] - baseline), 1
+        )
+    chunks = openai_stream_without_usage(args.chunks)
+    close_ms = min(close_latency(tracer, chunks) for _ in range(args.repeat)) * 1e3
+    inline = min(consume(tracer, chunks, "openai") for _ in range(args.repeat))
+    deferred = deferred_request_path(chunks, args.repeat)
+    return {
+        "benchmark": "streaming",
+        "chunks": args.chunks,
+        "vendors": results,
+        "close_without_usage_ms": round(close_ms, 3),
+        "request_path_without_usage_ms": {
+            "inline": round(inline * 1e3, 2),
+            "deferred": round(deferred * 1e3, 2),
+        },
+    }
@@ -4,8 +4,8 @@ TIKTOKEN_MODEL_MAPPING = {
     "gpt-4-0125-preview": "cl100k_base",
     "gpt-4-1106-preview": "cl100k_base",
     "gpt-4-1106-vision-preview": "cl100k_base",
-    "gpt-4o": "0200k_base",
-    "gpt-4o-mini": "0200k_base",
+    "gpt-4o": "o200k_base",
+    "gpt-4o-mini": "o200k_base",
 }
 
 SERVICE_PROVIDERS = {
@@ -47,3 +47,81 @@ SERVICE_PROVIDERS = {
 }
 
 LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY = "langtrace_additional_attributes"
+
+# Streaming latency attributes not covered by `langtrace.trace_attributes`.
+# Times are in seconds from sending the request, gaps in seconds between
+# consecutive chunks; tokens per second is the output token rate from the first
+# content to the last chunk.
+LLM_TIME_TO_FIRST_CHUNK = "gen_ai.response.time_to_first_chunk"
+LLM_TIME_TO_FIRST_TOKEN = "gen_ai.response.time_to_first_token"
+LLM_INTER_CHUNK_GAP_P50 = "gen_ai.response.inter_chunk_gap.p50"
+LLM_INTER_CHUNK_GAP_P99 = "gen_ai.response.inter_chunk_gap.p99"
+LLM_INTER_CHUNK_GAP_MAX = "gen_ai.response.inter_chunk_gap.max"
+LLM_TOKENS_PER_SECOND = "gen_ai.response.tokens_per_second"
+
+# Coalesced completion chunk events, see `utils.chunk_events`. Window events
+# use the `gen_ai.completion.chunk` name of single chunk events and add the
+# index of their first chunk and their chunk count; the summary event closes
+# the stream.
+LLM_COMPLETION_CHUNK_INDEX = "gen_ai.completion.chunk.index"
+LLM_COMPLETION_CHUNK_COUNT = "gen_ai.completion.chunk.count"
+LLM_COMPLETION_CHUNKS = "gen_ai.completion.chunks"
+LLM_COMPLETION_CHUNKS_COUNT = "gen_ai.completion.chunks.count"
+LLM_COMPLETION_CHUNKS_CHARACTERS = "gen_ai.completion.chunks.characters"
+LLM_COMPLETION_CHUNKS_EVENTS = "gen_ai.completion.chunks.events"
+LLM_COMPLETION_CHUNKS_DROPPED = "gen_ai.completion.chunks.dropped"
+
+# Set on spans whose token usage was counted by the SDK without the model's
+# own tokenizer (an approximation), instead of being reported by the provider.
+LLM_USAGE_TOKENS_ESTIMATED = "gen_ai.usage.estimated"
+
+# Input tokens read from and written to the provider's prompt cache, which
+# are part of the input tokens, and the cost in USD of a call at the list
+# prices of the price table version it names; see `utils.prompt_cache` and
+# `utils.pricing`.
+LLM_USAGE_CACHED_INPUT_TOKENS = "gen_ai.usage.cached_input_tokens"
+LLM_USAGE_CACHE_CREATION_INPUT_TOKENS = "gen_ai.usage.cache_creation_input_tokens"
+LLM_USAGE_COST = "gen_ai.usage.cost"
+LLM_USAGE_COST_PRICE_TABLE = "gen_ai.usage.cost.price_table"
+
+# Modules whose first import triggers the matching instrumentation when
+# `init(lazy_instrumentation=True)` is used. Keys match `langtrace.INSTRUMENTATIONS`.
+INSTRUMENTATION_MODULES = {
+    "openai": ("openai",),
+    "groq": ("groq",),
+    "pinecone": ("pinecone",),
+    "llama-index": ("llama_index",),
+    "chromadb": ("chromadb",),
+    "embedchain": ("embedchain",),
+    "qdrant-client": ("qdrant_client",),
+    "langchain": ("langchain",),
+    "langchain-core": ("langchain_core",),
+    "langchain-community": ("langchain_community",),
+    "langgraph": ("langgraph",),
+    "litellm": ("litellm",),
+    "anthropic": ("anthropic",),
+    "cohere": ("cohere",),
+    "weaviate-client": ("weaviate",),
+    "sqlalchemy": ("sqlalchemy",),
+    "ollama": ("ollama",),
+    "dspy": ("dspy",),
+    "crewai": ("crewai",),
+    "vertexai": ("vertexai",),
+    "google-cloud-aiplatform": ("vertexai", "google.cloud.aiplatform"),
+    "google-generativeai": ("google.generativeai",),
+    "google-genai": ("google.genai",),
+    "graphlit-client": ("graphlit",),
+    "phidata": ("phi",),
+    "agno": ("agno",),
+    "mistralai": ("mistralai",),
+    "neo4j": ("neo4j",),
+    "neo4j-graphrag": ("neo4j_graphrag",),
+    "boto3": ("boto3",),
+    "autogen": ("autogen",),
+    "pymongo": ("pymongo",),
+    "cerebras-cloud-sdk": ("cerebras.cloud.sdk",),
+    "pymilvus": ("pymilvus",),
+    "crewai-tools": ("crewai_tools",),
+    "cleanlab-tlm": ("cleanlab_tlm",),
+    "openai-agents": ("agents",),
+}
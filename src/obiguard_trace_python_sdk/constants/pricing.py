@@ -0,0 +1,176 @@
+from obiguard_trace_python_sdk.constants.instrumentation.openai import (
+    OPENAI_COST_TABLE,
+)
+
+# List prices in USD per million tokens: (input, output, cached input). A
+# cached input rate of None bills cached tokens as regular input. Tables are
+# never edited once released; price changes go in a new version so that
+# costs recorded under an older one can be reproduced.
+#
+# Models match exactly or by their longest listed prefix, so dated and
+# suffixed releases (`gpt-4o-2024-08-06`, `claude-3-5-sonnet-20241022`)
+# use the price of their family.
+
+PRICE_TABLE_2024_03_01 = {
+    "openai": {
+        model: (rates["input"] * 1000, rates["output"] * 1000, None)
+        for model, rates in OPENAI_COST_TABLE.items()
+    },
+}
+
+PRICE_TABLE_2025_07_01 = {
+    "openai": {
+        "gpt-4.1": (2.0, 8.0, 0.5),
+        "gpt-4.1-mini": (0.4, 1.6, 0.1),
+        "gpt-4.1-nano": (0.1, 0.4, 0.025),
+        "gpt-4o": (2.5, 10.0, 1.25),
+        "gpt-4o-2024-05-13": (5.0, 15.0, None),
+        "gpt-4o-mini": (0.15, 0.6, 0.075),
+        "chatgpt-4o-latest": (5.0, 15.0, None),
+        "o1": (15.0, 60.0, 7.5),
+        "o1-mini": (1.1, 4.4, 0.55),
+        "o1-pro": (150.0, 600.0, None),
+        "o3": (2.0, 8.0, 0.5),
+        "o3-mini": (1.1, 4.4, 0.55),
+        "o3-pro": (20.0, 80.0, None),
+        "o4-mini": (1.1, 4.4, 0.275),
+        "gpt-4-turbo": (10.0, 30.0, None),
+        "gpt-4-0125-preview": (10.0, 30.0, None),
+        "gpt-4-1106-preview": (10.0, 30.0, None),
+        "gpt-4-1106-vision-preview": (10.0, 30.0, None),
+        "gpt-4": (30.0, 60.0, None),
+        "gpt-4-32k": (60.0, 120.0, None),
+        "gpt-3.5-turbo": (0.5, 1.5, None),
+        "gpt-3.5-turbo-instruct": (1.5, 2.0, None),
+        "text-embedding-3-small": (0.02, 0.0, None),
+        "text-embedding-3-large": (0.13, 0.0, None),
+        "text-embedding-ada-002": (0.1, 0.0, None),
+    },
+    "anthropic": {
+        "claude-opus-4": (15.0, 75.0, 1.5),
+        "claude-sonnet-4": (3.0, 15.0, 0.3),
+        "claude-3-7-sonnet": (3.0, 15.0, 0.3),
+        "claude-3-5-sonnet": (3.0, 15.0, 0.3),
+        "claude-3-5-haiku": (0.8, 4.0, 0.08),
+        "claude-3-opus": (15.0, 75.0, 1.5),
+        "claude-3-sonnet": (3.0, 15.0, None),
+        "claude-3-haiku": (0.25, 1.25, 0.03),
+        "claude-2": (8.0, 24.0, None),
+        "claude-instant": (0.8, 2.4, None),
+    },
+    "gemini": {
+        "gemini-2.5-pro": (1.25, 10.0, 0.31),
+        "gemini-2.5-flash": (0.3, 2.5, 0.075),
+        "gemini-2.5-flash-lite": (0.1, 0.4, 0.025),
+        "gemini-2.0-flash": (0.1, 0.4, 0.025),
+        "gemini-2.0-flash-lite": (0.075, 0.3, None),
+        "gemini-1.5-pro": (1.25, 5.0, 0.3125),
+        "gemini-1.5-flash": (0.075, 0.3, 0.01875),
+        "gemini-1.5-flash-8b": (0.0375, 0.15, 0.01),
+    },
+    "mistral": {
+        "mistral-large": (2.0, 6.0, None),
+        "mistral-medium": (0.4, 2.0, None),
+        "mistral-small": (0.1, 0.3, None),
+        "codestral": (0.3, 0.9, None),
+        "pixtral-large": (2.0, 6.0, None),
+        "pixtral-12b": (0.15, 0.15, None),
+        "open-mistral-nemo": (0.15, 0.15, None),
+        "ministral-8b": (0.1, 0.1, None),
+        "ministral-3b": (0.04, 0.04, None),
+        "mistral-embed": (0.1, 0.0, None),
+    },
+    "cohere": {
+        "command-a": (2.5, 10.0, None),
+        "command-r-plus": (2.5, 10.0, None),
+        "command-r7b": (0.0375, 0.15, None),
+        "command-r": (0.15, 0.6, None),
+        "command-light": (0.3, 0.6, None),
+        "command": (1.0, 2.0, None),
+        "embed-english-v3.0": (0.1, 0.0, None),
+        "embed-multilingual-v3.0": (0.1, 0.0, None),
+    },
+    "groq": {
+        "llama-3.3-70b-versatile": (0.59, 0.79, None),
+        "llama-3.1-8b-instant": (0.05, 0.08, None),
+        "llama3-70b-8192": (0.59, 0.79, None),
+        "llama3-8b-8192": (0.05, 0.08, None),
+        "meta-llama/llama-4-scout-17b-16e-instruct": (0.11, 0.34, None),
+        "meta-llama/llama-4-maverick-17b-128e-instruct": (0.2, 0.6, None),
+        "deepseek-r1-distill-llama-70b": (0.75, 0.99, None),
+        "qwen-qwq-32b": (0.29, 0.39, None),
+        "gemma2-9b-it": (0.2, 0.2, None),
+        "mixtral-8x7b-32768": (0.24, 0.24, None),
+    },
+    "aws bedrock": {
+        "amazon.nova-premier": (2.5, 12.5, None),
+        "amazon.nova-pro": (0.8, 3.2, 0.2),
+        "amazon.nova-lite": (0.06, 0.24, 0.015),
+        "amazon.nova-micro": (0.035, 0.14, 0.00875),
+        "amazon.titan-text-premier": (0.5, 1.5, None),
+        "amazon.titan-text-express": (0.2, 0.6, None),
+        "amazon.titan-text-lite": (0.15, 0.2, None),
+        "amazon.titan-embed-text": (0.1, 0.0, None),
+        "meta.llama3-70b-instruct": (2.65, 3.5, None),
+        "meta.llama3-8b-instruct": (0.3, 0.6, None),
+        "meta.llama3-1-405b-instruct": (2.4, 2.4, None),
+        "meta.llama3-1-70b-instruct": (0.72, 0.72, None),
+        "meta.llama3-1-8b-instruct": (0.22, 0.22, None),
+        "meta.llama3-3-70b-instruct": (0.72, 0.72, None),
+        "mistral.mistral-large": (4.0, 12.0, None),
+        "mistral.mistral-7b-instruct": (0.15, 0.2, None),
+        "mistral.mixtral-8x7b-instruct": (0.45, 0.7, None),
+        "anthropic.claude-v2": (8.0, 24.0, None),
+        "anthropic.claude-instant": (0.8, 2.4, None),
+        "cohere.command-r-plus": (3.0, 15.0, None),
+        "cohere.command-r": (0.5, 1.5, None),
+        "cohere.command-text": (1.5, 2.0, None),
+        "cohere.command-light-text": (0.3, 0.6, None),
+    },
+    "deepseek": {
+        "deepseek-chat": (0.27, 1.1, 0.07),
+        "deepseek-reasoner": (0.55, 2.19, 0.14),
+    },
+    "xai": {
+        "grok-4": (3.0, 15.0, 0.75),
+        "grok-3": (3.0, 15.0, 0.75),
+        "grok-3-mini": (0.3, 0.5, 0.075),
+        "grok-2": (2.0, 10.0, None),
+        "grok-beta": (5.0, 15.0, None),
+    },
+    "perplexity": {
+        "sonar-deep-research": (2.0, 8.0, None),
+        "sonar-reasoning-pro": (2.0, 8.0, None),
+        "sonar-reasoning": (1.0, 5.0, None),
+        "sonar-pro": (3.0, 15.0, None),
+        "sonar": (1.0, 1.0, None),
+    },
+    "cerebras": {
+        "llama3.1-8b": (0.1, 0.1, None),
+        "llama-3.3-70b": (0.85, 1.2, None),
+        "llama-4-scout-17b-16e-instruct": (0.65, 0.85, None),
+        "qwen-3-32b": (0.4, 0.8, None),
+    },
+}
+
+# Providers serving the models of another provider's table.
+PRICE_TABLE_ALIASES = {
+    "azure": "openai",
+    "vertex ai": "gemini",
+}
+
+# Routers whose spans carry the models of any provider, such as
+# `anthropic/claude-3-5-sonnet`. Their models are looked up in every table.
+PRICE_TABLE_ROUTERS = frozenset({"litellm"})
+
+# Providers whose model ids start with the model vendor, such as
+# `anthropic.claude-3-5-haiku` on Bedrock. Models missing from the provider's
+# own table are looked up in the vendor's table.
+PRICE_TABLE_VENDOR_PREFIXED = frozenset({"aws bedrock"})
+
+PRICE_TABLES = {
+    "2024-03-01": PRICE_TABLE_2024_03_01,
+    "2025-07-01": PRICE_TABLE_2025_07_01,
+}
+
+CURRENT_PRICE_TABLE = "2025-07-01"
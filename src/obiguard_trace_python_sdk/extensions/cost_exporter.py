@@ -0,0 +1,32 @@
+import typing
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from obiguard_trace_python_sdk.utils.pricing import (
+    PriceTable,
+    get_price_table,
+    price_spans,
+)
+
+
+class CostSpanExporter(SpanExporter):
+    """
+    Sets `gen_ai.usage.cost` on the LLM spans of each batch, then passes the
+    batch to `exporter`. Pricing runs where the batch is exported, on the
+    export thread of a `BatchSpanProcessor`, so it adds nothing to the
+    instrumented calls.
+    """
+
+    def __init__(self, exporter: SpanExporter, price_table: PriceTable = None):
+        self.exporter = exporter
+        self.price_table = price_table or get_price_table()
+
+    def export(self, spans: typing.Sequence[ReadableSpan]) -> SpanExportResult:
+        return self.exporter.export(price_spans(spans, self.price_table))
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.exporter.force_flush(timeout_millis)
@@ -1,7 +1,6 @@
 import json
 import io
 import os
-import requests
 from typing import Iterator, Literal, Union
 from colorama import Fore
 from obiguard_trace_python_sdk.constants.exporter.langtrace_exporter import (
@@ -59,6 +58,8 @@ class LangTraceFile(io.BytesIO):
         super().close()
 
     def upload_to_server(self, file_data: bytes) -> None:
+        import requests
+
         try:
             # Parse the log file and upload it to the server
             log = file_data.decode("utf-8")
@@ -132,6 +133,8 @@ class LangTraceFileSystem(AbstractFileSystem):
             raise ValueError(f"Unsupported mode: {mode}")
 
     def fetch_file_from_api(self, dataset_id: str) -> bytes:
+        import requests
+
         try:
             print(
                 Fore.GREEN
@@ -1,38 +1,82 @@
-from .agno import AgnoInstrumentation
-from .anthropic import AnthropicInstrumentation
-from .autogen import AutogenInstrumentation
-from .aws_bedrock import AWSBedrockInstrumentation
-from .cerebras import CerebrasInstrumentation
-from .chroma import ChromaInstrumentation
-from .cleanlab import CleanLabInstrumentation
-from .cohere import CohereInstrumentation
-from .crewai import CrewAIInstrumentation
-from .crewai_tools import CrewaiToolsInstrumentation
-from .dspy import DspyInstrumentation
-from .embedchain import EmbedchainInstrumentation
-from .gemini import GeminiInstrumentation
-from .google_genai import GoogleGenaiInstrumentation
-from .graphlit import GraphlitInstrumentation
-from .groq import GroqInstrumentation
-from .langchain import LangchainInstrumentation
-from .langchain_community import LangchainCommunityInstrumentation
-from .langchain_core import LangchainCoreInstrumentation
-from .langgraph import LanggraphInstrumentation
-from .litellm import LiteLLMInstrumentation
-from .llamaindex import LlamaindexInstrumentation
-from .milvus import MilvusInstrumentation
-from .mistral import MistralInstrumentation
-from .neo4j import Neo4jInstrumentation
-from .neo4j_graphrag import Neo4jGraphRAGInstrumentation
-from .ollama import OllamaInstrumentor
-from .openai import OpenAIInstrumentation
-from .openai_agents import OpenAIAgentsInstrumentation
-from .phidata import PhiDataInstrumentation
-from .pinecone import PineconeInstrumentation
-from .pymongo import PyMongoInstrumentation
-from .qdrant import QdrantInstrumentation
-from .vertexai import VertexAIInstrumentation
-from .weaviate import WeaviateInstrumentation
+import importlib
+from typing import TYPE_CHECKING
+
+# Instrumentation classes are imported on first attribute access (PEP 562) so
+# importing the SDK does not load every vendor integration up front.
+_INSTRUMENTATIONS = {
+    "AgnoInstrumentation": ".agno",
+    "AnthropicInstrumentation": ".anthropic",
+    "AutogenInstrumentation": ".autogen",
+    "AWSBedrockInstrumentation": ".aws_bedrock",
+    "CerebrasInstrumentation": ".cerebras",
+    "ChromaInstrumentation": ".chroma",
+    "CleanLabInstrumentation": ".cleanlab",
+    "CohereInstrumentation": ".cohere",
+    "CrewAIInstrumentation": ".crewai",
+    "CrewaiToolsInstrumentation": ".crewai_tools",
+    "DspyInstrumentation": ".dspy",
+    "EmbedchainInstrumentation": ".embedchain",
+    "GeminiInstrumentation": ".gemini",
+    "GoogleGenaiInstrumentation": ".google_genai",
+    "GraphlitInstrumentation": ".graphlit",
+    "GroqInstrumentation": ".groq",
+    "LangchainInstrumentation": ".langchain",
+    "LangchainCommunityInstrumentation": ".langchain_community",
+    "LangchainCoreInstrumentation": ".langchain_core",
+    "LanggraphInstrumentation": ".langgraph",
+    "LiteLLMInstrumentation": ".litellm",
+    "LlamaindexInstrumentation": ".llamaindex",
+    "MilvusInstrumentation": ".milvus",
+    "MistralInstrumentation": ".mistral",
+    "Neo4jInstrumentation": ".neo4j",
+    "Neo4jGraphRAGInstrumentation": ".neo4j_graphrag",
+    "OllamaInstrumentor": ".ollama",
+    "OpenAIInstrumentation": ".openai",
+    "OpenAIAgentsInstrumentation": ".openai_agents",
+    "PhiDataInstrumentation": ".phidata",
+    "PineconeInstrumentation": ".pinecone",
+    "PyMongoInstrumentation": ".pymongo",
+    "QdrantInstrumentation": ".qdrant",
+    "VertexAIInstrumentation": ".vertexai",
+    "WeaviateInstrumentation": ".weaviate",
+}
+
+if TYPE_CHECKING:
+    from .agno import AgnoInstrumentation
+    from .anthropic import AnthropicInstrumentation
+    from .autogen import AutogenInstrumentation
+    from .aws_bedrock import AWSBedrockInstrumentation
+    from .cerebras import CerebrasInstrumentation
+    from .chroma import ChromaInstrumentation
+    from .cleanlab import CleanLabInstrumentation
+    from .cohere import CohereInstrumentation
+    from .crewai import CrewAIInstrumentation
+    from .crewai_tools import CrewaiToolsInstrumentation
+    from .dspy import DspyInstrumentation
+    from .embedchain import EmbedchainInstrumentation
+    from .gemini import GeminiInstrumentation
+    from .google_genai import GoogleGenaiInstrumentation
+    from .graphlit import GraphlitInstrumentation
+    from .groq import GroqInstrumentation
+    from .langchain import LangchainInstrumentation
+    from .langchain_community import LangchainCommunityInstrumentation
+    from .langchain_core import LangchainCoreInstrumentation
+    from .langgraph import LanggraphInstrumentation
+    from .litellm import LiteLLMInstrumentation
+    from .llamaindex import LlamaindexInstrumentation
+    from .milvus import MilvusInstrumentation
+    from .mistral import MistralInstrumentation
+    from .neo4j import Neo4jInstrumentation
+    from .neo4j_graphrag import Neo4jGraphRAGInstrumentation
+    from .ollama import OllamaInstrumentor
+    from .openai import OpenAIInstrumentation
+    from .openai_agents import OpenAIAgentsInstrumentation
+    from .phidata import PhiDataInstrumentation
+    from .pinecone import PineconeInstrumentation
+    from .pymongo import PyMongoInstrumentation
+    from .qdrant import QdrantInstrumentation
+    from .vertexai import VertexAIInstrumentation
+    from .weaviate import WeaviateInstrumentation
 
 __all__ = [
     "AnthropicInstrumentation",
@@ -70,3 +114,16 @@ __all__ = [
     "CleanLabInstrumentation",
     "OpenAIAgentsInstrumentation",
 ]
+
+
+def __getattr__(name):
+    if name in _INSTRUMENTATIONS:
+        module = importlib.import_module(_INSTRUMENTATIONS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_INSTRUMENTATIONS))
@@ -18,45 +18,50 @@ import json
 import time
 from typing import Any
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import FrameworkSpanAttributes
-from opentelemetry import baggage
+from opentelemetry import baggage, trace
 from opentelemetry.trace import Span, SpanKind, Tracer
 from opentelemetry.trace.status import Status, StatusCode
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, SERVICE_PROVIDERS)
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
 from obiguard_trace_python_sdk.utils.llm import get_span_name, set_span_attributes
 from obiguard_trace_python_sdk.utils.misc import serialize_args, serialize_kwargs
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def patch_agent(operation_name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS.get("AGNO", "agno")
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        inputs = {}
-        if len(args) > 0:
-            inputs["args"] = serialize_args(*args)
-        if len(kwargs) > 0:
-            inputs["kwargs"] = serialize_kwargs(**kwargs)
-        span_attributes["agno.agent.inputs"] = json.dumps(inputs)
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             get_span_name(operation_name), kind=SpanKind.CLIENT
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS.get("AGNO", "agno")
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            inputs = {}
+            if len(args) > 0:
+                inputs["args"] = serialize_args(*args)
+            if len(kwargs) > 0:
+                inputs["kwargs"] = serialize_kwargs(**kwargs)
+            span_attributes["agno.agent.inputs"] = json.dumps(inputs)
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
                 set_span_attributes(span, attributes)
                 AgnoSpanAttributes(span=span, instance=instance)
@@ -159,40 +164,50 @@ def patch_memory(operation_name, version, tracer: Tracer):
         tracer: The OpenTelemetry tracer
     """
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS.get("AGNO", "agno")
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        # Collect basic span attributes
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        # Collect inputs
-        inputs = {}
-        if len(args) > 0:
-            inputs["args"] = serialize_args(*args)
-        if len(kwargs) > 0:
-            inputs["kwargs"] = serialize_kwargs(**kwargs)
-
-        span_attributes["agno.memory.inputs"] = json.dumps(inputs)
-
-        if hasattr(instance, "messages"):
-            span_attributes["agno.memory.messages_count_before"] = len(instance.messages)
-        if hasattr(instance, "runs"):
-            span_attributes["agno.memory.runs_count_before"] = len(instance.runs)
-        if hasattr(instance, "memories") and instance.memories:
-            span_attributes["agno.memory.memories_count_before"] = len(instance.memories)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             get_span_name(operation_name), kind=SpanKind.CLIENT
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS.get("AGNO", "agno")
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            # Collect basic span attributes
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            # Collect inputs
+            inputs = {}
+            if len(args) > 0:
+                inputs["args"] = serialize_args(*args)
+            if len(kwargs) > 0:
+                inputs["kwargs"] = serialize_kwargs(**kwargs)
+
+            span_attributes["agno.memory.inputs"] = json.dumps(inputs)
+
+            if hasattr(instance, "messages"):
+                span_attributes["agno.memory.messages_count_before"] = len(
+                    instance.messages
+                )
+            if hasattr(instance, "runs"):
+                span_attributes["agno.memory.runs_count_before"] = len(instance.runs)
+            if hasattr(instance, "memories") and instance.memories:
+                span_attributes["agno.memory.memories_count_before"] = len(
+                    instance.memories
+                )
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             start_time = time.time()
             try:
                 # Set attributes
@@ -232,29 +247,35 @@ def patch_memory(operation_name, version, tracer: Tracer):
 
 def patch_team(operation_name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS.get("AGNO", "agno")
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        inputs = {}
-        if len(args) > 0:
-            inputs["args"] = serialize_args(*args)
-        if len(kwargs) > 0:
-            inputs["kwargs"] = serialize_kwargs(**kwargs)
-        span_attributes["agno.team.inputs"] = json.dumps(inputs)
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             get_span_name(operation_name), kind=SpanKind.CLIENT
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS.get("AGNO", "agno")
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            inputs = {}
+            if len(args) > 0:
+                inputs["args"] = serialize_args(*args)
+            if len(kwargs) > 0:
+                inputs["kwargs"] = serialize_kwargs(**kwargs)
+            span_attributes["agno.team.inputs"] = json.dumps(inputs)
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
                 set_span_attributes(span, attributes)
                 AgnoSpanAttributes(span=span, instance=instance)
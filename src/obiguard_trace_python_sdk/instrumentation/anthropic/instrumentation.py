@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Collection, Any
 
@@ -22,6 +21,7 @@ from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import TracerProvider
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper
+from obiguard_trace_python_sdk.utils import get_package_version
 from typing import Any
 from obiguard_trace_python_sdk.instrumentation.anthropic.patch import messages_create, messages_stream
 
@@ -39,7 +39,7 @@ class AnthropicInstrumentation(BaseInstrumentor):  # type: ignore[misc]
     def _instrument(self, **kwargs: dict[str, Any]) -> None:
         tracer_provider: TracerProvider = kwargs.get("tracer_provider")  # type: ignore
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("anthropic")
+        version = get_package_version("anthropic")
 
         wrap_function_wrapper(
             "anthropic.resources.messages",
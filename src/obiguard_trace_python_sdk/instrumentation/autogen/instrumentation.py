@@ -1,7 +1,7 @@
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper as _W
-from importlib_metadata import version as v
+from obiguard_trace_python_sdk.utils import get_package_version
 from .patch import patch_generate_reply, patch_initiate_chat
 
 
@@ -12,7 +12,7 @@ class AutogenInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = v("autogen")
+        version = get_package_version("autogen")
         try:
             _W(
                 module="autogen.agentchat.conversable_agent",
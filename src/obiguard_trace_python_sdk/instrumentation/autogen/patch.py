@@ -11,30 +11,38 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import SERVICE_P
 from langtrace.trace_attributes import FrameworkSpanAttributes
 from opentelemetry.trace.status import Status, StatusCode
 from langtrace.trace_attributes import SpanAttributes
+from opentelemetry import trace
 from opentelemetry.trace import Tracer, SpanKind
 
 from obiguard_trace_python_sdk.utils import deduce_args_and_kwargs, set_span_attribute
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 import json
 
 
 def patch_initiate_chat(name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        all_params = deduce_args_and_kwargs(wrapped, *args, **kwargs)
-        all_params["recipient"] = json.dumps(parse_agent(all_params.get("recipient")))
-        span_attributes = {
-            **get_langtrace_attributes(
-                service_provider=SERVICE_PROVIDERS["AUTOGEN"],
-                version=version,
-                vendor_type="framework",
-            ),
-            "sender": json.dumps(parse_agent(instance)),
-            **all_params,
-        }
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(name), kind=SpanKind.CLIENT
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            all_params = deduce_args_and_kwargs(wrapped, *args, **kwargs)
+            all_params["recipient"] = json.dumps(
+                parse_agent(all_params.get("recipient"))
+            )
+            span_attributes = {
+                **get_langtrace_attributes(
+                    service_provider=SERVICE_PROVIDERS["AUTOGEN"],
+                    version=version,
+                    vendor_type="framework",
+                ),
+                "sender": json.dumps(parse_agent(instance)),
+                **all_params,
+            }
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
                 set_span_attributes(span, attributes)
                 result = wrapped(*args, **kwargs)
@@ -58,25 +66,29 @@ def patch_generate_reply(name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
         llm_config = instance.llm_config
         kwargs = parse_kwargs(kwargs, llm_config)
-        service_provider = SERVICE_PROVIDERS["AUTOGEN"]
-
-        span_attributes = {
-            **get_langtrace_attributes(
-                version=version,
-                service_provider=service_provider,
-                vendor_type="framework",
-            ),
-            **get_llm_request_attributes(
-                kwargs,
-                prompts=kwargs.get("messages"),
-            ),
-            **get_extra_attributes(),
-        }
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(name), kind=SpanKind.CLIENT
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["AUTOGEN"]
+
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version=version,
+                    service_provider=service_provider,
+                    vendor_type="framework",
+                ),
+                **get_llm_request_attributes(
+                    kwargs,
+                    prompts=kwargs.get("messages"),
+                ),
+                **get_extra_attributes(),
+            }
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
 
                 result = wrapped(*args, **kwargs)
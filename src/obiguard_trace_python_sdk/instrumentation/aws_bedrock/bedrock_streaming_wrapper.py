@@ -1,43 +1,231 @@
 import json
+
+from opentelemetry.trace.status import Status, StatusCode
 from wrapt import ObjectProxy
 
+from obiguard_trace_python_sdk.utils.stream_capture import StreamCapture
+from obiguard_trace_python_sdk.utils.stream_timing import StreamTimer
+
+
+class BedrockStreamAccumulator:
+    """
+    Rebuilds the response body of an `invoke_model_with_response_stream`
+    call from its chunks, in the shape `invoke_model` returns for the same
+    model, so one set of attribute setters handles both. Each chunk is parsed
+    once by the handler of the model vendor. Text is kept as fragments per
+    content block and joined once, by `result()`.
+    """
+
+    def __init__(self, vendor):
+        self.body = {}
+        self.blocks = []
+        self.finished = False
+        self._add, self._finish = self.HANDLERS.get(vendor, self.UNKNOWN)
+
+    def add(self, chunk_bytes):
+        """Add the bytes of one chunk. Returns whether it carried text."""
+        chunk = json.loads(chunk_bytes)
+        # Bedrock attaches the invocation metrics to the last chunk.
+        metrics = chunk.pop("amazon-bedrock-invocationMetrics", None)
+        if metrics is not None:
+            self.body["invocation_metrics"] = metrics
+            self.finished = True
+        return self._add(self, chunk)
+
+    def result(self):
+        """The response body, with the text of each content block joined."""
+        return self._finish(self)
+
+    def _text(self, index=0):
+        while len(self.blocks) <= index:
+            self.blocks.append(StreamCapture())
+        return self.blocks[index]
+
+    def _joined(self, index=0):
+        return self.blocks[index].text() if index < len(self.blocks) else ""
+
+    # Anthropic messages API
+
+    def anthropic_message_start(self, chunk):
+        self.body.update(chunk["message"])
+        self.body["content"] = []
+
+    def anthropic_content_block_start(self, chunk):
+        self.body.setdefault("content", []).append(chunk["content_block"])
+
+    def anthropic_content_block_delta(self, chunk):
+        text = chunk["delta"].get("text")
+        if text:
+            index = chunk.get("index", len(self.body.get("content", ())) - 1)
+            self._text(index).append(text)
+            return True
+
+    def anthropic_message_delta(self, chunk):
+        self.body.update(chunk.get("delta") or {})
+        usage = chunk.get("usage")
+        if usage:
+            self.body.setdefault("usage", {}).update(usage)
+
+    def anthropic_message_stop(self, chunk):
+        self.finished = True
+
+    ANTHROPIC_EVENTS = {
+        "message_start": anthropic_message_start,
+        "content_block_start": anthropic_content_block_start,
+        "content_block_delta": anthropic_content_block_delta,
+        "message_delta": anthropic_message_delta,
+        "message_stop": anthropic_message_stop,
+    }
+
+    def add_anthropic(self, chunk):
+        handler = self.ANTHROPIC_EVENTS.get(chunk.get("type"))
+        if handler is not None:
+            return handler(self, chunk)
+        # Text completions API
+        if "completion" in chunk:
+            self._text().append(chunk["completion"])
+            self.body["stop_reason"] = chunk.get("stop_reason")
+            if chunk.get("stop_reason") is not None:
+                self.finished = True
+            return bool(chunk["completion"])
+
+    def finish_anthropic(self):
+        if "content" not in self.body:
+            self.body["completion"] = self._joined()
+            return self.body
+        for index, block in enumerate(self.body["content"]):
+            if index < len(self.blocks) and self.blocks[index]:
+                block["text"] = block.get("text", "") + self._joined(index)
+        return self.body
+
+    # Amazon Titan
+
+    def add_amazon(self, chunk):
+        text = chunk.get("outputText")
+        if text:
+            self._text().append(text)
+        for key in ("inputTextTokenCount", "totalOutputTextTokenCount"):
+            if chunk.get(key) is not None:
+                self.body[key] = chunk[key]
+        if chunk.get("completionReason") is not None:
+            self.body["completionReason"] = chunk["completionReason"]
+            self.finished = True
+        return bool(text)
+
+    def finish_amazon(self):
+        self.body["outputText"] = self._joined()
+        self.body["outputTextTokenCount"] = self.body.pop(
+            "totalOutputTextTokenCount", None
+        )
+        return self.body
+
+    # Meta Llama
+
+    def add_meta(self, chunk):
+        text = chunk.get("generation")
+        if text:
+            self._text().append(text)
+        for key in ("prompt_token_count", "generation_token_count"):
+            if chunk.get(key) is not None:
+                self.body[key] = chunk[key]
+        if chunk.get("stop_reason") is not None:
+            self.body["stop_reason"] = chunk["stop_reason"]
+            self.finished = True
+        return bool(text)
+
+    def finish_meta(self):
+        self.body["generation"] = self._joined()
+        return self.body
+
+    # Cohere Command (`generations`) and Command R (`text` events)
+
+    def add_cohere(self, chunk):
+        generations = chunk.get("generations")
+        if generations:
+            chunk = generations[0]
+        text = None
+        if chunk.get("event_type", "text-generation") == "text-generation":
+            text = chunk.get("text")
+        if text:
+            self._text().append(text)
+        if chunk.get("finish_reason") is not None:
+            self.body["finish_reason"] = chunk["finish_reason"]
+        if chunk.get("is_finished"):
+            self.finished = True
+        return bool(text)
+
+    def finish_cohere(self):
+        self.body["text"] = self._joined()
+        return self.body
+
+    def add_unknown(self, chunk):
+        self.body.update(chunk)
+
+    def finish_unknown(self):
+        return self.body
+
+    # Chunk handler and body builder of each model vendor, the prefix of the
+    # model id.
+    HANDLERS = {
+        "anthropic": (add_anthropic, finish_anthropic),
+        "amazon": (add_amazon, finish_amazon),
+        "meta": (add_meta, finish_meta),
+        "cohere": (add_cohere, finish_cohere),
+    }
+    UNKNOWN = (add_unknown, finish_unknown)
+
+
+class StreamingBedrockWrapper(ObjectProxy):
+    """
+    Wraps the body of an `invoke_model_with_response_stream` response. The
+    chunks are accumulated as the caller reads them and `stream_done_callback`
+    is called once with the rebuilt response body, when the model finishes,
+    when the stream is exhausted or fails, or when the caller stops reading.
+    Errors raised while reading are recorded on `span`.
+    """
 
-class StreamingWrapper(ObjectProxy):
     def __init__(
         self,
         response,
         stream_done_callback=None,
+        stream_timer=None,
+        vendor=None,
+        span=None,
     ):
         super().__init__(response)
 
-        self._stream_done_callback = stream_done_callback
-        self._accumulating_body = {}
+        self._self_stream_done_callback = stream_done_callback
+        self._self_timer = stream_timer or StreamTimer()
+        self._self_accumulator = BedrockStreamAccumulator(vendor)
+        self._self_span = span
+        self._self_done = False
 
     def __iter__(self):
-        for event in self.__wrapped__:
-            self._process_event(event)
-            yield event
+        try:
+            for event in self.__wrapped__:
+                self._self_timer.chunk()
+                self._process_event(event)
+                yield event
+        except Exception as err:
+            if self._self_span is not None:
+                self._self_span.record_exception(err)
+                self._self_span.set_status(Status(StatusCode.ERROR, str(err)))
+            raise
+        finally:
+            self._finish()
 
     def _process_event(self, event):
         chunk = event.get("chunk")
         if not chunk:
             return
+        if self._self_accumulator.add(chunk.get("bytes")):
+            self._self_timer.content()
+        if self._self_accumulator.finished:
+            self._finish()
 
-        decoded_chunk = json.loads(chunk.get("bytes").decode())
-        type = decoded_chunk.get("type")
-
-        if type == "message_start":
-            self._accumulating_body = decoded_chunk.get("message")
-        elif type == "content_block_start":
-            self._accumulating_body["content"].append(
-                decoded_chunk.get("content_block")
-            )
-        elif type == "content_block_delta":
-            self._accumulating_body["content"][-1]["text"] += decoded_chunk.get(
-                "delta"
-            ).get("text")
-        elif type == "message_stop" and self._stream_done_callback:
-            self._accumulating_body["invocation_metrics"] = decoded_chunk.get(
-                "amazon-bedrock-invocationMetrics"
-            )
-            self._stream_done_callback(self._accumulating_body)
+    def _finish(self):
+        if self._self_done:
+            return
+        self._self_done = True
+        if self._self_stream_done_callback:
+            self._self_stream_done_callback(self._self_accumulator.result())
@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Collection
 
@@ -23,6 +22,7 @@ from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper as _W
 
 from obiguard_trace_python_sdk.instrumentation.aws_bedrock.patch import patch_aws_bedrock
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -35,7 +35,7 @@ class AWSBedrockInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("boto3")
+        version = get_package_version("boto3")
 
         _W(
             module="boto3",
@@ -17,6 +17,7 @@ limitations under the License.
 import json
 
 from wrapt import ObjectProxy
+from .bedrock_streaming_wrapper import StreamingBedrockWrapper
 from .stream_body_wrapper import BufferedStreamBody
 from functools import wraps
 from langtrace.trace_attributes import (
@@ -43,27 +44,36 @@ from obiguard_trace_python_sdk.utils.llm import (
     set_span_attributes,
     set_usage_attributes,
 )
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
+from obiguard_trace_python_sdk.utils.stream_capture import StreamCapture
+from obiguard_trace_python_sdk.utils.stream_timing import StreamTimer
 
 
 def converse_stream(original_method, version, tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["AWS_BEDROCK"]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["CONVERSE_STREAM"]["ENDPOINT"],
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(APIS["CONVERSE_STREAM"]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["AWS_BEDROCK"]
+
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["CONVERSE_STREAM"]["ENDPOINT"],
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
             set_span_attributes(span, attributes)
             try:
                 result = wrapped(*args, **kwargs)
@@ -105,31 +115,43 @@ def patch_converse_stream(original_method, tracer, version):
     def traced_method(*args, **kwargs):
         modelId = kwargs.get("modelId")
         (vendor, _) = modelId.split(".")
-        input_content = [
-            {
-                "role": message.get("role", "user"),
-                "content": message.get("content", [])[0].get("text", ""),
-            }
-            for message in kwargs.get("messages", [])
-        ]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, vendor, vendor_type="framework"),
-            **get_llm_request_attributes(kwargs, model=modelId, prompts=input_content),
-            **get_llm_url(args[0] if args else None),
-            **get_extra_attributes(),
-        }
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name("aws_bedrock.converse"),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
-            set_span_attributes(span, span_attributes)
-            response = original_method(*args, **kwargs)
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return original_method(*args, **kwargs)
 
-            if span.is_recording():
-                set_span_streaming_response(span, response)
-            return response
+        try:
+            input_content = [
+                {
+                    "role": message.get("role", "user"),
+                    "content": message.get("content", [])[0].get("text", ""),
+                }
+                for message in kwargs.get("messages", [])
+            ]
+
+            span_attributes = {
+                **get_langtrace_attributes(version, vendor, vendor_type="framework"),
+                **get_llm_request_attributes(
+                    kwargs, model=modelId, prompts=input_content
+                ),
+                **get_llm_url(args[0] if args else None),
+                **get_extra_attributes(),
+            }
+            # The span stays open until the caller has read the stream.
+            with trace.use_span(span):
+                set_span_attributes(span, span_attributes)
+                timer = StreamTimer()
+                response = original_method(*args, **kwargs)
+        except Exception:
+            span.end()
+            raise
+
+        response["stream"] = ConverseStreamWrapper(response["stream"], span, timer)
+        return response
 
     return traced_method
 
@@ -138,25 +160,32 @@ def patch_converse(original_method, tracer, version):
     def traced_method(*args, **kwargs):
         modelId = kwargs.get("modelId")
         (vendor, _) = modelId.split(".")
-        input_content = [
-            {
-                "role": message.get("role", "user"),
-                "content": message.get("content", [])[0].get("text", ""),
-            }
-            for message in kwargs.get("messages", [])
-        ]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, vendor, vendor_type="framework"),
-            **get_llm_request_attributes(kwargs, model=modelId, prompts=input_content),
-            **get_llm_url(args[0] if args else None),
-            **get_extra_attributes(),
-        }
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name("aws_bedrock.converse"),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return original_method(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            input_content = [
+                {
+                    "role": message.get("role", "user"),
+                    "content": message.get("content", [])[0].get("text", ""),
+                }
+                for message in kwargs.get("messages", [])
+            ]
+
+            span_attributes = {
+                **get_langtrace_attributes(version, vendor, vendor_type="framework"),
+                **get_llm_request_attributes(
+                    kwargs, model=modelId, prompts=input_content
+                ),
+                **get_llm_url(args[0] if args else None),
+                **get_extra_attributes(),
+            }
             set_span_attributes(span, span_attributes)
             response = original_method(*args, **kwargs)
 
@@ -171,15 +200,20 @@ def patch_invoke_model(original_method, tracer, version):
     def traced_method(*args, **kwargs):
         modelId = kwargs.get("modelId")
         (vendor, _) = modelId.split(".")
-        span_attributes = {
-            **get_langtrace_attributes(version, vendor, vendor_type="framework"),
-            **get_extra_attributes(),
-        }
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name("aws_bedrock.invoke_model"),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return original_method(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            span_attributes = {
+                **get_langtrace_attributes(version, vendor, vendor_type="framework"),
+                **get_extra_attributes(),
+            }
             set_span_attributes(span, span_attributes)
             response = original_method(*args, **kwargs)
             if span.is_recording():
@@ -194,17 +228,27 @@ def patch_invoke_model_with_response_stream(original_method, tracer, version):
     def traced_method(*args, **kwargs):
         modelId = kwargs.get("modelId")
         (vendor, _) = modelId.split(".")
-        span_attributes = {
-            **get_langtrace_attributes(version, vendor, vendor_type="framework"),
-            **get_extra_attributes(),
-        }
         span = tracer.start_span(
             name=get_span_name("aws_bedrock.invoke_model_with_response_stream"),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
         )
-        set_span_attributes(span, span_attributes)
-        response = original_method(*args, **kwargs)
+        if not span.is_recording():
+            return original_method(*args, **kwargs)
+
+        # The span stays open until the caller has read the stream.
+        try:
+            span_attributes = {
+                **get_langtrace_attributes(version, vendor, vendor_type="framework"),
+                **get_extra_attributes(),
+            }
+            set_span_attributes(span, span_attributes)
+            response = original_method(*args, **kwargs)
+        except Exception as err:
+            span.record_exception(err)
+            span.set_status(Status(StatusCode.ERROR, str(err)))
+            span.end()
+            raise
         if span.is_recording():
             handle_streaming_call(span, kwargs, response)
         return response
@@ -213,30 +257,22 @@ def patch_invoke_model_with_response_stream(original_method, tracer, version):
 
 
 def handle_streaming_call(span, kwargs, response):
+    timer = StreamTimer.for_span(span)
+    request_body = json.loads(kwargs.get("body"))
+    (vendor, model) = kwargs.get("modelId").split(".")
 
     def stream_finished(response_body):
-        request_body = json.loads(kwargs.get("body"))
-
-        (vendor, model) = kwargs.get("modelId").split(".")
-
         set_span_attribute(span, SpanAttributes.LLM_REQUEST_MODEL, model)
         set_span_attribute(span, SpanAttributes.LLM_RESPONSE_MODEL, model)
+        set_invoke_model_attributes(span, vendor, request_body, response_body)
 
-        if vendor == "amazon":
-            set_amazon_attributes(span, request_body, response_body)
-
-        if vendor == "anthropic":
-            if "prompt" in request_body:
-                set_anthropic_completions_attributes(span, request_body, response_body)
-            elif "messages" in request_body:
-                set_anthropic_messages_attributes(span, request_body, response_body)
-
-        if vendor == "meta":
-            set_llama_meta_attributes(span, request_body, response_body)
-
+        metrics = response_body.get("invocation_metrics") or {}
+        timer.record(span, metrics.get("outputTokenCount"))
         span.end()
 
-    response["body"] = StreamingBedrockWrapper(response["body"], stream_finished)
+    response["body"] = StreamingBedrockWrapper(
+        response["body"], stream_finished, timer, vendor, span
+    )
 
 
 def handle_call(span, kwargs, response):
@@ -246,11 +282,15 @@ def handle_call(span, kwargs, response):
         response["body"]._raw_stream, response["body"]._content_length
     )
     request_body = json.loads(kwargs.get("body"))
-    response_body = json.loads(response.get("body").read())
+    # Parsed once; the caller still reads the body from the start.
+    response_body = response["body"].json()
 
     set_span_attribute(span, SpanAttributes.LLM_RESPONSE_MODEL, modelId)
     set_span_attribute(span, SpanAttributes.LLM_REQUEST_MODEL, modelId)
+    set_invoke_model_attributes(span, vendor, request_body, response_body)
 
+
+def set_invoke_model_attributes(span, vendor, request_body, response_body):
     if vendor == "amazon":
         set_amazon_attributes(span, request_body, response_body)
 
@@ -263,6 +303,9 @@ def handle_call(span, kwargs, response):
     if vendor == "meta":
         set_llama_meta_attributes(span, request_body, response_body)
 
+    if vendor == "cohere":
+        set_cohere_attributes(span, request_body, response_body)
+
 
 def set_llama_meta_attributes(span, request_body, response_body):
     set_span_attribute(
@@ -356,6 +399,51 @@ def set_amazon_attributes(span, request_body, response_body):
     set_event_completion(span, completions)
 
 
+def set_cohere_attributes(span, request_body, response_body):
+    set_span_attribute(
+        span, SpanAttributes.LLM_REQUEST_MAX_TOKENS, request_body.get("max_tokens")
+    )
+    set_span_attribute(
+        span, SpanAttributes.LLM_REQUEST_TEMPERATURE, request_body.get("temperature")
+    )
+    set_span_attribute(span, SpanAttributes.LLM_REQUEST_TOP_P, request_body.get("p"))
+    prompts = [
+        {
+            "role": "user",
+            # Command R takes a `message`, Command a `prompt`.
+            "content": request_body.get("message") or request_body.get("prompt"),
+        }
+    ]
+    if "generations" in response_body:
+        completions = [
+            {"role": "assistant", "content": generation.get("text")}
+            for generation in response_body.get("generations")
+        ]
+    else:
+        completions = [{"role": "assistant", "content": response_body.get("text")}]
+
+    set_invocation_metrics_usage(span, response_body)
+    set_span_attribute(span, SpanAttributes.LLM_PROMPTS, json.dumps(prompts))
+    set_event_completion(span, completions)
+
+
+def set_invocation_metrics_usage(span, response_body):
+    # Streamed responses carry the token counts Bedrock reports for them.
+    metrics = response_body.get("invocation_metrics")
+    if metrics:
+        set_usage_attributes(
+            span,
+            {
+                "input_tokens": metrics.get("inputTokenCount"),
+                "output_tokens": metrics.get("outputTokenCount"),
+                "cache_read_input_tokens": metrics.get("cacheReadInputTokenCount"),
+                "cache_creation_input_tokens": metrics.get(
+                    "cacheWriteInputTokenCount"
+                ),
+            },
+        )
+
+
 def set_anthropic_completions_attributes(span, request_body, response_body):
     set_span_attribute(
         span,
@@ -384,6 +472,7 @@ def set_anthropic_completions_attributes(span, request_body, response_body):
             "content": response_body.get("completion"),
         }
     ]
+    set_invocation_metrics_usage(span, response_body)
     set_span_attribute(span, SpanAttributes.LLM_PROMPTS, json.dumps(prompts))
     set_event_completion(span, completions)
 
@@ -426,102 +515,80 @@ def _set_response_attributes(span, kwargs, result):
         set_event_completion(span, responses)
 
     if "usage" in result:
-        set_span_attributes(
-            span,
-            {
-                SpanAttributes.LLM_USAGE_COMPLETION_TOKENS: result["usage"].get(
-                    "outputTokens"
-                ),
-                SpanAttributes.LLM_USAGE_PROMPT_TOKENS: result["usage"].get(
-                    "inputTokens"
-                ),
-                SpanAttributes.LLM_USAGE_TOTAL_TOKENS: result["usage"].get(
-                    "totalTokens"
-                ),
-            },
-        )
-
-
-def set_span_streaming_response(span, response):
-    streaming_response = ""
-    role = None
-    for event in response["stream"]:
-        if "messageStart" in event:
-            role = event["messageStart"]["role"]
-        elif "contentBlockDelta" in event:
-            delta = event["contentBlockDelta"]["delta"]
-            if "text" in delta:
-                streaming_response += delta["text"]
-        elif "metadata" in event and "usage" in event["metadata"]:
-            usage = event["metadata"]["usage"]
-            set_usage_attributes(
-                span,
-                {
-                    "input_tokens": usage.get("inputTokens"),
-                    "output_tokens": usage.get("outputTokens"),
-                },
-            )
-
-    if streaming_response:
-        set_event_completion(
-            span, [{"role": role or "assistant", "content": streaming_response}]
-        )
-
-
-class StreamingBedrockWrapper(ObjectProxy):
-    def __init__(
-        self,
-        response,
-        stream_done_callback=None,
-    ):
-        super().__init__(response)
-
-        self._stream_done_callback = stream_done_callback
-        self._accumulating_body = {"generation": ""}
+        set_usage_attributes(span, converse_usage(result["usage"]))
+
+
+def converse_usage(usage):
+    # Like Anthropic, Bedrock leaves prompt cache reads and writes out of
+    # inputTokens; totalTokens counts them.
+    return {
+        "input_tokens": usage.get("inputTokens"),
+        "output_tokens": usage.get("outputTokens"),
+        "cache_read_input_tokens": usage.get("cacheReadInputTokens"),
+        "cache_creation_input_tokens": usage.get("cacheWriteInputTokens"),
+    }
+
+
+class ConverseStreamWrapper(ObjectProxy):
+    """
+    Wraps the EventStream of a `converse_stream` response. Text deltas and
+    usage are collected as the caller reads events, and the span ends after
+    the final `metadata` event, when the stream is exhausted or when it is
+    closed.
+    """
+
+    def __init__(self, stream, span, timer):
+        super().__init__(stream)
+        self._self_span = span
+        self._self_timer = timer
+        self._self_role = None
+        self._self_content = StreamCapture()
+        self._self_output_tokens = None
+        self._self_ended = False
 
     def __iter__(self):
-        for event in self.__wrapped__:
-            self._process_event(event)
-            yield event
+        try:
+            for event in self.__wrapped__:
+                self._self_timer.chunk()
+                self._process_event(event)
+                yield event
+        except Exception as err:
+            self._self_span.record_exception(err)
+            self._self_span.set_status(Status(StatusCode.ERROR, str(err)))
+            raise
+        finally:
+            self._end()
+
+    def close(self):
+        self._end()
+        self.__wrapped__.close()
 
     def _process_event(self, event):
-        chunk = event.get("chunk")
-        if not chunk:
-            return
-
-        decoded_chunk = json.loads(chunk.get("bytes").decode())
-        type = decoded_chunk.get("type")
-
-        if type is None and "outputText" in decoded_chunk:
-            self._stream_done_callback(decoded_chunk)
+        if "contentBlockDelta" in event:
+            delta = event["contentBlockDelta"]["delta"]
+            if "text" in delta:
+                self._self_timer.content()
+                self._self_content.append(delta["text"])
+        elif "messageStart" in event:
+            self._self_role = event["messageStart"]["role"]
+        elif "metadata" in event:
+            usage = event["metadata"].get("usage")
+            if usage:
+                self._self_output_tokens = usage.get("outputTokens")
+                set_usage_attributes(self._self_span, converse_usage(usage))
+            # Bedrock sends metadata last; do not wait for the caller to
+            # exhaust or close the stream to end the span.
+            self._end()
+
+    def _end(self):
+        if self._self_ended:
             return
-        if "generation" in decoded_chunk:
-            self._accumulating_body["generation"] += decoded_chunk.get("generation")
-
-        if type == "message_start":
-            self._accumulating_body = decoded_chunk.get("message")
-        elif type == "content_block_start":
-            self._accumulating_body["content"].append(
-                decoded_chunk.get("content_block")
-            )
-        elif type == "content_block_delta":
-            self._accumulating_body["content"][-1]["text"] += decoded_chunk.get(
-                "delta"
-            ).get("text")
-
-        elif self.has_finished(type, decoded_chunk):
-            self._accumulating_body["invocation_metrics"] = decoded_chunk.get(
-                "amazon-bedrock-invocationMetrics"
-            )
-            self._stream_done_callback(self._accumulating_body)
-
-    def has_finished(self, type, chunk):
-        if type and type == "message_stop":
-            return True
-
-        if "completionReason" in chunk and chunk.get("completionReason") == "FINISH":
-            return True
-
-        if "stop_reason" in chunk and chunk.get("stop_reason") is not None:
-            return True
-        return False
+        self._self_ended = True
+        self._self_timer.record(self._self_span, self._self_output_tokens)
+        if self._self_content:
+            completion = {
+                "role": self._self_role or "assistant",
+                "content": self._self_content.text(),
+            }
+            set_event_completion(self._self_span, [completion])
+        self._self_span.end()
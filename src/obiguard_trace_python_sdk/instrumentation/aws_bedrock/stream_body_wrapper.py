@@ -1,3 +1,5 @@
+import json
+
 from botocore.response import StreamingBody
 from botocore.exceptions import (
     ReadTimeoutError,
@@ -8,34 +10,68 @@ from urllib3.exceptions import ReadTimeoutError as URLLib3ReadTimeoutError
 
 
 class BufferedStreamBody(StreamingBody):
+    """
+    A `StreamingBody` that reads the response once into memory, so the
+    instrumentation can inspect it and the caller can still read it.
+
+    Reads move a cursor over the buffer like reads of the original body. A
+    read of the whole body returns the buffer itself and `readinto()` copies
+    straight from a memoryview of it; only partial `read(amt)` calls copy the
+    bytes they return. `json()` parses the body once and shares the result.
+    """
+
     def __init__(self, raw_stream, content_length):
         super().__init__(raw_stream, content_length)
         self._buffer = None
+        self._view = None
         self._buffer_cursor = 0
+        self._parsed = None
+
+    def _fill(self):
+        if self._buffer is not None:
+            return
+        try:
+            self._buffer = self._raw_stream.read()
+        except URLLib3ReadTimeoutError as e:
+            # TODO: the url will be None as urllib3 isn't setting it yet
+            raise ReadTimeoutError(endpoint_url=e.url, error=e)
+        except URLLib3ProtocolError as e:
+            raise ResponseStreamingError(error=e)
+        self._view = memoryview(self._buffer)
+        self._amount_read += len(self._buffer)
+        # The whole body has been read, so its length can be verified.
+        self._verify_content_length()
 
     def read(self, amt=None):
         """Read at most amt bytes from the stream.
 
         If the amt argument is omitted, read all data.
         """
-        if self._buffer is None:
-            try:
-                self._buffer = self._raw_stream.read()
-            except URLLib3ReadTimeoutError as e:
-                # TODO: the url will be None as urllib3 isn't setting it yet
-                raise ReadTimeoutError(endpoint_url=e.url, error=e)
-            except URLLib3ProtocolError as e:
-                raise ResponseStreamingError(error=e)
-
-            self._amount_read += len(self._buffer)
-            if amt is None or (not self._buffer and amt > 0):
-                # If the server sends empty contents or
-                # we ask to read all of the contents, then we know
-                # we need to verify the content length.
-                self._verify_content_length()
-
-        if amt is None:
-            return self._buffer[self._buffer_cursor :]
-        else:
-            self._buffer_cursor += amt
-            return self._buffer[self._buffer_cursor - amt : self._buffer_cursor]
+        self._fill()
+        start = self._buffer_cursor
+        size = len(self._buffer)
+        end = size if amt is None else min(start + amt, size)
+        self._buffer_cursor = end
+        if start == 0 and end == size:
+            return self._buffer
+        return self._buffer[start:end]
+
+    def readinto(self, b):
+        """Read bytes into a pre-allocated, writable bytes-like object b, and return the number of bytes read."""
+        self._fill()
+        target = memoryview(b).cast("B")
+        start = self._buffer_cursor
+        count = min(len(target), len(self._buffer) - start)
+        target[:count] = self._view[start : start + count]
+        self._buffer_cursor = start + count
+        return count
+
+    def json(self):
+        """
+        The body parsed as JSON. It is parsed on the first call only and the
+        read cursor does not move.
+        """
+        if self._parsed is None:
+            self._fill()
+            self._parsed = json.loads(self._buffer)
+        return self._parsed
@@ -19,7 +19,7 @@ from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 from opentelemetry.semconv.schemas import Schemas
 from wrapt import wrap_function_wrapper
-from importlib_metadata import version as v
+from obiguard_trace_python_sdk.utils import get_package_version
 from .patch import chat_completions_create, async_chat_completions_create
 
 
@@ -36,7 +36,7 @@ class CerebrasInstrumentation(BaseInstrumentor):
         tracer = get_tracer(
             __name__, "", tracer_provider, schema_url=Schemas.V1_27_0.value
         )
-        version = v("cerebras-cloud-sdk")
+        version = get_package_version("cerebras-cloud-sdk")
 
         wrap_function_wrapper(
             module="cerebras.cloud.sdk",
@@ -1,4 +1,5 @@
 from obiguard_trace_python_sdk.instrumentation.groq.patch import extract_content
+from opentelemetry import trace
 from opentelemetry.trace import SpanKind
 from obiguard_trace_python_sdk.utils.llm import (
     get_llm_request_attributes,
@@ -10,6 +11,10 @@ from obiguard_trace_python_sdk.utils.llm import (
     set_span_attributes,
     StreamWrapper,
 )
+from obiguard_trace_python_sdk.utils.prompt_cache import (
+    prompt_cache_usage,
+    record_prompt_cache_usage,
+)
 from obiguard_trace_python_sdk.utils.silently_fail import silently_fail
 from obiguard_trace_python_sdk.constants.instrumentation.common import SERVICE_PROVIDERS
 from langtrace.trace_attributes import SpanAttributes
@@ -18,30 +23,30 @@ from obiguard_trace_python_sdk.utils import handle_span_error, set_span_attribut
 
 def chat_completions_create(version: str, tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        llm_prompts = []
-        for message in kwargs.get("messages", []):
-            llm_prompts.append(message)
-
-        span_attributes = {
-            **get_langtrace_attributes(version, SERVICE_PROVIDERS["CEREBRAS"]),
-            **get_llm_request_attributes(kwargs, prompts=llm_prompts),
-            **get_llm_url(instance),
-            **get_extra_attributes(),
-        }
-
-        span_name = f"{span_attributes[SpanAttributes.LLM_OPERATION_NAME]} {span_attributes[SpanAttributes.LLM_REQUEST_MODEL]}"
-        with tracer.start_as_current_span(
-            name=span_name,
+        span = tracer.start_span(
+            name=f"chat {kwargs.get('model')}",
             kind=SpanKind.CLIENT,
-            attributes=span_attributes,
-            end_on_exit=False,
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
 
+        with trace.use_span(span):
             try:
+                llm_prompts = []
+                for message in kwargs.get("messages", []):
+                    llm_prompts.append(message)
+
+                span_attributes = {
+                    **get_langtrace_attributes(version, SERVICE_PROVIDERS["CEREBRAS"]),
+                    **get_llm_request_attributes(kwargs, prompts=llm_prompts),
+                    **get_llm_url(instance),
+                    **get_extra_attributes(),
+                }
                 _set_input_attributes(span, kwargs, span_attributes)
                 result = wrapped(*args, **kwargs)
                 if is_streaming(kwargs):
-                    return StreamWrapper(result, span)
+                    return StreamWrapper(result, span, vendor="openai")
 
                 if span.is_recording():
                     _set_response_attributes(span, result)
@@ -57,30 +62,30 @@ def chat_completions_create(version: str, tracer):
 
 def async_chat_completions_create(version: str, tracer):
     async def traced_method(wrapped, instance, args, kwargs):
-        llm_prompts = []
-        for message in kwargs.get("messages", []):
-            llm_prompts.append(message)
-
-        span_attributes = {
-            **get_langtrace_attributes(version, SERVICE_PROVIDERS["CEREBRAS"]),
-            **get_llm_request_attributes(kwargs, prompts=llm_prompts),
-            **get_llm_url(instance),
-            **get_extra_attributes(),
-        }
-
-        span_name = f"{span_attributes[SpanAttributes.LLM_OPERATION_NAME]} {span_attributes[SpanAttributes.LLM_REQUEST_MODEL]}"
-        with tracer.start_as_current_span(
-            name=span_name,
+        span = tracer.start_span(
+            name=f"chat {kwargs.get('model')}",
             kind=SpanKind.CLIENT,
-            attributes=span_attributes,
-            end_on_exit=False,
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return await wrapped(*args, **kwargs)
 
+        with trace.use_span(span):
             try:
+                llm_prompts = []
+                for message in kwargs.get("messages", []):
+                    llm_prompts.append(message)
+
+                span_attributes = {
+                    **get_langtrace_attributes(version, SERVICE_PROVIDERS["CEREBRAS"]),
+                    **get_llm_request_attributes(kwargs, prompts=llm_prompts),
+                    **get_llm_url(instance),
+                    **get_extra_attributes(),
+                }
                 _set_input_attributes(span, kwargs, span_attributes)
                 result = await wrapped(*args, **kwargs)
                 if is_streaming(kwargs):
-                    return StreamWrapper(result, span)
+                    return StreamWrapper(result, span, vendor="openai")
 
                 if span.is_recording():
                     _set_response_attributes(span, result)
@@ -131,6 +136,10 @@ def _set_response_attributes(span, result):
             SpanAttributes.LLM_USAGE_COMPLETION_TOKENS,
             result.usage.completion_tokens,
         )
+        cache_read, cache_write, _ = prompt_cache_usage(result.usage)
+        record_prompt_cache_usage(
+            span, result.usage.prompt_tokens, cache_read, cache_write
+        )
 
 
 @silently_fail
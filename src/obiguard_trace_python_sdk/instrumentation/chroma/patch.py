@@ -15,9 +15,10 @@ limitations under the License.
 """
 
 from langtrace.trace_attributes import DatabaseSpanAttributes
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
 from obiguard_trace_python_sdk.utils.llm import get_span_name
 from obiguard_trace_python_sdk.utils.silently_fail import silently_fail
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import Status, StatusCode
@@ -28,9 +29,7 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     SERVICE_PROVIDERS,
 )
 import json
-from importlib_metadata import version as v
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 
 
 def collection_patch(method, version, tracer):
@@ -40,32 +39,38 @@ def collection_patch(method, version, tracer):
 
     def traced_method(wrapped, instance, args, kwargs):
         api = APIS[method]
-        service_provider = SERVICE_PROVIDERS["CHROMA"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "vectordb",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "db.system": "chromadb",
-            "db.operation": api["OPERATION"],
-            "db.query": json.dumps(kwargs),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        if hasattr(instance, "name") and instance.name is not None:
-            span_attributes["db.collection.name"] = instance.name
-
-        attributes = DatabaseSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(api["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
-            for field, value in attributes.model_dump(by_alias=True).items():
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["CHROMA"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "vectordb",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "db.system": "chromadb",
+                "db.operation": api["OPERATION"],
+                "db.query": json.dumps(kwargs),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            if hasattr(instance, "name") and instance.name is not None:
+                span_attributes["db.collection.name"] = instance.name
+
+            attributes = build_span_attributes(DatabaseSpanAttributes, span_attributes)
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
             try:
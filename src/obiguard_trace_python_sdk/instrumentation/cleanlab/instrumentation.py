@@ -11,7 +11,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Any, Collection, Optional
 
@@ -20,6 +19,7 @@ from opentelemetry.trace import TracerProvider, get_tracer
 from wrapt import wrap_function_wrapper
 
 from obiguard_trace_python_sdk.instrumentation.cleanlab.patch import generic_patch
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -32,7 +32,7 @@ class CleanLabInstrumentation(BaseInstrumentor):  # type: ignore
     def _instrument(self, **kwargs: Any) -> None:
         tracer_provider: Optional[TracerProvider] = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version: str = importlib.metadata.version("cleanlab_tlm")
+        version: str = get_package_version("cleanlab_tlm")
 
         wrap_function_wrapper(
             "cleanlab_tlm.tlm",
@@ -1,19 +1,19 @@
 import json
 from typing import Any, Callable, List
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import FrameworkSpanAttributes
-from opentelemetry import baggage
+from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind, Tracer
 from opentelemetry.trace.status import Status, StatusCode
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
+from obiguard_trace_python_sdk.utils import get_sdk_version
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, SERVICE_PROVIDERS)
 from obiguard_trace_python_sdk.instrumentation.openai.types import \
     ChatCompletionsCreateKwargs
 from obiguard_trace_python_sdk.utils.llm import set_span_attributes
 from obiguard_trace_python_sdk.utils.misc import serialize_args, serialize_kwargs
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def generic_patch(version: str, tracer: Tracer) -> Callable:
@@ -25,25 +25,31 @@ def generic_patch(version: str, tracer: Tracer) -> Callable:
         args: List[Any],
         kwargs: ChatCompletionsCreateKwargs,
     ) -> Any:
-        service_provider = SERVICE_PROVIDERS["CLEANLAB"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
+        span = tracer.start_span(
+            name=f"tlm.{wrapped.__name__}", kind=SpanKind.CLIENT
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
 
-        span_attributes["tlm.metadata"] = serialize_kwargs(**kwargs)
-        span_attributes["tlm.inputs"] = serialize_args(*args)
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["CLEANLAB"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
 
-        attributes = FrameworkSpanAttributes(**span_attributes)
+            span_attributes["tlm.metadata"] = serialize_kwargs(**kwargs)
+            span_attributes["tlm.inputs"] = serialize_args(*args)
 
-        with tracer.start_as_current_span(
-            name=f"tlm.{wrapped.__name__}", kind=SpanKind.CLIENT
-        ) as span:
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
                 set_span_attributes(span, attributes)
                 result = wrapped(*args, **kwargs)
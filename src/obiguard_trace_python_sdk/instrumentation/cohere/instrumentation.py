@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 from typing import Collection
 
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
@@ -28,6 +27,7 @@ from obiguard_trace_python_sdk.instrumentation.cohere.patch import (
     embed,
     rerank,
 )
+from obiguard_trace_python_sdk.utils import get_package_version
 
 
 class CohereInstrumentation(BaseInstrumentor):
@@ -41,7 +41,7 @@ class CohereInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("cohere")
+        version = get_package_version("cohere")
 
         wrap_function_wrapper(
             "cohere.client",
@@ -29,6 +29,7 @@ from obiguard_trace_python_sdk.utils.llm import (
 from langtrace.trace_attributes import Event, LLMSpanAttributes
 from obiguard_trace_python_sdk.utils import set_span_attribute
 from obiguard_trace_python_sdk.utils.misc import datetime_encoder
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import Status, StatusCode
 
@@ -43,30 +44,38 @@ def rerank(original_method, version, tracer, v2=False):
     """Wrap the `rerank` method."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["COHERE"]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(kwargs, operation_name="rerank"),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_REQUEST_MODEL: kwargs.get("model") or "command-r-plus",
-            SpanAttributes.LLM_URL: APIS["RERANK" if not v2 else "RERANK_V2"]["URL"],
-            SpanAttributes.LLM_PATH: APIS["RERANK" if not v2 else "RERANK_V2"]["ENDPOINT"],
-            SpanAttributes.LLM_REQUEST_DOCUMENTS: json.dumps(
-                kwargs.get("documents"), cls=datetime_encoder
-            ),
-            SpanAttributes.LLM_COHERE_RERANK_QUERY: kwargs.get("query"),
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
         span = tracer.start_span(
             name=get_span_name(APIS["RERANK" if not v2 else "RERANK_V2"]["METHOD"]), kind=SpanKind.CLIENT
         )
-        for field, value in attributes.model_dump(by_alias=True).items():
-            set_span_attribute(span, field, value)
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
+
         try:
+            service_provider = SERVICE_PROVIDERS["COHERE"]
+
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(kwargs, operation_name="rerank"),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_REQUEST_MODEL: kwargs.get("model")
+                or "command-r-plus",
+                SpanAttributes.LLM_URL: APIS["RERANK" if not v2 else "RERANK_V2"][
+                    "URL"
+                ],
+                SpanAttributes.LLM_PATH: APIS["RERANK" if not v2 else "RERANK_V2"][
+                    "ENDPOINT"
+                ],
+                SpanAttributes.LLM_REQUEST_DOCUMENTS: json.dumps(
+                    kwargs.get("documents"), cls=datetime_encoder
+                ),
+                SpanAttributes.LLM_COHERE_RERANK_QUERY: kwargs.get("query"),
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            for field, value in attributes.items():
+                set_span_attribute(span, field, value)
             # Attempt to call the original method
             result = wrapped(*args, **kwargs)
 
@@ -105,7 +114,7 @@ def rerank(original_method, version, tracer, v2=False):
                         "search_units",
                         int(usage.search_units) if usage.search_units else 0,
                     )
-                        
+
 
             span.set_status(StatusCode.OK)
             span.end()
@@ -124,32 +133,41 @@ def embed(original_method, version, tracer, v2=False):
     """Wrap the `embed` method."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["COHERE"]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(kwargs, operation_name="embed"),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_URL: APIS["EMBED" if not v2 else "EMBED_V2"]["URL"],
-            SpanAttributes.LLM_PATH: APIS["EMBED" if not v2 else "EMBED_V2"]["ENDPOINT"],
-            SpanAttributes.LLM_REQUEST_EMBEDDING_INPUTS: json.dumps(
-                kwargs.get("texts")
-            ),
-            SpanAttributes.LLM_REQUEST_EMBEDDING_DATASET_ID: kwargs.get("dataset_id"),
-            SpanAttributes.LLM_REQUEST_EMBEDDING_INPUT_TYPE: kwargs.get("input_type"),
-            SpanAttributes.LLM_REQUEST_EMBEDDING_JOB_NAME: kwargs.get("name"),
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
         span = tracer.start_span(
             name=get_span_name(APIS["EMBED" if not v2 else "EMBED_V2"]["METHOD"]),
             kind=SpanKind.CLIENT,
         )
-        for field, value in attributes.model_dump(by_alias=True).items():
-            set_span_attribute(span, field, value)
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
+
         try:
+            service_provider = SERVICE_PROVIDERS["COHERE"]
+
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(kwargs, operation_name="embed"),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_URL: APIS["EMBED" if not v2 else "EMBED_V2"]["URL"],
+                SpanAttributes.LLM_PATH: APIS["EMBED" if not v2 else "EMBED_V2"][
+                    "ENDPOINT"
+                ],
+                SpanAttributes.LLM_REQUEST_EMBEDDING_INPUTS: json.dumps(
+                    kwargs.get("texts")
+                ),
+                SpanAttributes.LLM_REQUEST_EMBEDDING_DATASET_ID: kwargs.get(
+                    "dataset_id"
+                ),
+                SpanAttributes.LLM_REQUEST_EMBEDDING_INPUT_TYPE: kwargs.get(
+                    "input_type"
+                ),
+                SpanAttributes.LLM_REQUEST_EMBEDDING_JOB_NAME: kwargs.get("name"),
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            for field, value in attributes.items():
+                set_span_attribute(span, field, value)
             # Attempt to call the original method
             result = wrapped(*args, **kwargs)
 
@@ -178,70 +196,75 @@ def chat_create(original_method, version, tracer):
     """Wrap the `chat_create` method."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["COHERE"]
-
-        message = kwargs.get("message", "")
-        prompts = [{"role": "user", "content": message}]
-        system_prompts = []
-        history = []
-        preamble = kwargs.get("preamble")
-        if preamble:
-            system_prompts = [{"role": "system", "content": preamble}]
-
-        chat_history = kwargs.get("chat_history")
-        if chat_history:
-            history = [
-                {
-                    "role": (
-                        item.get("role") if item.get("role") is not None else "user"
-                    ),
-                    "content": (
-                        item.get("message") if item.get("message") is not None else ""
-                    ),
-                }
-                for item in chat_history
-            ]
-        if len(history) > 0:
-            prompts = history + prompts
-        if len(system_prompts) > 0:
-            prompts = system_prompts + prompts
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(kwargs, prompts=prompts),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_REQUEST_MODEL: kwargs.get("model") or "command-r-plus",
-            SpanAttributes.LLM_URL: APIS["CHAT_CREATE"]["URL"],
-            SpanAttributes.LLM_PATH: APIS["CHAT_CREATE"]["ENDPOINT"],
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
-        if kwargs.get("max_input_tokens") is not None:
-            attributes.llm_max_input_tokens = str(kwargs.get("max_input_tokens"))
-
-        if kwargs.get("conversation_id") is not None:
-            attributes.conversation_id = kwargs.get("conversation_id")
-
-        if kwargs.get("connectors") is not None:
-            # stringify the list of objects
-            attributes.llm_connectors = json.dumps(kwargs.get("connectors"))
-        if kwargs.get("tools") is not None:
-            # stringify the list of objects
-            attributes.llm_tools = json.dumps(kwargs.get("tools"))
-        if kwargs.get("tool_results") is not None:
-            # stringify the list of objects
-            attributes.llm_tool_results = json.dumps(kwargs.get("tool_results"))
-
         span = tracer.start_span(
             name=get_span_name(APIS["CHAT_CREATE"]["METHOD"]), kind=SpanKind.CLIENT
         )
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
 
-        # Set the attributes on the span
-        for field, value in attributes.model_dump(by_alias=True).items():
-            set_span_attribute(span, field, value)
         try:
+            service_provider = SERVICE_PROVIDERS["COHERE"]
+
+            message = kwargs.get("message", "")
+            prompts = [{"role": "user", "content": message}]
+            system_prompts = []
+            history = []
+            preamble = kwargs.get("preamble")
+            if preamble:
+                system_prompts = [{"role": "system", "content": preamble}]
+
+            chat_history = kwargs.get("chat_history")
+            if chat_history:
+                history = [
+                    {
+                        "role": (
+                            item.get("role") if item.get("role") is not None else "user"
+                        ),
+                        "content": (
+                            item.get("message")
+                            if item.get("message") is not None
+                            else ""
+                        ),
+                    }
+                    for item in chat_history
+                ]
+            if len(history) > 0:
+                prompts = history + prompts
+            if len(system_prompts) > 0:
+                prompts = system_prompts + prompts
+
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(kwargs, prompts=prompts),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_REQUEST_MODEL: kwargs.get("model")
+                or "command-r-plus",
+                SpanAttributes.LLM_URL: APIS["CHAT_CREATE"]["URL"],
+                SpanAttributes.LLM_PATH: APIS["CHAT_CREATE"]["ENDPOINT"],
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            if kwargs.get("max_input_tokens") is not None:
+                attributes["llm_max_input_tokens"] = str(kwargs.get("max_input_tokens"))
+
+            if kwargs.get("conversation_id") is not None:
+                attributes["conversation_id"] = kwargs.get("conversation_id")
+
+            if kwargs.get("connectors") is not None:
+                # stringify the list of objects
+                attributes["llm_connectors"] = json.dumps(kwargs.get("connectors"))
+            if kwargs.get("tools") is not None:
+                # stringify the list of objects
+                attributes["llm_tools"] = json.dumps(kwargs.get("tools"))
+            if kwargs.get("tool_results") is not None:
+                # stringify the list of objects
+                attributes["llm_tool_results"] = json.dumps(kwargs.get("tool_results"))
+
+            # Set the attributes on the span
+            for field, value in attributes.items():
+                set_span_attribute(span, field, value)
             # Attempt to call the original method
             result = wrapped(*args, **kwargs)
 
@@ -327,7 +350,7 @@ def chat_create(original_method, version, tracer):
                             "search_units",
                             int(usage.search_units) if usage.search_units else 0,
                         )
-                            
+
                 span.set_status(StatusCode.OK)
                 span.end()
                 return result
@@ -348,43 +371,53 @@ def chat_create_v2(original_method, version, tracer, stream=False):
     """Wrap the `chat_create` method for Cohere API v2."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["COHERE"]
-        
-        messages = kwargs.get("messages", [])
-        if kwargs.get("preamble"):
-            messages = [{"role": "system", "content": kwargs["preamble"]}] + messages
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(kwargs, prompts=messages),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_REQUEST_MODEL: kwargs.get("model") or "command-r-plus",
-            SpanAttributes.LLM_URL: APIS["CHAT_CREATE_V2"]["URL"],
-            SpanAttributes.LLM_PATH: APIS["CHAT_CREATE_V2"]["ENDPOINT"],
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
-        for attr_name in ["max_input_tokens", "conversation_id", "connectors", "tools", "tool_results"]:
-            value = kwargs.get(attr_name)
-            if value is not None:
-                if attr_name == "max_input_tokens":
-                    attributes.llm_max_input_tokens = str(value)
-                elif attr_name == "conversation_id":
-                    attributes.conversation_id = value
-                else:
-                    setattr(attributes, f"llm_{attr_name}", json.dumps(value))
-
         span = tracer.start_span(
             name=get_span_name(APIS["CHAT_CREATE_V2"]["METHOD"]), 
             kind=SpanKind.CLIENT
         )
-
-        for field, value in attributes.model_dump(by_alias=True).items():
-            set_span_attribute(span, field, value)
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
 
         try:
+            service_provider = SERVICE_PROVIDERS["COHERE"]
+
+            messages = kwargs.get("messages", [])
+            if kwargs.get("preamble"):
+                messages = [
+                    {"role": "system", "content": kwargs["preamble"]}
+                ] + messages
+
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(kwargs, prompts=messages),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_REQUEST_MODEL: kwargs.get("model")
+                or "command-r-plus",
+                SpanAttributes.LLM_URL: APIS["CHAT_CREATE_V2"]["URL"],
+                SpanAttributes.LLM_PATH: APIS["CHAT_CREATE_V2"]["ENDPOINT"],
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            for attr_name in [
+                "max_input_tokens",
+                "conversation_id",
+                "connectors",
+                "tools",
+                "tool_results",
+            ]:
+                value = kwargs.get(attr_name)
+                if value is not None:
+                    if attr_name == "max_input_tokens":
+                        attributes["llm_max_input_tokens"] = str(value)
+                    elif attr_name == "conversation_id":
+                        attributes["conversation_id"] = value
+                    else:
+                        attributes[f"llm_{attr_name}"] = json.dumps(value)
+
+            for field, value in attributes.items():
+                set_span_attribute(span, field, value)
             result = wrapped(*args, **kwargs)
 
             if stream:
@@ -392,6 +425,7 @@ def chat_create_v2(original_method, version, tracer, stream=False):
                     result,
                     span,
                     tool_calls=kwargs.get("tools") is not None,
+                    vendor="cohere",
                 )
             else:
                 if hasattr(result, "id") and result.id is not None:
@@ -447,63 +481,69 @@ def chat_stream(original_method, version, tracer):
     """Wrap the `messages_stream` method."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["COHERE"]
-
-        message = kwargs.get("message", "")
-        prompts = [{"role": "user", "content": message}]
-        system_prompts = []
-        history = []
-        preamble = kwargs.get("preamble")
-        if preamble:
-            system_prompts = [{"role": "system", "content": preamble}]
-
-        chat_history = kwargs.get("chat_history")
-        if chat_history:
-            history = [
-                {
-                    "role": (
-                        item.get("role") if item.get("role") is not None else "user"
-                    ),
-                    "content": (
-                        item.get("message") if item.get("message") is not None else ""
-                    ),
-                }
-                for item in chat_history
-            ]
-        prompts = system_prompts + history + prompts
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(kwargs, prompts=prompts),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_REQUEST_MODEL: kwargs.get("model") or "command-r-plus",
-            SpanAttributes.LLM_IS_STREAMING: True,
-            SpanAttributes.LLM_URL: APIS["CHAT_STREAM"]["URL"],
-            SpanAttributes.LLM_PATH: APIS["CHAT_STREAM"]["ENDPOINT"],
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
-        if kwargs.get("max_input_tokens") is not None:
-            attributes.llm_max_input_tokens = str(kwargs.get("max_input_tokens"))
-
-        if kwargs.get("connectors") is not None:
-            # stringify the list of objects
-            attributes.llm_connectors = json.dumps(kwargs.get("connectors"))
-        if kwargs.get("tools") is not None:
-            # stringify the list of objects
-            attributes.llm_tools = json.dumps(kwargs.get("tools"))
-        if kwargs.get("tool_results") is not None:
-            # stringify the list of objects
-            attributes.llm_tool_results = json.dumps(kwargs.get("tool_results"))
-
         span = tracer.start_span(
             name=get_span_name(APIS["CHAT_STREAM"]["METHOD"]), kind=SpanKind.CLIENT
         )
-        for field, value in attributes.model_dump(by_alias=True).items():
-            set_span_attribute(span, field, value)
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
+
         try:
+            service_provider = SERVICE_PROVIDERS["COHERE"]
+
+            message = kwargs.get("message", "")
+            prompts = [{"role": "user", "content": message}]
+            system_prompts = []
+            history = []
+            preamble = kwargs.get("preamble")
+            if preamble:
+                system_prompts = [{"role": "system", "content": preamble}]
+
+            chat_history = kwargs.get("chat_history")
+            if chat_history:
+                history = [
+                    {
+                        "role": (
+                            item.get("role") if item.get("role") is not None else "user"
+                        ),
+                        "content": (
+                            item.get("message")
+                            if item.get("message") is not None
+                            else ""
+                        ),
+                    }
+                    for item in chat_history
+                ]
+            prompts = system_prompts + history + prompts
+
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(kwargs, prompts=prompts),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_REQUEST_MODEL: kwargs.get("model")
+                or "command-r-plus",
+                SpanAttributes.LLM_IS_STREAMING: True,
+                SpanAttributes.LLM_URL: APIS["CHAT_STREAM"]["URL"],
+                SpanAttributes.LLM_PATH: APIS["CHAT_STREAM"]["ENDPOINT"],
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            if kwargs.get("max_input_tokens") is not None:
+                attributes["llm_max_input_tokens"] = str(kwargs.get("max_input_tokens"))
+
+            if kwargs.get("connectors") is not None:
+                # stringify the list of objects
+                attributes["llm_connectors"] = json.dumps(kwargs.get("connectors"))
+            if kwargs.get("tools") is not None:
+                # stringify the list of objects
+                attributes["llm_tools"] = json.dumps(kwargs.get("tools"))
+            if kwargs.get("tool_results") is not None:
+                # stringify the list of objects
+                attributes["llm_tool_results"] = json.dumps(kwargs.get("tool_results"))
+
+            for field, value in attributes.items():
+                set_span_attribute(span, field, value)
             # Attempt to call the original method
             result = wrapped(*args, **kwargs)
             try:
@@ -593,7 +633,7 @@ def chat_stream(original_method, version, tracer):
                                         "search_units",
                                         int(usage.search_units) if usage.search_units else 0,
                                     )
-                                    
+
 
                     yield event
             finally:
@@ -1,46 +1,53 @@
 import json
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import FrameworkSpanAttributes
-from opentelemetry import baggage
+from opentelemetry import baggage, trace
 from opentelemetry.trace import Span, SpanKind, Tracer
 from opentelemetry.trace.status import Status, StatusCode
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY,
     SERVICE_PROVIDERS,
 )
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
 from obiguard_trace_python_sdk.utils.llm import get_span_name, set_span_attributes
 from obiguard_trace_python_sdk.utils.misc import serialize_args, serialize_kwargs
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def patch_memory(operation_name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["CREWAI"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        inputs = {}
-        if len(args) > 0:
-            inputs["args"] = serialize_args(*args)
-        if len(kwargs) > 0:
-            inputs["kwargs"] = serialize_kwargs(**kwargs)
-        span_attributes["crewai.memory.storage.rag_storage.inputs"] = json.dumps(inputs)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             get_span_name(operation_name), kind=SpanKind.CLIENT
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["CREWAI"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            inputs = {}
+            if len(args) > 0:
+                inputs["args"] = serialize_args(*args)
+            if len(kwargs) > 0:
+                inputs["kwargs"] = serialize_kwargs(**kwargs)
+            span_attributes["crewai.memory.storage.rag_storage.inputs"] = json.dumps(
+                inputs
+            )
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
 
             try:
                 set_span_attributes(span, attributes)
@@ -68,22 +75,28 @@ def patch_memory(operation_name, version, tracer: Tracer):
 
 def patch_crew(operation_name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["CREWAI"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             get_span_name(operation_name), kind=SpanKind.CLIENT
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["CREWAI"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
 
             try:
                 set_span_attributes(span, attributes)
@@ -16,12 +16,12 @@ limitations under the License.
 
 from typing import Collection
 
-from importlib_metadata import version as v
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper as _W
 
 from .patch import patch_run
+from obiguard_trace_python_sdk.utils import get_package_version
 
 
 class CrewaiToolsInstrumentation(BaseInstrumentor):
@@ -34,7 +34,7 @@ class CrewaiToolsInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = v("crewai-tools")
+        version = get_package_version("crewai-tools")
         try:
             _W(
                 "crewai_tools.tools.serper_dev_tool.serper_dev_tool",
@@ -1,44 +1,51 @@
 import json
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import FrameworkSpanAttributes
-from opentelemetry import baggage
+from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind, Tracer
 from opentelemetry.trace.status import Status, StatusCode
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, SERVICE_PROVIDERS)
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
 from obiguard_trace_python_sdk.utils.llm import get_span_name, set_span_attributes
 from obiguard_trace_python_sdk.utils.misc import serialize_args, serialize_kwargs
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def patch_run(operation_name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["CREWAI"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
+        span = tracer.start_span(
+            get_span_name(operation_name), kind=SpanKind.CLIENT
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
 
-        inputs = {}
-        if len(args) > 0:
-            inputs["args"] = serialize_args(*args)
-        if len(kwargs) > 0:
-            inputs["kwargs"] = serialize_kwargs(**kwargs)
-        span_attributes["crewai_tools.tools.serper_dev_tool.inputs"] = json.dumps(inputs)
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["CREWAI"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
 
-        attributes = FrameworkSpanAttributes(**span_attributes)
+            inputs = {}
+            if len(args) > 0:
+                inputs["args"] = serialize_args(*args)
+            if len(kwargs) > 0:
+                inputs["kwargs"] = serialize_kwargs(**kwargs)
+            span_attributes["crewai_tools.tools.serper_dev_tool.inputs"] = json.dumps(
+                inputs
+            )
 
-        with tracer.start_as_current_span(
-            get_span_name(operation_name), kind=SpanKind.CLIENT
-        ) as span:
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
 
             try:
                 set_span_attributes(span, attributes)
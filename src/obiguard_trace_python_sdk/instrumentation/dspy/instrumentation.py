@@ -17,8 +17,8 @@ limitations under the License.
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper as _W
+from obiguard_trace_python_sdk.utils import get_package_version
 from typing import Collection
-from importlib_metadata import version as v
 from .patch import patch_bootstrapfewshot_optimizer, patch_signature, patch_evaluate
 
 
@@ -32,7 +32,7 @@ class DspyInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = v("dspy")
+        version = get_package_version("dspy")
         _W(
             "dspy.teleprompt.bootstrap",
             "BootstrapFewShot.compile",
@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Collection
 
@@ -23,6 +22,7 @@ from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper
 
 from obiguard_trace_python_sdk.instrumentation.embedchain.patch import generic_patch
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -38,7 +38,7 @@ class EmbedchainInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("embedchain")
+        version = get_package_version("embedchain")
 
         wrap_function_wrapper(
             "embedchain.embedchain",
@@ -15,8 +15,9 @@ limitations under the License.
 """
 
 from langtrace.trace_attributes import FrameworkSpanAttributes
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
 from obiguard_trace_python_sdk.utils.llm import get_span_name
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import Status, StatusCode
@@ -27,9 +28,7 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     SERVICE_PROVIDERS,
 )
 import json
-from importlib_metadata import version as v
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 
 
 def generic_patch(method, version, tracer):
@@ -39,35 +38,41 @@ def generic_patch(method, version, tracer):
 
     def traced_method(wrapped, instance, args, kwargs):
         api = APIS[method]
-        service_provider = SERVICE_PROVIDERS["EMBEDCHAIN"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "embedchain.api": api["OPERATION"],
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        if hasattr(instance, 'config') and isinstance(instance.config, object):
-            config_dict = instance.config.__dict__
-            if isinstance(config_dict, dict):
-                span_attributes["embedchain.config"] = json.dumps(config_dict)
-
-        if len(args) > 0:
-            span_attributes["embedchain.inputs"] = json.dumps(args)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(api["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
-            for field, value in attributes.model_dump(by_alias=True).items():
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["EMBEDCHAIN"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "embedchain.api": api["OPERATION"],
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            if hasattr(instance, "config") and isinstance(instance.config, object):
+                config_dict = instance.config.__dict__
+                if isinstance(config_dict, dict):
+                    span_attributes["embedchain.config"] = json.dumps(config_dict)
+
+            if len(args) > 0:
+                span_attributes["embedchain.inputs"] = json.dumps(args)
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
             try:
@@ -1,9 +1,9 @@
 from typing import Collection
-from importlib_metadata import version as v
 from obiguard_trace_python_sdk.constants.instrumentation.gemini import APIS
 from wrapt import wrap_function_wrapper as _W
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
+from obiguard_trace_python_sdk.utils import get_package_version
 from .patch import patch_gemini, apatch_gemini
 
 
@@ -14,7 +14,7 @@ class GeminiInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         trace_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", trace_provider)
-        version = v("google-generativeai")
+        version = get_package_version("google-generativeai")
 
         for _, api_config in APIS.items():
             module = api_config.get("module")
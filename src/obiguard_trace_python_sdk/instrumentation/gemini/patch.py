@@ -16,31 +16,35 @@ from obiguard_trace_python_sdk.utils.llm import (
     set_span_attributes,
     set_usage_attributes,
 )
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
+from obiguard_trace_python_sdk.utils.stream_timing import StreamTimer
 
 
 def patch_gemini(name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["GEMINI"]
-        prompts = serialize_prompts(args, kwargs, instance)
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(
-                kwargs,
-                prompts=prompts,
-                model=get_llm_model(instance),
-            ),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: "",
-            **get_extra_attributes(),
-        }
-        attributes = LLMSpanAttributes(**span_attributes)
         span = tracer.start_span(
             name=get_span_name(name),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
         )
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
 
         try:
+            service_provider = SERVICE_PROVIDERS["GEMINI"]
+            prompts = serialize_prompts(args, kwargs, instance)
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(
+                    kwargs,
+                    prompts=prompts,
+                    model=get_llm_model(instance),
+                ),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: "",
+                **get_extra_attributes(),
+            }
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
             set_span_attributes(span, attributes)
             result = wrapped(*args, **kwargs)
             if is_streaming(kwargs):
@@ -61,27 +65,29 @@ def patch_gemini(name, version, tracer: Tracer):
 
 def apatch_gemini(name, version, tracer: Tracer):
     async def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["GEMINI"]
-        prompts = serialize_prompts(args, kwargs, instance)
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(
-                kwargs,
-                prompts=prompts,
-                model=get_llm_model(instance),
-            ),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: "",
-            **get_extra_attributes(),
-        }
-        attributes = LLMSpanAttributes(**span_attributes)
         span = tracer.start_span(
             name=get_span_name(name),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
         )
+        if not span.is_recording():
+            return await wrapped(*args, **kwargs)
 
         try:
+            service_provider = SERVICE_PROVIDERS["GEMINI"]
+            prompts = serialize_prompts(args, kwargs, instance)
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(
+                    kwargs,
+                    prompts=prompts,
+                    model=get_llm_model(instance),
+                ),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: "",
+                **get_extra_attributes(),
+            }
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
             set_span_attributes(span, attributes)
             result = await wrapped(*args, **kwargs)
             if is_streaming(kwargs):
@@ -142,43 +148,76 @@ def set_response_attributes(
         input_tokens = usage.prompt_token_count
         output_tokens = usage.candidates_token_count
         set_usage_attributes(
-            span, {"input_tokens": input_tokens, "output_tokens": output_tokens}
+            span,
+            {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cached_content_token_count": getattr(
+                    usage, "cached_content_token_count", None
+                ),
+            },
         )
 
 
 def build_streaming_response(span, response):
-    complete_response = ""
+    usage = None
+    timer = StreamTimer.for_span(span)
     for item in response:
+        timer.chunk()
         item_to_yield = item
-        complete_response += str(item.text)
+        if item.text:
+            timer.content()
         yield item_to_yield
         if hasattr(item, "usage_metadata") and item.usage_metadata is not None:
             usage = item.usage_metadata
-            input_tokens = usage.prompt_token_count
-            output_tokens = usage.candidates_token_count
-            set_usage_attributes(
-                span, {"input_tokens": input_tokens, "output_tokens": output_tokens}
-            )
 
+    # Chunks repeat the usage so far; the last one is recorded.
+    output_tokens = None
+    if usage is not None:
+        output_tokens = usage.candidates_token_count
+        set_usage_attributes(
+            span,
+            {
+                "input_tokens": usage.prompt_token_count,
+                "output_tokens": output_tokens,
+                "cached_content_token_count": getattr(
+                    usage, "cached_content_token_count", None
+                ),
+            },
+        )
+    timer.record(span, output_tokens)
     set_response_attributes(span, response)
     span.set_status(Status(StatusCode.OK))
     span.end()
 
 
 async def abuild_streaming_response(span, response):
-    complete_response = ""
+    usage = None
+    timer = StreamTimer.for_span(span)
     async for item in response:
+        timer.chunk()
         item_to_yield = item
-        complete_response += str(item.text)
+        if item.text:
+            timer.content()
         yield item_to_yield
         if hasattr(item, "usage_metadata") and item.usage_metadata is not None:
             usage = item.usage_metadata
-            input_tokens = usage.prompt_token_count
-            output_tokens = usage.candidates_token_count
-            set_usage_attributes(
-                span, {"input_tokens": input_tokens, "output_tokens": output_tokens}
-            )
 
+    # Chunks repeat the usage so far; the last one is recorded.
+    output_tokens = None
+    if usage is not None:
+        output_tokens = usage.candidates_token_count
+        set_usage_attributes(
+            span,
+            {
+                "input_tokens": usage.prompt_token_count,
+                "output_tokens": output_tokens,
+                "cached_content_token_count": getattr(
+                    usage, "cached_content_token_count", None
+                ),
+            },
+        )
+    timer.record(span, output_tokens)
     set_response_attributes(span, response)
     span.set_status(Status(StatusCode.OK))
     span.end()
@@ -1,9 +1,13 @@
 from typing import Collection
-from importlib_metadata import version as v
 from wrapt import wrap_function_wrapper as _W
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
-from .patch import patch_google_genai, patch_google_genai_streaming
+from obiguard_trace_python_sdk.utils import get_package_version
+from .patch import (
+    patch_google_genai,
+    patch_google_genai_streaming,
+    patch_google_genai_streaming_async,
+)
 
 
 class GoogleGenaiInstrumentation(BaseInstrumentor):
@@ -13,7 +17,7 @@ class GoogleGenaiInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         trace_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", trace_provider)
-        version = v("google-genai")
+        version = get_package_version("google-genai")
 
         _W(
             module="google.genai",
@@ -25,6 +29,11 @@ class GoogleGenaiInstrumentation(BaseInstrumentor):
             name="models.Models.generate_content_stream",
             wrapper=patch_google_genai_streaming(tracer, version),
         )
+        _W(
+            module="google.genai",
+            name="models.AsyncModels.generate_content_stream",
+            wrapper=patch_google_genai_streaming_async(tracer, version),
+        )
 
     def _uninstrument(self, **kwargs):
         pass
@@ -7,32 +7,42 @@ from obiguard_trace_python_sdk.utils.llm import (
     set_event_completion,
 )
 from obiguard_trace_python_sdk.utils import handle_span_error
+from obiguard_trace_python_sdk.utils.stream_capture import StreamCapture
+from obiguard_trace_python_sdk.utils.stream_timing import StreamTimer
 
+from opentelemetry import context, trace
 from opentelemetry.trace import Tracer, SpanKind
+from opentelemetry.trace.propagation import set_span_in_context
+from opentelemetry.trace.status import StatusCode
 from opentelemetry.sdk.trace import Span
 from langtrace.trace_attributes import SpanAttributes
 
-from typing import Iterator
+import inspect
 
 
 def patch_google_genai(tracer: Tracer, version: str):
     def traced_method(wrapped, instance, args, kwargs):
-        prompt = [
-            {
-                "role": "user",
-                "content": kwargs["contents"],
-            }
-        ]
-        span_attributes = {
-            **get_langtrace_attributes(
-                service_provider="google_genai", version=version
-            ),
-            **get_llm_request_attributes(kwargs=kwargs, prompts=prompt),
-        }
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name="google.genai.generate_content",
             kind=SpanKind.CLIENT,
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            prompt = [
+                {
+                    "role": "user",
+                    "content": kwargs["contents"],
+                }
+            ]
+            span_attributes = {
+                **get_langtrace_attributes(
+                    service_provider="google_genai", version=version
+                ),
+                **get_llm_request_attributes(kwargs=kwargs, prompts=prompt),
+            }
             try:
                 set_span_attributes(span, span_attributes)
                 response = wrapped(*args, **kwargs)
@@ -47,6 +57,56 @@ def patch_google_genai(tracer: Tracer, version: str):
 
 def patch_google_genai_streaming(tracer: Tracer, version: str):
     def traced_method(wrapped, instance, args, kwargs):
+        span = start_streaming_span(tracer, version, kwargs)
+        if span is None:
+            return wrapped(*args, **kwargs)
+
+        try:
+            with trace.use_span(span):
+                response = wrapped(*args, **kwargs)
+        except Exception:
+            span.end()
+            raise
+        return GenerateContentStream(response, span)
+
+    return traced_method
+
+
+def patch_google_genai_streaming_async(tracer: Tracer, version: str):
+    def traced_method(wrapped, instance, args, kwargs):
+        span = start_streaming_span(tracer, version, kwargs)
+        if span is None:
+            return wrapped(*args, **kwargs)
+
+        try:
+            with trace.use_span(span):
+                response = wrapped(*args, **kwargs)
+        except Exception:
+            span.end()
+            raise
+        # Before google-genai 1.0 the method was an async generator; since then
+        # it is a coroutine that returns one.
+        if inspect.isawaitable(response):
+            return await_stream(response, span)
+        return AsyncGenerateContentStream(response, span)
+
+    return traced_method
+
+
+def start_streaming_span(tracer: Tracer, version: str, kwargs):
+    """
+    Start the span of a `generate_content_stream` call, or return `None` when
+    it is not sampled.
+    """
+    span = tracer.start_span(
+        name="google.genai.generate_content_stream",
+        kind=SpanKind.CLIENT,
+    )
+    if not span.is_recording():
+        span.end()
+        return None
+
+    try:
         prompt = [
             {
                 "role": "user",
@@ -59,45 +119,146 @@ def patch_google_genai_streaming(tracer: Tracer, version: str):
             ),
             **get_llm_request_attributes(kwargs=kwargs, prompts=prompt),
         }
-        with tracer.start_as_current_span(
-            name="google.genai.generate_content_stream",
-            kind=SpanKind.CLIENT,
-        ) as span:
-            set_span_attributes(span, span_attributes)
-            response = wrapped(*args, **kwargs)
-            set_streaming_response_attributes(span, response)
-            return response
+        set_span_attributes(span, span_attributes)
+    except Exception:
+        span.end()
+        raise
+    return span
 
-    return traced_method
 
+async def await_stream(response, span: Span):
+    try:
+        with trace.use_span(span):
+            stream = await response
+    except Exception:
+        span.end()
+        raise
+    return AsyncGenerateContentStream(stream, span)
 
-def set_streaming_response_attributes(span: Span, response):
-    accum_completion = ""
-    for chunk in response:
-        set_span_attribute(
-            span,
-            SpanAttributes.LLM_RESPONSE_MODEL,
-            chunk.model_version,
-        )
-        candidates = chunk.candidates
-        for candidate in candidates:
-            set_span_attribute(
-                span,
-                SpanAttributes.LLM_RESPONSE_FINISH_REASON,
-                candidate.finish_reason,
-            )
 
-            accum_completion += candidate.content.parts[0].text
+class GenerateContentStream:
+    """
+    Hands the chunks of a `generate_content_stream` response to the caller as
+    they arrive, recording the model version, finish reasons, usage and
+    completion text on the way. The span ends when the stream is exhausted,
+    fails or is closed.
+    """
+
+    def __init__(self, stream, span: Span):
+        self.stream = stream
+        self.span = span
+        self.model_version = None
+        self.finish_reason = None
+        self.usage = None
+        self.completion = StreamCapture()
+        self.timer = StreamTimer.for_span(span)
+        self._ended = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # google-genai sends the request on the first read; keep the span
+        # current so the HTTP call is traced as its child.
+        token = context.attach(set_span_in_context(self.span))
+        try:
+            chunk = next(self.stream)
+        except StopIteration:
+            self.end()
+            raise
+        except Exception as error:
+            self.fail(error)
+            raise
+        finally:
+            context.detach(token)
+        self.process_chunk(chunk)
+        return chunk
 
+    def close(self):
+        try:
+            close = getattr(self.stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self.end()
+
+    def process_chunk(self, chunk):
+        self.timer.chunk()
+        if chunk.model_version:
+            self.model_version = chunk.model_version
+        for candidate in chunk.candidates or []:
+            if candidate.finish_reason:
+                self.finish_reason = candidate.finish_reason
+            if candidate.content and candidate.content.parts:
+                for part in candidate.content.parts:
+                    if part.text:
+                        self.timer.content()
+                        self.completion.append(part.text)
         if chunk.usage_metadata:
+            self.usage = chunk.usage_metadata
+
+    def fail(self, error):
+        if not self._ended:
+            self._ended = True
+            handle_span_error(self.span, error)
+
+    def end(self):
+        if self._ended:
+            return
+        self._ended = True
+        set_span_attribute(
+            self.span, SpanAttributes.LLM_RESPONSE_MODEL, self.model_version
+        )
+        set_span_attribute(
+            self.span, SpanAttributes.LLM_RESPONSE_FINISH_REASON, self.finish_reason
+        )
+        output_tokens = None
+        if self.usage:
+            output_tokens = self.usage.candidates_token_count
             set_usage_attributes(
-                span,
+                self.span,
                 {
-                    "input_tokens": chunk.usage_metadata.prompt_token_count,
-                    "output_tokens": chunk.usage_metadata.candidates_token_count,
+                    "input_tokens": self.usage.prompt_token_count,
+                    "output_tokens": output_tokens,
+                    "cached_content_token_count": getattr(
+                        self.usage, "cached_content_token_count", None
+                    ),
                 },
             )
-    set_event_completion(span, [{"role": "assistant", "content": accum_completion}])
+        self.timer.record(self.span, output_tokens)
+        set_event_completion(
+            self.span, [{"role": "assistant", "content": self.completion.text()}]
+        )
+        self.span.set_status(StatusCode.OK)
+        self.span.end()
+
+
+class AsyncGenerateContentStream(GenerateContentStream):
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        token = context.attach(set_span_in_context(self.span))
+        try:
+            chunk = await self.stream.__anext__()
+        except StopAsyncIteration:
+            self.end()
+            raise
+        except Exception as error:
+            self.fail(error)
+            raise
+        finally:
+            context.detach(token)
+        self.process_chunk(chunk)
+        return chunk
+
+    async def aclose(self):
+        try:
+            aclose = getattr(self.stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            self.end()
 
 
 def set_response_attributes(span: Span, response):
@@ -122,5 +283,8 @@ def set_response_attributes(span: Span, response):
             {
                 "input_tokens": response.usage_metadata.prompt_token_count,
                 "output_tokens": response.usage_metadata.candidates_token_count,
+                "cached_content_token_count": getattr(
+                    response.usage_metadata, "cached_content_token_count", None
+                ),
             },
         )
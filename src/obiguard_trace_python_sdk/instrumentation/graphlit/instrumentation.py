@@ -1,8 +1,8 @@
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper as _W
+from obiguard_trace_python_sdk.utils import get_package_version
 from typing import Collection
-from importlib_metadata import version as v
 from .patch import patch_graphlit_operation
 
 class GraphlitInstrumentation(BaseInstrumentor):
@@ -13,7 +13,7 @@ class GraphlitInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = v("graphlit-client")
+        version = get_package_version("graphlit-client")
         try:
             _W(
                 "graphlit.graphlit",
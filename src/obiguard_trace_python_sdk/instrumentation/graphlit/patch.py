@@ -1,43 +1,49 @@
 import json
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import FrameworkSpanAttributes
-from opentelemetry import baggage
+from opentelemetry import baggage, trace
 from opentelemetry.trace import Span, SpanKind, Tracer
 from opentelemetry.trace.status import Status, StatusCode
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
+from obiguard_trace_python_sdk.utils import get_sdk_version
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, SERVICE_PROVIDERS)
 from obiguard_trace_python_sdk.utils.llm import set_span_attributes
 from obiguard_trace_python_sdk.utils.misc import serialize_args, serialize_kwargs
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def patch_graphlit_operation(operation_name, version, tracer: Tracer):
     async def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["GRAPHLIT"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        span_attributes["graphlit.metadata"] = serialize_kwargs(**kwargs)
-        span_attributes["graphlit.inputs"] = serialize_args(*args)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=f"graphlit.{operation_name}", kind=SpanKind.CLIENT
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return await wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["GRAPHLIT"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            span_attributes["graphlit.metadata"] = serialize_kwargs(**kwargs)
+            span_attributes["graphlit.inputs"] = serialize_args(*args)
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
                 set_span_attributes(span, attributes)
                 result = await wrapped(*args, **kwargs)
-                
+
                 if result:
                     operation_result = json.loads(result.model_dump_json())[operation_name]
                     if operation_name == "complete_conversation" or operation_name == "prompt_conversation" or operation_name == "format_conversation":
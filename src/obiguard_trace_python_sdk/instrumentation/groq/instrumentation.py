@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Collection
 
@@ -26,6 +25,7 @@ from obiguard_trace_python_sdk.instrumentation.groq.patch import (
     async_chat_completions_create,
     chat_completions_create,
 )
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -38,7 +38,7 @@ class GroqInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("groq")
+        version = get_package_version("groq")
 
         wrap_function_wrapper(
             "groq.resources.chat.completions",
@@ -16,7 +16,7 @@ limitations under the License.
 
 import json
 
-from langtrace.trace_attributes import Event, LLMSpanAttributes
+from langtrace.trace_attributes import LLMSpanAttributes
 from obiguard_trace_python_sdk.utils import set_span_attribute
 from opentelemetry import baggage, trace
 from opentelemetry.trace.propagation import set_span_in_context
@@ -24,6 +24,7 @@ from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import Status, StatusCode
 
 from obiguard_trace_python_sdk.utils.llm import (
+    StreamWrapper,
     get_base_url,
     get_extra_attributes,
     get_llm_request_attributes,
@@ -38,7 +39,8 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     SERVICE_PROVIDERS,
 )
 from obiguard_trace_python_sdk.constants.instrumentation.groq import APIS
-from obiguard_trace_python_sdk.utils.llm import calculate_prompt_tokens, estimate_tokens
+from obiguard_trace_python_sdk.utils.llm import count_prompt_tokens
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from importlib_metadata import version as v
 
 from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
@@ -49,73 +51,79 @@ def chat_completions_create(original_method, version, tracer):
     """Wrap the `create` method of the `ChatCompletion` class to trace it."""
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["GROQ"]
-        # If base url contains perplexity or azure, set the service provider accordingly
-        if "perplexity" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["PPLX"]
-        elif "azure" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["AZURE"]
-        elif "x.ai" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["XAI"]
-
-        # handle tool calls in the kwargs
-        llm_prompts = []
-        for item in kwargs.get("messages", []):
-            if hasattr(item, "tool_calls") and item.tool_calls is not None:
-                tool_calls = []
-                for tool_call in item.tool_calls:
-                    tool_call_dict = {
-                        "id": tool_call.id if hasattr(tool_call, "id") else "",
-                        "type": tool_call.type if hasattr(tool_call, "type") else "",
-                    }
-                    if hasattr(tool_call, "function"):
-                        tool_call_dict["function"] = {
-                            "name": (
-                                tool_call.function.name
-                                if hasattr(tool_call.function, "name")
-                                else ""
-                            ),
-                            "arguments": (
-                                tool_call.function.arguments
-                                if hasattr(tool_call.function, "arguments")
-                                else ""
-                            ),
-                        }
-                    tool_calls.append(tool_call_dict)
-                llm_prompts.append(tool_calls)
-            else:
-                llm_prompts.append(item)
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(kwargs, prompts=llm_prompts),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["CHAT_COMPLETION"]["ENDPOINT"],
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
-        tools = []
-        if kwargs.get("functions") is not None:
-            for function in kwargs.get("functions"):
-                tools.append(json.dumps({"type": "function", "function": function}))
-        if kwargs.get("tools") is not None:
-            tools.append(json.dumps(kwargs.get("tools")))
-        if len(tools) > 0:
-            attributes.llm_tools = json.dumps(tools)
-
-        # TODO(Karthik): Gotta figure out how to handle streaming with context
-        # with tracer.start_as_current_span(APIS["CHAT_COMPLETION"]["METHOD"],
-        #                                   kind=SpanKind.CLIENT) as span:
         span = tracer.start_span(
             name=get_span_name(APIS["CHAT_COMPLETION"]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
         )
-        for field, value in attributes.model_dump(by_alias=True).items():
-            set_span_attribute(span, field, value)
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
+
         try:
+            service_provider = SERVICE_PROVIDERS["GROQ"]
+            # If base url contains perplexity or azure, set the service provider
+            # accordingly
+            if "perplexity" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["PPLX"]
+            elif "azure" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["AZURE"]
+            elif "x.ai" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["XAI"]
+
+            # handle tool calls in the kwargs
+            llm_prompts = []
+            for item in kwargs.get("messages", []):
+                if hasattr(item, "tool_calls") and item.tool_calls is not None:
+                    tool_calls = []
+                    for tool_call in item.tool_calls:
+                        tool_call_dict = {
+                            "id": tool_call.id if hasattr(tool_call, "id") else "",
+                            "type": (
+                                tool_call.type if hasattr(tool_call, "type") else ""
+                            ),
+                        }
+                        if hasattr(tool_call, "function"):
+                            tool_call_dict["function"] = {
+                                "name": (
+                                    tool_call.function.name
+                                    if hasattr(tool_call.function, "name")
+                                    else ""
+                                ),
+                                "arguments": (
+                                    tool_call.function.arguments
+                                    if hasattr(tool_call.function, "arguments")
+                                    else ""
+                                ),
+                            }
+                        tool_calls.append(tool_call_dict)
+                    llm_prompts.append(tool_calls)
+                else:
+                    llm_prompts.append(item)
+
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(kwargs, prompts=llm_prompts),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["CHAT_COMPLETION"]["ENDPOINT"],
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            tools = []
+            if kwargs.get("functions") is not None:
+                for function in kwargs.get("functions"):
+                    tools.append(json.dumps({"type": "function", "function": function}))
+            if kwargs.get("tools") is not None:
+                tools.append(json.dumps(kwargs.get("tools")))
+            if len(tools) > 0:
+                attributes["llm_tools"] = json.dumps(tools)
+
+            # TODO(Karthik): Gotta figure out how to handle streaming with context
+            # with tracer.start_as_current_span(APIS["CHAT_COMPLETION"]["METHOD"],
+            #                                   kind=SpanKind.CLIENT) as span:
+            for field, value in attributes.items():
+                set_span_attribute(span, field, value)
             # Attempt to call the original method
             result = wrapped(*args, **kwargs)
             if kwargs.get("stream") is False or kwargs.get("stream") is None:
@@ -164,26 +172,25 @@ def chat_completions_create(original_method, version, tracer):
                 span.end()
                 return result
             else:
-                # iterate over kwargs.get("messages", {}) and calculate the prompt tokens
-                prompt_tokens = 0
-                for message in kwargs.get("messages", {}):
-                    prompt_tokens += calculate_prompt_tokens(
-                        json.dumps(message), kwargs.get("model")
-                    )
-
-                # iterate over kwargs.get("functions") and calculate the prompt tokens
+                prompt_contents = [
+                    json.dumps(message) for message in kwargs.get("messages", {})
+                ]
                 if kwargs.get("functions") is not None:
-                    for function in kwargs.get("functions"):
-                        prompt_tokens += calculate_prompt_tokens(
-                            json.dumps(function), kwargs.get("model")
-                        )
+                    prompt_contents += [
+                        json.dumps(function) for function in kwargs.get("functions")
+                    ]
+                prompt_tokens, prompt_tokens_estimated = count_prompt_tokens(
+                    prompt_contents, kwargs.get("model"), span
+                )
 
-                return handle_streaming_response(
+                return StreamWrapper(
                     result,
                     span,
                     prompt_tokens,
+                    prompt_tokens_estimated=prompt_tokens_estimated,
                     function_call=kwargs.get("functions") is not None,
                     tool_calls=kwargs.get("tools") is not None,
+                    vendor="groq",
                 )
 
         except Exception as error:
@@ -192,76 +199,6 @@ def chat_completions_create(original_method, version, tracer):
             span.end()
             raise
 
-    def handle_streaming_response(
-        result, span, prompt_tokens, function_call=False, tool_calls=False
-    ):
-        """Process and yield streaming response chunks."""
-        result_content = []
-        span.add_event(Event.STREAM_START.value)
-        completion_tokens = 0
-        try:
-            for chunk in result:
-                if hasattr(chunk, "model") and chunk.model is not None:
-                    span.set_attribute("llm.model", chunk.model)
-                if hasattr(chunk, "choices") and chunk.choices is not None:
-                    if not function_call and not tool_calls:
-                        for choice in chunk.choices:
-                            if choice.delta and choice.delta.content is not None:
-                                token_counts = estimate_tokens(choice.delta.content)
-                                completion_tokens += token_counts
-                                content = [choice.delta.content]
-                    elif function_call:
-                        for choice in chunk.choices:
-                            if (
-                                choice.delta
-                                and choice.delta.function_call is not None
-                                and choice.delta.function_call.arguments is not None
-                            ):
-                                token_counts = estimate_tokens(
-                                    choice.delta.function_call.arguments
-                                )
-                                completion_tokens += token_counts
-                                content = [choice.delta.function_call.arguments]
-                    elif tool_calls:
-                        for choice in chunk.choices:
-                            tool_call = ""
-                            if choice.delta and choice.delta.tool_calls is not None:
-                                toolcalls = choice.delta.tool_calls
-                                content = []
-                                for tool_call in toolcalls:
-                                    if (
-                                        tool_call
-                                        and tool_call.function is not None
-                                        and tool_call.function.arguments is not None
-                                    ):
-                                        token_counts = estimate_tokens(
-                                            tool_call.function.arguments
-                                        )
-                                        completion_tokens += token_counts
-                                        content = content + [
-                                            tool_call.function.arguments
-                                        ]
-                                    else:
-                                        content = content + []
-                else:
-                    content = []
-
-                result_content.append(content[0] if len(content) > 0 else "")
-                yield chunk
-        finally:
-            # Finalize span after processing all chunks
-            span.add_event(Event.STREAM_END.value)
-            set_usage_attributes(
-                span,
-                {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
-            )
-            set_event_completion(
-                span, [{"role": "assistant", "content": "".join(result_content)}]
-            )
-
-            span.set_status(Status(StatusCode.OK))
-            span.end()
-
     # return the wrapped method
     return traced_method
 
@@ -270,64 +207,70 @@ def async_chat_completions_create(original_method, version, tracer):
     """Wrap the `create` method of the `ChatCompletion` class to trace it."""
 
     async def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["GROQ"]
-        # If base url contains perplexity or azure, set the service provider accordingly
-        if "perplexity" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["PPLX"]
-        elif "azure" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["AZURE"]
-        elif "x.ai" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["XAI"]
-
-        # handle tool calls in the kwargs
-        llm_prompts = []
-        for item in kwargs.get("messages", []):
-            if hasattr(item, "tool_calls") and item.tool_calls is not None:
-                tool_calls = []
-                for tool_call in item.tool_calls:
-                    tool_call_dict = {
-                        "id": getattr(tool_call, "id", ""),
-                        "type": getattr(tool_call, "type", ""),
-                    }
-                    if hasattr(tool_call, "function"):
-                        tool_call_dict["function"] = {
-                            "name": getattr(tool_call.function, "name", ""),
-                            "arguments": getattr(tool_call.function, "arguments", ""),
+        span = tracer.start_span(
+            name=get_span_name(APIS["CHAT_COMPLETION"]["METHOD"]), kind=SpanKind.CLIENT
+        )
+        if not span.is_recording():
+            return await wrapped(*args, **kwargs)
+
+        try:
+            service_provider = SERVICE_PROVIDERS["GROQ"]
+            # If base url contains perplexity or azure, set the service provider
+            # accordingly
+            if "perplexity" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["PPLX"]
+            elif "azure" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["AZURE"]
+            elif "x.ai" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["XAI"]
+
+            # handle tool calls in the kwargs
+            llm_prompts = []
+            for item in kwargs.get("messages", []):
+                if hasattr(item, "tool_calls") and item.tool_calls is not None:
+                    tool_calls = []
+                    for tool_call in item.tool_calls:
+                        tool_call_dict = {
+                            "id": getattr(tool_call, "id", ""),
+                            "type": getattr(tool_call, "type", ""),
                         }
-                    tool_calls.append(tool_call_dict)
-                llm_prompts.append(tool_calls)
-            else:
-                llm_prompts.append(item)
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(kwargs, prompts=llm_prompts),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["CHAT_COMPLETION"]["ENDPOINT"],
-            **get_extra_attributes(),
-        }
+                        if hasattr(tool_call, "function"):
+                            tool_call_dict["function"] = {
+                                "name": getattr(tool_call.function, "name", ""),
+                                "arguments": getattr(
+                                    tool_call.function, "arguments", ""
+                                ),
+                            }
+                        tool_calls.append(tool_call_dict)
+                    llm_prompts.append(tool_calls)
+                else:
+                    llm_prompts.append(item)
+
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(kwargs, prompts=llm_prompts),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["CHAT_COMPLETION"]["ENDPOINT"],
+                **get_extra_attributes(),
+            }
 
-        attributes = LLMSpanAttributes(**span_attributes)
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
 
-        tools = []
+            tools = []
 
-        if kwargs.get("functions") is not None:
-            for function in kwargs.get("functions"):
-                tools.append(json.dumps({"type": "function", "function": function}))
-        if kwargs.get("tools") is not None:
-            tools.append(json.dumps(kwargs.get("tools")))
-        if len(tools) > 0:
-            attributes.llm_tools = json.dumps(tools)
+            if kwargs.get("functions") is not None:
+                for function in kwargs.get("functions"):
+                    tools.append(json.dumps({"type": "function", "function": function}))
+            if kwargs.get("tools") is not None:
+                tools.append(json.dumps(kwargs.get("tools")))
+            if len(tools) > 0:
+                attributes["llm_tools"] = json.dumps(tools)
 
-        # TODO(Karthik): Gotta figure out how to handle streaming with context
-        # with tracer.start_as_current_span(APIS["CHAT_COMPLETION"]["METHOD"],
-        #                                   kind=SpanKind.CLIENT) as span:
-        span = tracer.start_span(
-            name=get_span_name(APIS["CHAT_COMPLETION"]["METHOD"]), kind=SpanKind.CLIENT
-        )
-        for field, value in attributes.model_dump(by_alias=True).items():
-            set_span_attribute(span, field, value)
-        try:
+            # TODO(Karthik): Gotta figure out how to handle streaming with context
+            # with tracer.start_as_current_span(APIS["CHAT_COMPLETION"]["METHOD"],
+            #                                   kind=SpanKind.CLIENT) as span:
+            for field, value in attributes.items():
+                set_span_attribute(span, field, value)
             # Attempt to call the original method
             result = await wrapped(*args, **kwargs)
             if kwargs.get("stream") is False or kwargs.get("stream") is None:
@@ -378,26 +321,25 @@ def async_chat_completions_create(original_method, version, tracer):
                 span.end()
                 return result
             else:
-                # iterate over kwargs.get("messages", {}) and calculate the prompt tokens
-                prompt_tokens = 0
-                for message in kwargs.get("messages", {}):
-                    prompt_tokens += calculate_prompt_tokens(
-                        json.dumps(message), kwargs.get("model")
-                    )
-
-                # iterate over kwargs.get("functions") and calculate the prompt tokens
+                prompt_contents = [
+                    json.dumps(message) for message in kwargs.get("messages", {})
+                ]
                 if kwargs.get("functions") is not None:
-                    for function in kwargs.get("functions"):
-                        prompt_tokens += calculate_prompt_tokens(
-                            json.dumps(function), kwargs.get("model")
-                        )
+                    prompt_contents += [
+                        json.dumps(function) for function in kwargs.get("functions")
+                    ]
+                prompt_tokens, prompt_tokens_estimated = count_prompt_tokens(
+                    prompt_contents, kwargs.get("model"), span
+                )
 
-                return ahandle_streaming_response(
+                return StreamWrapper(
                     result,
                     span,
                     prompt_tokens,
+                    prompt_tokens_estimated=prompt_tokens_estimated,
                     function_call=kwargs.get("functions") is not None,
                     tool_calls=kwargs.get("tools") is not None,
+                    vendor="groq",
                 )
 
         except Exception as error:
@@ -406,92 +348,6 @@ def async_chat_completions_create(original_method, version, tracer):
             span.end()
             raise
 
-    async def ahandle_streaming_response(
-        result, span, prompt_tokens, function_call=False, tool_calls=False
-    ):
-        """Process and yield streaming response chunks."""
-        result_content = []
-        span.add_event(Event.STREAM_START.value)
-        completion_tokens = 0
-        try:
-            async for chunk in result:
-                if hasattr(chunk, "model") and chunk.model is not None:
-                    set_span_attribute(
-                        span, SpanAttributes.LLM_RESPONSE_MODEL, chunk.model
-                    )
-                    span.set_attribute("llm.model", chunk.model)
-                if hasattr(chunk, "choices") and chunk.choices is not None:
-                    if not function_call and not tool_calls:
-                        for choice in chunk.choices:
-                            if choice.delta and choice.delta.content is not None:
-                                token_counts = estimate_tokens(choice.delta.content)
-                                completion_tokens += token_counts
-                                content = [choice.delta.content]
-                    elif function_call:
-                        for choice in chunk.choices:
-                            if (
-                                choice.delta
-                                and choice.delta.function_call
-                                and choice.delta.function_call.arguments is not None
-                            ):
-                                token_counts = estimate_tokens(
-                                    choice.delta.function_call.arguments
-                                )
-                                completion_tokens += token_counts
-                                content = [choice.delta.function_call.arguments]
-                    elif tool_calls:
-                        for choice in chunk.choices:
-                            tool_call = ""
-                            if choice.delta and choice.delta.tool_calls is not None:
-                                toolcalls = choice.delta.tool_calls
-                                content = []
-                                for tool_call in toolcalls:
-                                    if (
-                                        tool_call
-                                        and tool_call.function is not None
-                                        and tool_call.function.arguments is not None
-                                    ):
-                                        token_counts = estimate_tokens(
-                                            tool_call.function.arguments
-                                        )
-                                        completion_tokens += token_counts
-                                        content += [tool_call.function.arguments]
-                else:
-                    content = []
-                span.add_event(
-                    Event.RESPONSE.value,
-                    {
-                        SpanAttributes.LLM_COMPLETIONS: (
-                            "".join(content)
-                            if len(content) > 0 and content[0] is not None
-                            else ""
-                        )
-                    },
-                )
-                result_content.append(content[0] if len(content) > 0 else "")
-                yield chunk
-        finally:
-            # Finalize span after processing all chunks
-            span.add_event(Event.STREAM_END.value)
-
-            set_usage_attributes(
-                span,
-                {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
-            )
-
-            set_event_completion(
-                span,
-                [
-                    {
-                        "role": "assistant",
-                        "content": "".join(result_content),
-                    }
-                ],
-            )
-
-            span.set_status(StatusCode.OK)
-            span.end()
-
     # return the wrapped method
     return traced_method
 
@@ -17,7 +17,7 @@ limitations under the License.
 import json
 
 from langtrace.trace_attributes import FrameworkSpanAttributes
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
+from obiguard_trace_python_sdk.utils import get_sdk_version
 from obiguard_trace_python_sdk.utils.llm import get_span_name
 from opentelemetry import baggage, trace
 from opentelemetry.trace.propagation import set_span_in_context
@@ -28,8 +28,8 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY,
     SERVICE_PROVIDERS,
 )
-from importlib_metadata import version as v
 from obiguard_trace_python_sdk.utils.misc import serialize_args, serialize_kwargs
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def generic_patch(
@@ -40,34 +40,40 @@ def generic_patch(
     """
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["LANGCHAIN"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "langchain.task.name": task,
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        inputs = {}
-        if len(args) > 0 and trace_input:
-            inputs["args"] = serialize_args(*args)
-        if len(kwargs) > 0 and trace_input:
-            inputs["kwargs"] = serialize_kwargs(**kwargs)
-        span_attributes["langchain.inputs"] = json.dumps(inputs)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(method_name),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
-            for field, value in attributes.model_dump(by_alias=True).items():
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["LANGCHAIN"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "langchain.task.name": task,
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            inputs = {}
+            if len(args) > 0 and trace_input:
+                inputs["args"] = serialize_args(*args)
+            if len(kwargs) > 0 and trace_input:
+                inputs["kwargs"] = serialize_kwargs(**kwargs)
+            span_attributes["langchain.inputs"] = json.dumps(inputs)
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
             try:
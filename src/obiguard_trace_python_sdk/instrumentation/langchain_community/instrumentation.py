@@ -14,7 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
+import importlib
 import inspect
 from typing import Collection
 
@@ -23,6 +23,7 @@ from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper
 
 from obiguard_trace_python_sdk.instrumentation.langchain_community.patch import generic_patch
+from obiguard_trace_python_sdk.utils import get_package_version
 
 
 def patch_module_classes(
@@ -77,7 +78,7 @@ class LangchainCommunityInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("langchain-community")
+        version = get_package_version("langchain-community")
 
         # List of modules to patch, with their corresponding patch names
         modules_to_patch = [
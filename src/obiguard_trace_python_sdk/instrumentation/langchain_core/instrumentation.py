@@ -14,7 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
+import importlib
 import inspect
 from typing import Collection
 
@@ -26,6 +26,7 @@ from obiguard_trace_python_sdk.instrumentation.langchain_core.patch import (
     generic_patch,
     runnable_patch,
 )
+from obiguard_trace_python_sdk.utils import get_package_version
 
 
 # pylint: disable=dangerous-default-value
@@ -100,7 +101,7 @@ class LangchainCoreInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("langchain-core")
+        version = get_package_version("langchain-core")
 
         exclude_methods = [
             "get_name",
@@ -17,7 +17,9 @@ limitations under the License.
 import json
 
 from langtrace.trace_attributes import FrameworkSpanAttributes
+from obiguard_trace_python_sdk.utils import get_sdk_version
 from obiguard_trace_python_sdk.utils.llm import get_span_name
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind, StatusCode
 from opentelemetry.trace.status import Status
@@ -27,9 +29,7 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY,
     SERVICE_PROVIDERS,
 )
-from importlib_metadata import version as v
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 from langtrace.trace_attributes import SpanAttributes
 
 
@@ -47,50 +47,58 @@ def generic_patch(
     """
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["LANGCHAIN_CORE"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "langchain.task.name": task,
-            "gen_ai.request.model": (
-                instance.model if hasattr(instance, "model") else None
-            ),
-            SpanAttributes.LLM_REQUEST_MAX_TOKENS: (
-                instance.max_output_tokens
-                if hasattr(instance, "max_output_tokens")
-                else None
-            ),
-            SpanAttributes.LLM_TOP_K: (
-                instance.top_k if hasattr(instance, "top_k") else None
-            ),
-            SpanAttributes.LLM_REQUEST_TOP_P: (
-                instance.top_p if hasattr(instance, "top_p") else None
-            ),
-            SpanAttributes.LLM_REQUEST_TEMPERATURE: (
-                instance.temperature if hasattr(instance, "temperature") else None
-            ),
-            **(extra_attributes if extra_attributes is not None else {}),  # type: ignore
-        }
-
-        if trace_input and len(args) > 0:
-            span_attributes["langchain.inputs"] = to_json_string(args)
-
-        span_attributes["langchain.metadata"] = to_json_string(kwargs)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(method_name),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
-
-            for field, value in attributes.model_dump(by_alias=True).items():
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["LANGCHAIN_CORE"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "langchain.task.name": task,
+                "gen_ai.request.model": (
+                    instance.model if hasattr(instance, "model") else None
+                ),
+                SpanAttributes.LLM_REQUEST_MAX_TOKENS: (
+                    instance.max_output_tokens
+                    if hasattr(instance, "max_output_tokens")
+                    else None
+                ),
+                SpanAttributes.LLM_TOP_K: (
+                    instance.top_k if hasattr(instance, "top_k") else None
+                ),
+                SpanAttributes.LLM_REQUEST_TOP_P: (
+                    instance.top_p if hasattr(instance, "top_p") else None
+                ),
+                SpanAttributes.LLM_REQUEST_TEMPERATURE: (
+                    instance.temperature if hasattr(instance, "temperature") else None
+                ),
+                **(
+                    extra_attributes if extra_attributes is not None else {}
+                ),  # type: ignore
+            }
+
+            if trace_input and len(args) > 0:
+                span_attributes["langchain.inputs"] = to_json_string(args)
+
+            span_attributes["langchain.metadata"] = to_json_string(kwargs)
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
+
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
             try:
@@ -136,47 +144,51 @@ def runnable_patch(
     """
 
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["LANGCHAIN_CORE"]
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "langchain.task.name": task,
-        }
-
-        if trace_input:
-            inputs = {}
-            if len(args) > 0:
-                for arg in args:
-                    if isinstance(arg, dict):
-                        for key, value in arg.items():
-                            if isinstance(value, list):
-                                for item in value:
-                                    inputs[key] = item.__class__.__name__
-                            elif isinstance(value, str):
-                                inputs[key] = value
-                    elif isinstance(arg, str):
-                        inputs["input"] = arg
-
-            for field, value in (
-                instance.steps.items()
-                if hasattr(instance, "steps") and isinstance(instance.steps, dict)
-                else {}
-            ):
-                inputs[field] = value.__class__.__name__
-
-            span_attributes["langchain.inputs"] = to_json_string(inputs)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             method_name,
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
-            for field, value in attributes.model_dump(by_alias=True).items():
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["LANGCHAIN_CORE"]
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "langchain.task.name": task,
+            }
+
+            if trace_input:
+                inputs = {}
+                if len(args) > 0:
+                    for arg in args:
+                        if isinstance(arg, dict):
+                            for key, value in arg.items():
+                                if isinstance(value, list):
+                                    for item in value:
+                                        inputs[key] = item.__class__.__name__
+                                elif isinstance(value, str):
+                                    inputs[key] = value
+                        elif isinstance(arg, str):
+                            inputs["input"] = arg
+
+                for field, value in (
+                    instance.steps.items()
+                    if hasattr(instance, "steps") and isinstance(instance.steps, dict)
+                    else {}
+                ):
+                    inputs[field] = value.__class__.__name__
+
+                span_attributes["langchain.inputs"] = to_json_string(inputs)
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
             try:
@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import inspect
 from typing import Collection
 
@@ -23,6 +22,7 @@ from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper
 
 from obiguard_trace_python_sdk.instrumentation.langgraph.patch import patch_graph_methods
+from obiguard_trace_python_sdk.utils import get_package_version
 
 
 class LanggraphInstrumentation(BaseInstrumentor):
@@ -36,7 +36,7 @@ class LanggraphInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("langgraph")
+        version = get_package_version("langgraph")
 
         # List of modules to patch, with their corresponding patch names
         modules_to_patch = [
@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import json
+from obiguard_trace_python_sdk.utils import get_sdk_version
 from obiguard_trace_python_sdk.utils.llm import get_span_name
 from opentelemetry.trace.propagation import set_span_in_context
 
@@ -27,37 +28,42 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY,
     SERVICE_PROVIDERS,
 )
-from importlib_metadata import version as v
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 from obiguard_trace_python_sdk.utils.llm import set_span_attributes
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def patch_graph_methods(method_name, tracer, version):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["LANGGRAPH"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        attr = get_atrribute_key_value(method_name, args)
-        if attr is not None:
-            span_attributes.update(attr)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(method_name),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["LANGGRAPH"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            attr = get_atrribute_key_value(method_name, args)
+            if attr is not None:
+                span_attributes.update(attr)
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             set_span_attributes(span, attributes)
             try:
                 # Attempt to call the original method
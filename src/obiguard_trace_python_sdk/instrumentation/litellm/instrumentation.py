@@ -12,7 +12,6 @@ limitations under the License.
 """
 
 from typing import Collection, Optional, Any
-import importlib.metadata
 import logging
 
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
@@ -27,6 +26,7 @@ from obiguard_trace_python_sdk.instrumentation.litellm.patch import (
     embeddings_create,
     images_generate,
 )
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -39,7 +39,7 @@ class LiteLLMInstrumentation(BaseInstrumentor): # type: ignore
     def _instrument(self, **kwargs: Any) -> None:
         tracer_provider: Optional[TracerProvider] = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version: str = importlib.metadata.version("openai")
+        version: str = get_package_version("openai")
 
         wrap_function_wrapper(
             "litellm",
@@ -14,7 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
+import importlib
 import inspect
 import logging
 from typing import Collection
@@ -24,6 +24,7 @@ from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper
 
 from obiguard_trace_python_sdk.instrumentation.llamaindex.patch import generic_patch
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -39,7 +40,7 @@ class LlamaindexInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("llama-index")
+        version = get_package_version("llama-index")
 
         modules_to_patch = [
             ("llama_index.core.query_engine", "query", "query"),
@@ -16,6 +16,9 @@ def generic_patch(api, version: str, tracer: Tracer):
         span_name = api["SPAN_NAME"]
         operation = api["OPERATION"]
         with tracer.start_as_current_span(span_name, kind=SpanKind.CLIENT) as span:
+            if not span.is_recording():
+                return wrapped(*args, **kwargs)
+
             try:
                 span_attributes = {
                     **get_langtrace_attributes(
@@ -41,6 +41,7 @@ from obiguard_trace_python_sdk.utils.llm import (
     set_span_attributes,
     set_usage_attributes,
 )
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 from obiguard_trace_python_sdk.instrumentation.openai.patch import extract_content
 
@@ -55,24 +56,28 @@ def chat_complete(original_method, version, tracer, is_async=False, is_streaming
 
         api = "ASYNC_CHAT_COMPLETE" if is_async else "CHAT_COMPLETE"
 
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, prompts=llm_prompts),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS[api]["ENDPOINT"],
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
         span = tracer.start_span(
             name=get_span_name(APIS[api]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
         )
-        _set_input_attributes(span, kwargs, attributes)
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
 
         try:
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, prompts=llm_prompts),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS[api]["ENDPOINT"],
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            _set_input_attributes(span, kwargs, attributes)
             result = wrapped(*args, **kwargs)
             if is_streaming:
                 return StreamWrapper(
@@ -80,6 +85,7 @@ def chat_complete(original_method, version, tracer, is_async=False, is_streaming
                     span,
                     function_call=kwargs.get("functions") is not None,
                     tool_calls=kwargs.get("tools") is not None,
+                    vendor="mistral",
                 )
             else:
                 _set_response_attributes(span, kwargs, result)
@@ -106,35 +112,41 @@ def embeddings_create(original_method, version, tracer, is_async=False):
 
         api = "ASYNC_EMBEDDINGS_CREATE" if is_async else "EMBEDDINGS_CREATE"
 
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, operation_name="embed"),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS[api]["ENDPOINT"],
-            SpanAttributes.LLM_REQUEST_DIMENSIONS: kwargs.get("dimensions"),
-            **get_extra_attributes(),
-        }
-
-        encoding_format = kwargs.get("encoding_format")
-        if encoding_format is not None:
-            if not isinstance(encoding_format, list):
-                encoding_format = [encoding_format]
-            span_attributes[SpanAttributes.LLM_REQUEST_ENCODING_FORMATS] = (
-                encoding_format
-            )
-
-        if kwargs.get("inputs") is not None:
-            span_attributes[SpanAttributes.LLM_REQUEST_EMBEDDING_INPUTS] = json.dumps(
-                [kwargs.get("inputs", [])]
-            )
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(APIS[api]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, operation_name="embed"),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS[api]["ENDPOINT"],
+                SpanAttributes.LLM_REQUEST_DIMENSIONS: kwargs.get("dimensions"),
+                **get_extra_attributes(),
+            }
+
+            encoding_format = kwargs.get("encoding_format")
+            if encoding_format is not None:
+                if not isinstance(encoding_format, list):
+                    encoding_format = [encoding_format]
+                span_attributes[SpanAttributes.LLM_REQUEST_ENCODING_FORMATS] = (
+                    encoding_format
+                )
+
+            if kwargs.get("inputs") is not None:
+                span_attributes[SpanAttributes.LLM_REQUEST_EMBEDDING_INPUTS] = (
+                    json.dumps([kwargs.get("inputs", [])])
+                )
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
 
             set_span_attributes(span, attributes)
             try:
@@ -158,7 +170,7 @@ def embeddings_create(original_method, version, tracer, is_async=False):
 @silently_fail
 def _set_input_attributes(span, kwargs, attributes):
     tools = []
-    for field, value in attributes.model_dump(by_alias=True).items():
+    for field, value in attributes.items():
         set_span_attribute(span, field, value)
 
     if kwargs.get("tools") is not None:
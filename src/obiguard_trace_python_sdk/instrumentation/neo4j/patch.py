@@ -19,7 +19,8 @@ import json
 from obiguard_trace_python_sdk.utils.llm import get_span_name
 from obiguard_trace_python_sdk.utils.silently_fail import silently_fail
 from langtrace.trace_attributes import DatabaseSpanAttributes
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import Status, StatusCode
@@ -30,47 +31,51 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     SERVICE_PROVIDERS,
 )
 from obiguard_trace_python_sdk.constants.instrumentation.neo4j import APIS
-from importlib.metadata import version as v
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 
 
 def driver_patch(operation_name, version, tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        try:
-            query = args[0].text if hasattr(args[0], "text") else args[0]
-            query_text = json.dumps(query)
-        except (AttributeError, TypeError):
-            query_text = args[0]
         api = APIS[operation_name]
-        service_provider = SERVICE_PROVIDERS.get("NEO4J", "neo4j")
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "vectordb",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "db.system": "neo4j",
-            "db.operation": api["OPERATION"],
-            "db.query": query_text,
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-        
-        attributes = DatabaseSpanAttributes(**span_attributes)
-        
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(api["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
-            for field, value in attributes.model_dump(by_alias=True).items():
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            try:
+                query = args[0].text if hasattr(args[0], "text") else args[0]
+                query_text = json.dumps(query)
+            except (AttributeError, TypeError):
+                query_text = args[0]
+            service_provider = SERVICE_PROVIDERS.get("NEO4J", "neo4j")
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "vectordb",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "db.system": "neo4j",
+                "db.operation": api["OPERATION"],
+                "db.query": query_text,
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            attributes = build_span_attributes(DatabaseSpanAttributes, span_attributes)
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
 
             if operation_name == "EXECUTE_QUERY":
                 _set_execute_query_attributes(span, args, kwargs)
-            
+
             try:
                 result = wrapped(*args, **kwargs)
 
@@ -87,7 +92,7 @@ def driver_patch(operation_name, version, tracer):
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise
-    
+
     return traced_method
 
 
@@ -118,8 +123,8 @@ def _set_execute_query_attributes(span, args, kwargs):
     routing = kwargs.get("routing_", None)
     if routing:
         set_span_attribute(span, "neo4j.db.routing", str(routing))
-        
-        
+
+
 @silently_fail
 def _set_result_attributes(span, records, result_summary, keys):
     """
@@ -181,4 +186,4 @@ def _set_result_attributes(span, records, result_summary, keys):
                 set_span_attribute(span, "neo4j.result.notification_count", len(result_summary.notifications))
                 set_span_attribute(span, "neo4j.result.notifications", json.dumps(result_summary.notifications))
             except (AttributeError, TypeError):
-                pass
\ No newline at end of file
+                pass
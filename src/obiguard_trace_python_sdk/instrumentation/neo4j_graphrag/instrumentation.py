@@ -18,7 +18,7 @@ from typing import Collection
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry import trace
 from wrapt import wrap_function_wrapper as _W
-from importlib.metadata import version as v
+from obiguard_trace_python_sdk.utils import get_package_version
 from .patch import patch_graphrag_search, patch_kg_pipeline_run, \
 patch_kg_pipeline_run, patch_retriever_search
 
@@ -31,7 +31,7 @@ class Neo4jGraphRAGInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = trace.get_tracer(__name__, "", tracer_provider)
-        graphrag_version = v("neo4j-graphrag")
+        graphrag_version = get_package_version("neo4j-graphrag")
         
         try:
             # instrument kg builder
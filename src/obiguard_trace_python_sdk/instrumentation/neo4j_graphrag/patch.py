@@ -16,59 +16,69 @@ limitations under the License.
 
 import json
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import FrameworkSpanAttributes
-from opentelemetry import baggage
+from opentelemetry import baggage, trace
 from opentelemetry.trace import Span, SpanKind, Tracer
 from opentelemetry.trace.status import Status, StatusCode
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
+from obiguard_trace_python_sdk.utils import get_sdk_version
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, SERVICE_PROVIDERS)
 from obiguard_trace_python_sdk.utils.llm import set_span_attributes
 from obiguard_trace_python_sdk.utils.misc import serialize_args, serialize_kwargs
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def patch_kg_pipeline_run(operation_name: str, version: str, tracer: Tracer):
-    
+
     async def async_traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS.get("NEO4J_GRAPHRAG", "neo4j_graphrag")
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "neo4j.pipeline.type": "SimpleKGPipeline",
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        if len(args) > 0:
-            span_attributes["neo4j.pipeline.inputs"] = serialize_args(*args)
-        if kwargs:
-            span_attributes["neo4j.pipeline.kwargs"] = serialize_kwargs(**kwargs)
-
-        file_path = kwargs.get("file_path", args[0] if len(args) > 0 else None)
-        text = kwargs.get("text", args[1] if len(args) > 1 else None)
-        if file_path:
-            span_attributes["neo4j.pipeline.file_path"] = file_path
-        if text:
-            span_attributes["neo4j.pipeline.text_length"] = len(text)
-
-        if hasattr(instance, "runner") and hasattr(instance.runner, "config"):
-            config = instance.runner.config
-            if config:
-                span_attributes["neo4j.pipeline.from_pdf"] = getattr(config, "from_pdf", None)
-                span_attributes["neo4j.pipeline.perform_entity_resolution"] = getattr(config, "perform_entity_resolution", None)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=f"neo4j.pipeline.{operation_name}",
             kind=SpanKind.CLIENT,
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return await wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS.get("NEO4J_GRAPHRAG", "neo4j_graphrag")
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "neo4j.pipeline.type": "SimpleKGPipeline",
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            if len(args) > 0:
+                span_attributes["neo4j.pipeline.inputs"] = serialize_args(*args)
+            if kwargs:
+                span_attributes["neo4j.pipeline.kwargs"] = serialize_kwargs(**kwargs)
+
+            file_path = kwargs.get("file_path", args[0] if len(args) > 0 else None)
+            text = kwargs.get("text", args[1] if len(args) > 1 else None)
+            if file_path:
+                span_attributes["neo4j.pipeline.file_path"] = file_path
+            if text:
+                span_attributes["neo4j.pipeline.text_length"] = len(text)
+
+            if hasattr(instance, "runner") and hasattr(instance.runner, "config"):
+                config = instance.runner.config
+                if config:
+                    span_attributes["neo4j.pipeline.from_pdf"] = getattr(
+                        config, "from_pdf", None
+                    )
+                    span_attributes["neo4j.pipeline.perform_entity_resolution"] = (
+                        getattr(config, "perform_entity_resolution", None)
+                    )
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
                 set_span_attributes(span, attributes)
 
@@ -84,7 +94,7 @@ def patch_kg_pipeline_run(operation_name: str, version: str, tracer: Tracer):
                             span.set_attribute("neo4j.pipeline.result", json.dumps(result_dict))
                     except Exception as e:
                         span.set_attribute("neo4j.pipeline.result_error", str(e))
-                
+
                 span.set_status(Status(StatusCode.OK))
                 return result
 
@@ -97,47 +107,59 @@ def patch_kg_pipeline_run(operation_name: str, version: str, tracer: Tracer):
 
 
 def patch_graphrag_search(operation_name: str, version: str, tracer: Tracer):
-    
+
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS.get("NEO4J_GRAPHRAG", "neo4j_graphrag")
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-        
-        # Basic attributes
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "neo4j_graphrag.operation": operation_name,
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        query_text = kwargs.get("query_text", args[0] if len(args) > 0 else None)
-        if query_text:
-            span_attributes["neo4j_graphrag.query_text"] = query_text
-
-        retriever_config = kwargs.get("retriever_config", None)
-        if retriever_config:
-            span_attributes["neo4j_graphrag.retriever_config"] = json.dumps(retriever_config)
-
-        if hasattr(instance, "retriever"):
-            span_attributes["neo4j_graphrag.retriever_type"] = instance.retriever.__class__.__name__
-
-        if hasattr(instance, "llm"):
-            span_attributes["neo4j_graphrag.llm_type"] = instance.llm.__class__.__name__
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=f"neo4j_graphrag.{operation_name}",
             kind=SpanKind.CLIENT,
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS.get("NEO4J_GRAPHRAG", "neo4j_graphrag")
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            # Basic attributes
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "neo4j_graphrag.operation": operation_name,
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            query_text = kwargs.get("query_text", args[0] if len(args) > 0 else None)
+            if query_text:
+                span_attributes["neo4j_graphrag.query_text"] = query_text
+
+            retriever_config = kwargs.get("retriever_config", None)
+            if retriever_config:
+                span_attributes["neo4j_graphrag.retriever_config"] = json.dumps(
+                    retriever_config
+                )
+
+            if hasattr(instance, "retriever"):
+                span_attributes["neo4j_graphrag.retriever_type"] = (
+                    instance.retriever.__class__.__name__
+                )
+
+            if hasattr(instance, "llm"):
+                span_attributes["neo4j_graphrag.llm_type"] = (
+                    instance.llm.__class__.__name__
+                )
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
                 set_span_attributes(span, attributes)
 
                 result = wrapped(*args, **kwargs)
-                
+
                 if result and hasattr(result, "answer"):
                     span.set_attribute("neo4j_graphrag.answer", result.answer)
 
@@ -147,7 +169,7 @@ def patch_graphrag_search(operation_name: str, version: str, tracer: Tracer):
                             span.set_attribute("neo4j_graphrag.context_items", retriever_items)
                         except Exception:
                             pass
-                
+
                 span.set_status(Status(StatusCode.OK))
                 return result
 
@@ -160,48 +182,66 @@ def patch_graphrag_search(operation_name: str, version: str, tracer: Tracer):
 
 
 def patch_retriever_search(operation_name: str, version: str, tracer: Tracer):
-    
+
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS.get("NEO4J_GRAPHRAG", "neo4j_graphrag")
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-        
-        # Basic attributes
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "framework",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "neo4j.retriever.operation": operation_name,
-            "neo4j.retriever.type": instance.__class__.__name__,
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        query_text = kwargs.get("query_text", args[0] if len(args) > 0 else None)
-        if query_text:
-            span_attributes["neo4j.retriever.query_text"] = query_text
-
-        if hasattr(instance, "__class__") and hasattr(instance.__class__, "__name__"):
-            retriever_type = instance.__class__.__name__
-
-            if retriever_type == "VectorRetriever" and hasattr(instance, "index_name"):
-                span_attributes["neo4j.vector_retriever.index_name"] = instance.index_name
-
-            if retriever_type == "KnowledgeGraphRetriever" and hasattr(instance, "cypher_query"):
-                span_attributes["neo4j.kg_retriever.cypher_query"] = instance.cypher_query
-
-        for param in ["top_k", "similarity_threshold"]:
-            if param in kwargs:
-                span_attributes[f"neo4j.retriever.{param}"] = kwargs[param]
-            elif hasattr(instance, param):
-                span_attributes[f"neo4j.retriever.{param}"] = getattr(instance, param)
-
-        attributes = FrameworkSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=f"neo4j.retriever.{operation_name}",
             kind=SpanKind.CLIENT,
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS.get("NEO4J_GRAPHRAG", "neo4j_graphrag")
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            # Basic attributes
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "framework",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "neo4j.retriever.operation": operation_name,
+                "neo4j.retriever.type": instance.__class__.__name__,
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            query_text = kwargs.get("query_text", args[0] if len(args) > 0 else None)
+            if query_text:
+                span_attributes["neo4j.retriever.query_text"] = query_text
+
+            if hasattr(instance, "__class__") and hasattr(
+                instance.__class__, "__name__"
+            ):
+                retriever_type = instance.__class__.__name__
+
+                if retriever_type == "VectorRetriever" and hasattr(
+                    instance, "index_name"
+                ):
+                    span_attributes["neo4j.vector_retriever.index_name"] = (
+                        instance.index_name
+                    )
+
+                if retriever_type == "KnowledgeGraphRetriever" and hasattr(
+                    instance, "cypher_query"
+                ):
+                    span_attributes["neo4j.kg_retriever.cypher_query"] = (
+                        instance.cypher_query
+                    )
+
+            for param in ["top_k", "similarity_threshold"]:
+                if param in kwargs:
+                    span_attributes[f"neo4j.retriever.{param}"] = kwargs[param]
+                elif hasattr(instance, param):
+                    span_attributes[f"neo4j.retriever.{param}"] = getattr(
+                        instance, param
+                    )
+
+            attributes = build_span_attributes(FrameworkSpanAttributes, span_attributes)
             try:
                 set_span_attributes(span, attributes)
 
@@ -217,7 +257,7 @@ def patch_retriever_search(operation_name: str, version: str, tracer: Tracer):
                                 span.set_attribute("neo4j.retriever.item_ids", json.dumps(item_ids))
                         except Exception:
                             pass
-                
+
                 span.set_status(Status(StatusCode.OK))
                 return result
 
@@ -17,8 +17,8 @@ limitations under the License.
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper as _W
+from obiguard_trace_python_sdk.utils import get_package_version
 from typing import Collection
-from importlib_metadata import version as v
 from obiguard_trace_python_sdk.constants.instrumentation.ollama import APIS
 from .patch import generic_patch, ageneric_patch
 
@@ -33,7 +33,7 @@ class OllamaInstrumentor(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = v("ollama")
+        version = get_package_version("ollama")
         for operation_name, details in APIS.items():
             operation = details["METHOD"]
             # Dynamically creating the patching call
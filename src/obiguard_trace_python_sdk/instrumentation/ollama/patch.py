@@ -10,6 +10,7 @@ from obiguard_trace_python_sdk.utils.llm import (
     set_event_completion,
 )
 from obiguard_trace_python_sdk.utils.silently_fail import silently_fail
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from obiguard_trace_python_sdk.constants.instrumentation.common import SERVICE_PROVIDERS
 from langtrace.trace_attributes import LLMSpanAttributes, Event
 from opentelemetry.trace import SpanKind
@@ -22,32 +23,35 @@ from opentelemetry.trace import Tracer
 def generic_patch(operation_name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
         api = APIS[operation_name]
-        service_provider = SERVICE_PROVIDERS["OLLAMA"]
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(
-                kwargs,
-                prompts=kwargs.get("messages", None),
-            ),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: api["ENDPOINT"],
-            SpanAttributes.LLM_RESPONSE_FORMAT: kwargs.get("format"),
-            **get_extra_attributes(),
-        }
-
-        attributes = LLMSpanAttributes(**span_attributes)
-
         span = tracer.start_span(
             name=get_span_name(f'ollama.{api["METHOD"]}'), kind=SpanKind.CLIENT
         )
-        _set_input_attributes(span, kwargs, attributes)
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
 
         try:
+            service_provider = SERVICE_PROVIDERS["OLLAMA"]
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(
+                    kwargs,
+                    prompts=kwargs.get("messages", None),
+                ),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: api["ENDPOINT"],
+                SpanAttributes.LLM_RESPONSE_FORMAT: kwargs.get("format"),
+                **get_extra_attributes(),
+            }
+
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            _set_input_attributes(span, kwargs, attributes)
             result = wrapped(*args, **kwargs)
             if kwargs.get("stream"):
-                return StreamWrapper(result, span)
+                return StreamWrapper(result, span, vendor="ollama")
             else:
                 _set_response_attributes(span, result)
+            span.end()
             return result
 
         except Exception as err:
@@ -56,6 +60,7 @@ def generic_patch(operation_name, version, tracer: Tracer):
 
             # Set the span status to indicate an error
             span.set_status(Status(StatusCode.ERROR, str(err)))
+            span.end()
 
             # Reraise the exception to ensure it's not swallowed
             raise
@@ -66,25 +71,28 @@ def generic_patch(operation_name, version, tracer: Tracer):
 def ageneric_patch(operation_name, version, tracer):
     async def traced_method(wrapped, instance, args, kwargs):
         api = APIS[operation_name]
-        service_provider = SERVICE_PROVIDERS["OLLAMA"]
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(kwargs),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: api["ENDPOINT"],
-            SpanAttributes.LLM_RESPONSE_FORMAT: kwargs.get("format"),
-            **get_extra_attributes(),
-        }
-        attributes = LLMSpanAttributes(**span_attributes)
         span = tracer.start_span(
             name=get_span_name(f'ollama.{api["METHOD"]}'), kind=SpanKind.CLIENT
         )
+        if not span.is_recording():
+            return await wrapped(*args, **kwargs)
 
-        _set_input_attributes(span, kwargs, attributes)
         try:
+            service_provider = SERVICE_PROVIDERS["OLLAMA"]
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(kwargs),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: api["ENDPOINT"],
+                SpanAttributes.LLM_RESPONSE_FORMAT: kwargs.get("format"),
+                **get_extra_attributes(),
+            }
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
+
+            _set_input_attributes(span, kwargs, attributes)
             result = await wrapped(*args, **kwargs)
             if kwargs.get("stream"):
-                return StreamWrapper(result, span)
+                return StreamWrapper(result, span, vendor="ollama")
             else:
                 _set_response_attributes(span, result)
             span.end()
@@ -95,6 +103,7 @@ def ageneric_patch(operation_name, version, tracer):
 
             # Set the span status to indicate an error
             span.set_status(Status(StatusCode.ERROR, str(err)))
+            span.end()
 
             # Reraise the exception to ensure it's not swallowed
             raise
@@ -134,7 +143,7 @@ def _set_response_attributes(span, response):
 def _set_input_attributes(span, kwargs, attributes):
     options = kwargs.get("options")
 
-    for field, value in attributes.model_dump(by_alias=True).items():
+    for field, value in attributes.items():
         set_span_attribute(span, field, value)
 
     if "options" in kwargs:
@@ -12,7 +12,6 @@ limitations under the License.
 """
 
 from typing import Collection, Optional, Any
-import importlib.metadata
 import logging
 
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
@@ -30,6 +29,7 @@ from obiguard_trace_python_sdk.instrumentation.openai.patch import (
     images_edit,
     images_generate,
 )
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -42,7 +42,7 @@ class OpenAIInstrumentation(BaseInstrumentor):  # type: ignore
     def _instrument(self, **kwargs: Any) -> None:
         tracer_provider: Optional[TracerProvider] = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version: str = importlib.metadata.version("openai")
+        version: str = get_package_version("openai")
 
         wrap_function_wrapper(
             "openai.resources.chat.completions",
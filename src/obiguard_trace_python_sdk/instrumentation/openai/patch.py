@@ -21,7 +21,7 @@ from obiguard_trace_python_sdk.types import NOT_GIVEN
 from obiguard_trace_python_sdk.utils import set_span_attribute
 from obiguard_trace_python_sdk.utils.llm import (
     StreamWrapper,
-    calculate_prompt_tokens,
+    count_prompt_tokens,
     get_base_url,
     get_extra_attributes,
     get_langtrace_attributes,
@@ -34,7 +34,12 @@ from obiguard_trace_python_sdk.utils.llm import (
     set_span_attributes,
     set_usage_attributes,
 )
+from obiguard_trace_python_sdk.utils.prompt_cache import (
+    prompt_cache_usage,
+    record_prompt_cache_usage,
+)
 from obiguard_trace_python_sdk.utils.silently_fail import silently_fail
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 def async_openai_responses_create(version: str, tracer: Tracer) -> Callable:
@@ -43,27 +48,34 @@ def async_openai_responses_create(version: str, tracer: Tracer) -> Callable:
     async def traced_method(
         wrapped: Callable, instance: Any, args: List[Any], kwargs: Dict[str, Any]
     ):
-        input_value = kwargs.get("input")
-        prompt = (
-            input_value[0]
-            if isinstance(input_value, list)
-            else [{"role": "user", "content": input_value}]
-        )
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-        span_attributes = {
-            "instructions": kwargs.get("instructions"),
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(
-                kwargs,
-                operation_name="openai.responses.create",
-                prompts=prompt,
-            ),
-        }
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name="openai.responses.create",
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return await wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            input_value = kwargs.get("input")
+            prompt = (
+                input_value[0]
+                if isinstance(input_value, list)
+                else [{"role": "user", "content": input_value}]
+            )
+            service_provider = SERVICE_PROVIDERS["OPENAI"]
+            span_attributes = {
+                "instructions": kwargs.get("instructions"),
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(
+                    kwargs,
+                    operation_name="openai.responses.create",
+                    prompts=prompt,
+                ),
+            }
             try:
                 set_span_attributes(span, span_attributes)
 
@@ -84,42 +96,50 @@ def openai_responses_create(version: str, tracer: Tracer) -> Callable:
     def traced_method(
         wrapped: Callable, instance: Any, args: List[Any], kwargs: Dict[str, Any]
     ):
-        input_value = kwargs.get("input")
-        prompt = (
-            input_value[0]
-            if isinstance(input_value, list)
-            else [{"role": "user", "content": input_value}]
-        )
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-        span_attributes = {
-            "instructions": kwargs.get("instructions"),
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(
-                kwargs,
-                operation_name="openai.responses.create",
-                prompts=prompt,
-            ),
-        }
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name="openai.responses.create",
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-            end_on_exit=False,
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span):
             try:
+                input_value = kwargs.get("input")
+                prompt = (
+                    input_value[0]
+                    if isinstance(input_value, list)
+                    else [{"role": "user", "content": input_value}]
+                )
+                service_provider = SERVICE_PROVIDERS["OPENAI"]
+                span_attributes = {
+                    "instructions": kwargs.get("instructions"),
+                    **get_langtrace_attributes(
+                        version, service_provider, vendor_type="llm"
+                    ),
+                    **get_llm_request_attributes(
+                        kwargs,
+                        operation_name="openai.responses.create",
+                        prompts=prompt,
+                    ),
+                }
                 set_span_attributes(span, span_attributes)
 
                 response = wrapped(*args, **kwargs)
                 if is_streaming(kwargs) and span.is_recording():
-                    return StreamWrapper(response, span)
+                    return StreamWrapper(response, span, vendor="openai_responses")
                 else:
                     _set_openai_agentic_response_attributes(span, response)
-                    
+
                 span.set_status(StatusCode.OK)
                 span.end()
                 return response
             except Exception as err:
                 span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                span.end()
                 raise
 
     return traced_method
@@ -142,22 +162,30 @@ def images_generate(version: str, tracer: Tracer) -> Callable:
     def traced_method(
         wrapped: Callable, instance: Any, args: List[Any], kwargs: ImagesGenerateKwargs
     ) -> Any:
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, operation_name="images_generate"),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["IMAGES_GENERATION"]["ENDPOINT"],
-            **get_extra_attributes(),  # type: ignore
-        }
-
-        attributes = LLMSpanAttributes(**filter_valid_attributes(span_attributes))
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(APIS["IMAGES_GENERATION"]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["OPENAI"]
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, operation_name="images_generate"),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["IMAGES_GENERATION"]["ENDPOINT"],
+                **get_extra_attributes(),  # type: ignore
+            }
+
+            attributes = build_span_attributes(
+                LLMSpanAttributes, filter_valid_attributes(span_attributes)
+            )
             set_span_attributes(span, attributes)
             try:
                 # Attempt to call the original method
@@ -202,23 +230,31 @@ def async_images_generate(version: str, tracer: Tracer) -> Callable:
     async def traced_method(
         wrapped: Callable, instance: Any, args: List[Any], kwargs: ImagesGenerateKwargs
     ) -> Awaitable[Any]:
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, operation_name="images_generate"),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["IMAGES_GENERATION"]["ENDPOINT"],
-            **get_extra_attributes(),  # type: ignore
-        }
-
-        attributes = LLMSpanAttributes(**filter_valid_attributes(span_attributes))
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(APIS["IMAGES_GENERATION"]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return await wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["OPENAI"]
+
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, operation_name="images_generate"),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["IMAGES_GENERATION"]["ENDPOINT"],
+                **get_extra_attributes(),  # type: ignore
+            }
+
+            attributes = build_span_attributes(
+                LLMSpanAttributes, filter_valid_attributes(span_attributes)
+            )
             set_span_attributes(span, attributes)
             try:
                 # Attempt to call the original method
@@ -263,25 +299,33 @@ def images_edit(version: str, tracer: Tracer) -> Callable:
     def traced_method(
         wrapped: Callable, instance: Any, args: List[Any], kwargs: ImagesEditKwargs
     ) -> Any:
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, operation_name="images_edit"),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["IMAGES_EDIT"]["ENDPOINT"],
-            SpanAttributes.LLM_RESPONSE_FORMAT: kwargs.get("response_format"),
-            SpanAttributes.LLM_IMAGE_SIZE: kwargs.get("size"),
-            **get_extra_attributes(),  # type: ignore
-        }
-
-        attributes = LLMSpanAttributes(**filter_valid_attributes(span_attributes))
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=APIS["IMAGES_EDIT"]["METHOD"],
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["OPENAI"]
+
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, operation_name="images_edit"),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["IMAGES_EDIT"]["ENDPOINT"],
+                SpanAttributes.LLM_RESPONSE_FORMAT: kwargs.get("response_format"),
+                SpanAttributes.LLM_IMAGE_SIZE: kwargs.get("size"),
+                **get_extra_attributes(),  # type: ignore
+            }
+
+            attributes = build_span_attributes(
+                LLMSpanAttributes, filter_valid_attributes(span_attributes)
+            )
             set_span_attributes(span, attributes)
             try:
                 # Attempt to call the original method
@@ -327,77 +371,87 @@ def chat_completions_create(version: str, tracer: Tracer) -> Callable:
         args: List[Any],
         kwargs: ChatCompletionsCreateKwargs,
     ) -> Any:
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-        if "perplexity" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["PPLX"]
-        elif "azure" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["AZURE"]
-        elif "groq" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["GROQ"]
-        elif "x.ai" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["XAI"]
-        elif "deepseek" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["DEEPSEEK"]
-        elif ":12000" in get_base_url(instance) or ":10000" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["ARCH"]
-        llm_prompts = []
-        for item in kwargs.get("messages", []):
-            tools = get_tool_calls(item)
-            if tools is not None:
-                tool_calls = []
-                for tool_call in tools:
-                    tool_call_dict = {
-                        "id": getattr(tool_call, "id", ""),
-                        "type": getattr(tool_call, "type", ""),
-                    }
-                    if hasattr(tool_call, "function"):
-                        tool_call_dict["function"] = {
-                            "name": getattr(tool_call.function, "name", ""),
-                            "arguments": getattr(tool_call.function, "arguments", ""),
-                        }
-                    tool_calls.append(tool_call_dict)
-                llm_prompts.append(tool_calls)
-            else:
-                llm_prompts.append(item)
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, prompts=llm_prompts),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["CHAT_COMPLETION"]["ENDPOINT"],
-            **get_extra_attributes(),  # type: ignore
-        }
-
-        attributes = LLMSpanAttributes(**filter_valid_attributes(span_attributes))
-
         span = tracer.start_span(
             name=get_span_name(APIS["CHAT_COMPLETION"]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
         )
-        _set_input_attributes(span, kwargs, attributes)
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
 
         try:
+            service_provider = SERVICE_PROVIDERS["OPENAI"]
+            if "perplexity" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["PPLX"]
+            elif "azure" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["AZURE"]
+            elif "groq" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["GROQ"]
+            elif "x.ai" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["XAI"]
+            elif "deepseek" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["DEEPSEEK"]
+            elif ":12000" in get_base_url(instance) or ":10000" in get_base_url(
+                instance
+            ):
+                service_provider = SERVICE_PROVIDERS["ARCH"]
+            llm_prompts = []
+            for item in kwargs.get("messages", []):
+                tools = get_tool_calls(item)
+                if tools is not None:
+                    tool_calls = []
+                    for tool_call in tools:
+                        tool_call_dict = {
+                            "id": getattr(tool_call, "id", ""),
+                            "type": getattr(tool_call, "type", ""),
+                        }
+                        if hasattr(tool_call, "function"):
+                            tool_call_dict["function"] = {
+                                "name": getattr(tool_call.function, "name", ""),
+                                "arguments": getattr(
+                                    tool_call.function, "arguments", ""
+                                ),
+                            }
+                        tool_calls.append(tool_call_dict)
+                    llm_prompts.append(tool_calls)
+                else:
+                    llm_prompts.append(item)
+
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, prompts=llm_prompts),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["CHAT_COMPLETION"]["ENDPOINT"],
+                **get_extra_attributes(),  # type: ignore
+            }
+
+            attributes = build_span_attributes(
+                LLMSpanAttributes, filter_valid_attributes(span_attributes)
+            )
+
+            _set_input_attributes(span, kwargs, attributes)
             result = wrapped(*args, **kwargs)
             if is_streaming(kwargs):
-                prompt_tokens = 0
-                for message in kwargs.get("messages", {}):
-                    prompt_tokens += calculate_prompt_tokens(
-                        json.dumps(str(message)), kwargs.get("model")
-                    )
+                prompt_contents = [
+                    json.dumps(str(message)) for message in kwargs.get("messages", {})
+                ]
                 functions = kwargs.get("functions")
                 if functions is not None and functions != NOT_GIVEN:
-                    for function in functions:
-                        prompt_tokens += calculate_prompt_tokens(
-                            json.dumps(function), kwargs.get("model")
-                        )
+                    prompt_contents += [json.dumps(function) for function in functions]
+                prompt_tokens, prompt_tokens_estimated = count_prompt_tokens(
+                    prompt_contents, kwargs.get("model"), span
+                )
 
                 return StreamWrapper(
                     result,
                     span,
                     prompt_tokens,
+                    prompt_tokens_estimated=prompt_tokens_estimated,
                     function_call=kwargs.get("functions") is not None,
                     tool_calls=kwargs.get("tools") is not None,
+                    vendor="openai",
                 )
             else:
                 _set_response_attributes(span, result)
@@ -423,78 +477,87 @@ def async_chat_completions_create(version: str, tracer: Tracer) -> Callable:
         args: List[Any],
         kwargs: ChatCompletionsCreateKwargs,
     ) -> Awaitable[Any]:
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-        if "perplexity" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["PPLX"]
-        elif "azure" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["AZURE"]
-        elif "groq" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["GROQ"]
-        elif "x.ai" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["XAI"]
-        elif "deepseek" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["DEEPSEEK"]
-        elif ":12000" in get_base_url(instance) or ":10000" in get_base_url(instance):
-            service_provider = SERVICE_PROVIDERS["ARCH"]
-        llm_prompts = []
-        for item in kwargs.get("messages", []):
-            tools = get_tool_calls(item)
-            if tools is not None:
-                tool_calls = []
-                for tool_call in tools:
-                    tool_call_dict = {
-                        "id": getattr(tool_call, "id", ""),
-                        "type": getattr(tool_call, "type", ""),
-                    }
-                    if hasattr(tool_call, "function"):
-                        tool_call_dict["function"] = {
-                            "name": getattr(tool_call.function, "name", ""),
-                            "arguments": getattr(tool_call.function, "arguments", ""),
-                        }
-                    tool_calls.append(json.dumps(tool_call_dict))
-                llm_prompts.append(tool_calls)
-            else:
-                llm_prompts.append(item)
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, prompts=llm_prompts),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["CHAT_COMPLETION"]["ENDPOINT"],
-            **get_extra_attributes(),  # type: ignore
-        }
-
-        attributes = LLMSpanAttributes(**filter_valid_attributes(span_attributes))
-
         span = tracer.start_span(
             name=get_span_name(APIS["CHAT_COMPLETION"]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
         )
-        _set_input_attributes(span, kwargs, attributes)
+        if not span.is_recording():
+            return await wrapped(*args, **kwargs)
 
         try:
+            service_provider = SERVICE_PROVIDERS["OPENAI"]
+            if "perplexity" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["PPLX"]
+            elif "azure" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["AZURE"]
+            elif "groq" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["GROQ"]
+            elif "x.ai" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["XAI"]
+            elif "deepseek" in get_base_url(instance):
+                service_provider = SERVICE_PROVIDERS["DEEPSEEK"]
+            elif ":12000" in get_base_url(instance) or ":10000" in get_base_url(
+                instance
+            ):
+                service_provider = SERVICE_PROVIDERS["ARCH"]
+            llm_prompts = []
+            for item in kwargs.get("messages", []):
+                tools = get_tool_calls(item)
+                if tools is not None:
+                    tool_calls = []
+                    for tool_call in tools:
+                        tool_call_dict = {
+                            "id": getattr(tool_call, "id", ""),
+                            "type": getattr(tool_call, "type", ""),
+                        }
+                        if hasattr(tool_call, "function"):
+                            tool_call_dict["function"] = {
+                                "name": getattr(tool_call.function, "name", ""),
+                                "arguments": getattr(
+                                    tool_call.function, "arguments", ""
+                                ),
+                            }
+                        tool_calls.append(json.dumps(tool_call_dict))
+                    llm_prompts.append(tool_calls)
+                else:
+                    llm_prompts.append(item)
+
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, prompts=llm_prompts),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["CHAT_COMPLETION"]["ENDPOINT"],
+                **get_extra_attributes(),  # type: ignore
+            }
+
+            attributes = build_span_attributes(
+                LLMSpanAttributes, filter_valid_attributes(span_attributes)
+            )
+
+            _set_input_attributes(span, kwargs, attributes)
             result = await wrapped(*args, **kwargs)
             if is_streaming(kwargs):
-                prompt_tokens = 0
-                for message in kwargs.get("messages", {}):
-                    prompt_tokens += calculate_prompt_tokens(
-                        json.dumps((str(message))), kwargs.get("model")
-                    )
-
+                prompt_contents = [
+                    json.dumps(str(message)) for message in kwargs.get("messages", {})
+                ]
                 functions = kwargs.get("functions")
                 if functions is not None and functions != NOT_GIVEN:
-                    for function in functions:
-                        prompt_tokens += calculate_prompt_tokens(
-                            json.dumps(function), kwargs.get("model")
-                        )
+                    prompt_contents += [json.dumps(function) for function in functions]
+                prompt_tokens, prompt_tokens_estimated = count_prompt_tokens(
+                    prompt_contents, kwargs.get("model"), span
+                )
 
                 return StreamWrapper(
                     result,
                     span,
                     prompt_tokens,
+                    prompt_tokens_estimated=prompt_tokens_estimated,
                     function_call=kwargs.get("functions") is not None,
                     tool_calls=kwargs.get("tools") is not None,
+                    vendor="openai",
                 )  # type: ignore
             else:
                 _set_response_attributes(span, result)
@@ -522,59 +585,67 @@ def embeddings_create(version: str, tracer: Tracer) -> Callable:
         args: List[Any],
         kwargs: EmbeddingsCreateKwargs,
     ) -> Any:
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-        base_url = get_base_url(instance)
-
-        if "perplexity" in base_url:
-            service_provider = SERVICE_PROVIDERS["PPLX"]
-        elif "azure" in base_url:
-            service_provider = SERVICE_PROVIDERS["AZURE"]
-        elif "groq" in base_url:
-            service_provider = SERVICE_PROVIDERS["GROQ"]
-        elif "x.ai" in base_url:
-            service_provider = SERVICE_PROVIDERS["XAI"]
-        elif "deepseek" in base_url:
-            service_provider = SERVICE_PROVIDERS["DEEPSEEK"]
-        elif ":12000" in base_url or ":10000" in base_url:
-            service_provider = SERVICE_PROVIDERS["ARCH"]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, operation_name="embed"),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["EMBEDDINGS_CREATE"]["ENDPOINT"],
-            SpanAttributes.LLM_REQUEST_DIMENSIONS: kwargs.get("dimensions"),
-            **get_extra_attributes(),  # type: ignore
-        }
-
-        encoding_format = kwargs.get("encoding_format")
-        if encoding_format is not None:
-            if not isinstance(encoding_format, list):
-                encoding_format = [encoding_format]
-            span_attributes[SpanAttributes.LLM_REQUEST_ENCODING_FORMATS] = (
-                encoding_format
-            )
-
-        if kwargs.get("input") is not None:
-            span_attributes[SpanAttributes.LLM_REQUEST_EMBEDDING_INPUTS] = json.dumps(
-                [kwargs.get("input", "")]
-            )
-            span_attributes[SpanAttributes.LLM_PROMPTS] = json.dumps(
-                [
-                    {
-                        "role": "user",
-                        "content": kwargs.get("input"),
-                    }
-                ]
-            )
-
-        attributes = LLMSpanAttributes(**filter_valid_attributes(span_attributes))
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(APIS["EMBEDDINGS_CREATE"]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["OPENAI"]
+            base_url = get_base_url(instance)
+
+            if "perplexity" in base_url:
+                service_provider = SERVICE_PROVIDERS["PPLX"]
+            elif "azure" in base_url:
+                service_provider = SERVICE_PROVIDERS["AZURE"]
+            elif "groq" in base_url:
+                service_provider = SERVICE_PROVIDERS["GROQ"]
+            elif "x.ai" in base_url:
+                service_provider = SERVICE_PROVIDERS["XAI"]
+            elif "deepseek" in base_url:
+                service_provider = SERVICE_PROVIDERS["DEEPSEEK"]
+            elif ":12000" in base_url or ":10000" in base_url:
+                service_provider = SERVICE_PROVIDERS["ARCH"]
+
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, operation_name="embed"),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["EMBEDDINGS_CREATE"]["ENDPOINT"],
+                SpanAttributes.LLM_REQUEST_DIMENSIONS: kwargs.get("dimensions"),
+                **get_extra_attributes(),  # type: ignore
+            }
+
+            encoding_format = kwargs.get("encoding_format")
+            if encoding_format is not None:
+                if not isinstance(encoding_format, list):
+                    encoding_format = [encoding_format]
+                span_attributes[SpanAttributes.LLM_REQUEST_ENCODING_FORMATS] = (
+                    encoding_format
+                )
+
+            if kwargs.get("input") is not None:
+                span_attributes[SpanAttributes.LLM_REQUEST_EMBEDDING_INPUTS] = (
+                    json.dumps([kwargs.get("input", "")])
+                )
+                span_attributes[SpanAttributes.LLM_PROMPTS] = json.dumps(
+                    [
+                        {
+                            "role": "user",
+                            "content": kwargs.get("input"),
+                        }
+                    ]
+                )
+
+            attributes = build_span_attributes(
+                LLMSpanAttributes, filter_valid_attributes(span_attributes)
+            )
             set_span_attributes(span, attributes)
             try:
                 # Attempt to call the original method
@@ -611,58 +682,66 @@ def async_embeddings_create(version: str, tracer: Tracer) -> Callable:
         kwargs: EmbeddingsCreateKwargs,
     ) -> Awaitable[Any]:
 
-        service_provider = SERVICE_PROVIDERS["OPENAI"]
-        base_url = get_base_url(instance)
-        if "perplexity" in base_url:
-            service_provider = SERVICE_PROVIDERS["PPLX"]
-        elif "azure" in base_url:
-            service_provider = SERVICE_PROVIDERS["AZURE"]
-        elif "groq" in base_url:
-            service_provider = SERVICE_PROVIDERS["GROQ"]
-        elif "x.ai" in base_url:
-            service_provider = SERVICE_PROVIDERS["XAI"]
-        elif "deepseek" in base_url:
-            service_provider = SERVICE_PROVIDERS["DEEPSEEK"]
-        elif ":12000" in base_url or ":10000" in base_url:
-            service_provider = SERVICE_PROVIDERS["ARCH"]
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider, vendor_type="llm"),
-            **get_llm_request_attributes(kwargs, operation_name="embed"),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: APIS["EMBEDDINGS_CREATE"]["ENDPOINT"],
-            SpanAttributes.LLM_REQUEST_DIMENSIONS: kwargs.get("dimensions"),
-            **get_extra_attributes(),  # type: ignore
-        }
-
-        encoding_format = kwargs.get("encoding_format")
-        if encoding_format is not None:
-            if not isinstance(encoding_format, list):
-                encoding_format = [encoding_format]
-            span_attributes[SpanAttributes.LLM_REQUEST_ENCODING_FORMATS] = (
-                encoding_format
-            )
-
-        if kwargs.get("input") is not None:
-            span_attributes[SpanAttributes.LLM_REQUEST_EMBEDDING_INPUTS] = json.dumps(
-                [kwargs.get("input", "")]
-            )
-            span_attributes[SpanAttributes.LLM_PROMPTS] = json.dumps(
-                [
-                    {
-                        "role": "user",
-                        "content": kwargs.get("input"),
-                    }
-                ]
-            )
-
-        attributes = LLMSpanAttributes(**filter_valid_attributes(span_attributes))
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(APIS["EMBEDDINGS_CREATE"]["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return await wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["OPENAI"]
+            base_url = get_base_url(instance)
+            if "perplexity" in base_url:
+                service_provider = SERVICE_PROVIDERS["PPLX"]
+            elif "azure" in base_url:
+                service_provider = SERVICE_PROVIDERS["AZURE"]
+            elif "groq" in base_url:
+                service_provider = SERVICE_PROVIDERS["GROQ"]
+            elif "x.ai" in base_url:
+                service_provider = SERVICE_PROVIDERS["XAI"]
+            elif "deepseek" in base_url:
+                service_provider = SERVICE_PROVIDERS["DEEPSEEK"]
+            elif ":12000" in base_url or ":10000" in base_url:
+                service_provider = SERVICE_PROVIDERS["ARCH"]
+
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version, service_provider, vendor_type="llm"
+                ),
+                **get_llm_request_attributes(kwargs, operation_name="embed"),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: APIS["EMBEDDINGS_CREATE"]["ENDPOINT"],
+                SpanAttributes.LLM_REQUEST_DIMENSIONS: kwargs.get("dimensions"),
+                **get_extra_attributes(),  # type: ignore
+            }
+
+            encoding_format = kwargs.get("encoding_format")
+            if encoding_format is not None:
+                if not isinstance(encoding_format, list):
+                    encoding_format = [encoding_format]
+                span_attributes[SpanAttributes.LLM_REQUEST_ENCODING_FORMATS] = (
+                    encoding_format
+                )
+
+            if kwargs.get("input") is not None:
+                span_attributes[SpanAttributes.LLM_REQUEST_EMBEDDING_INPUTS] = (
+                    json.dumps([kwargs.get("input", "")])
+                )
+                span_attributes[SpanAttributes.LLM_PROMPTS] = json.dumps(
+                    [
+                        {
+                            "role": "user",
+                            "content": kwargs.get("input"),
+                        }
+                    ]
+                )
+
+            attributes = build_span_attributes(
+                LLMSpanAttributes, filter_valid_attributes(span_attributes)
+            )
             set_span_attributes(span, attributes)
             try:
                 # Attempt to call the original method
@@ -748,10 +827,10 @@ def _set_openai_agentic_response_attributes(span: Span, response) -> None:
 
 @silently_fail
 def _set_input_attributes(
-    span: Span, kwargs: ChatCompletionsCreateKwargs, attributes: LLMSpanAttributes
+    span: Span, kwargs: ChatCompletionsCreateKwargs, attributes: Dict[str, Any]
 ) -> None:
     tools = []
-    for field, value in attributes.model_dump(by_alias=True).items():
+    for field, value in attributes.items():
         set_span_attribute(span, field, value)
     functions = kwargs.get("functions")
     if functions is not None and functions != NOT_GIVEN:
@@ -825,3 +904,7 @@ def _set_response_attributes(span: Span, result: ResultType) -> None:
                     else 0
                 ),
             )
+            cache_read, cache_write, _ = prompt_cache_usage(usage)
+            record_prompt_cache_usage(
+                span, usage.prompt_tokens, cache_read, cache_write
+            )
@@ -11,7 +11,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Any, Collection, Optional
 
@@ -21,6 +20,7 @@ from wrapt import wrap_function_wrapper
 
 from obiguard_trace_python_sdk.instrumentation.openai_agents.patch import \
     get_new_response
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -33,7 +33,7 @@ class OpenAIAgentsInstrumentation(BaseInstrumentor):  # type: ignore
     def _instrument(self, **kwargs: Any) -> None:
         tracer_provider: Optional[TracerProvider] = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version: str = importlib.metadata.version("openai")
+        version: str = get_package_version("openai")
 
         # TODO(Karthik): This is adding a lot of noise to the trace.
         # wrap_function_wrapper(
@@ -1,18 +1,18 @@
 import json
 from typing import Any, Callable, List
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import FrameworkSpanAttributes, SpanAttributes
 from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind, Tracer
 from opentelemetry.trace.status import Status, StatusCode
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
+from obiguard_trace_python_sdk.utils import get_sdk_version
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, SERVICE_PROVIDERS)
 from obiguard_trace_python_sdk.utils.llm import (set_event_completion,
                                             set_span_attributes,
                                             set_usage_attributes)
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 
 # Define dummy classes to use when imports fail
@@ -101,53 +101,68 @@ def get_handoffs(version: str, tracer: Tracer) -> Callable:
         args: List[Any],
         kwargs: Any,
     ) -> Any:
-        try:
-            service_provider = SERVICE_PROVIDERS["OPENAI"]
-            extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-            span_attributes = {
-                "langtrace.sdk.name": "obiguard-trace-python-sdk",
-                "langtrace.service.name": service_provider,
-                "langtrace.service.type": "framework",
-                "langtrace.service.version": version,
-                "langtrace.version": v(LANGTRACE_SDK_NAME),
-                **(extra_attributes if extra_attributes is not None else {}),
-            }
+        span = tracer.start_span(
+            name="openai_agents.available_handoffs",
+            kind=SpanKind.CLIENT
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
 
-            # Process agents from args
-            agents_list = []
-            if args:
-                for arg in args:
+        with trace.use_span(span, end_on_exit=True):
+            try:
+                service_provider = SERVICE_PROVIDERS["OPENAI"]
+                extra_attributes = baggage.get_baggage(
+                    LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+                )
+                span_attributes = {
+                    "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                    "langtrace.service.name": service_provider,
+                    "langtrace.service.type": "framework",
+                    "langtrace.service.version": version,
+                    "langtrace.version": get_sdk_version(),
+                    **(extra_attributes if extra_attributes is not None else {}),
+                }
+
+                # Process agents from args
+                agents_list = []
+                if args:
+                    for arg in args:
+                        try:
+                            if arg is not None:
+                                if hasattr(arg, 'name') or hasattr(arg, 'agent'):
+                                    agent_details = extract_agent_details(arg)
+                                    if agent_details:
+                                        agents_list.append(agent_details)
+                                elif isinstance(arg, (list, tuple)):
+                                    for item in arg:
+                                        if item is not None and (
+                                            hasattr(item, 'name')
+                                            or hasattr(item, 'agent')
+                                        ):
+                                            agent_details = extract_agent_details(item)
+                                            if agent_details:
+                                                agents_list.append(agent_details)
+                        except Exception:
+                            # Skip any errors in processing individual arguments
+                            continue
+
+                if agents_list:
                     try:
-                        if arg is not None:
-                            if hasattr(arg, 'name') or hasattr(arg, 'agent'):
-                                agent_details = extract_agent_details(arg)
-                                if agent_details:
-                                    agents_list.append(agent_details)
-                            elif isinstance(arg, (list, tuple)):
-                                for item in arg:
-                                    if item is not None and (hasattr(item, 'name') or hasattr(item, 'agent')):
-                                        agent_details = extract_agent_details(item)
-                                        if agent_details:
-                                            agents_list.append(agent_details)
+                        span_attributes["openai_agents.agents"] = json.dumps(
+                            agents_list
+                        )
                     except Exception:
-                        continue  # Skip any errors in processing individual arguments
+                        pass  # Silently fail if JSON serialization fails
 
-            if agents_list:
-                try:
-                    span_attributes["openai_agents.agents"] = json.dumps(agents_list)
-                except Exception:
-                    pass  # Silently fail if JSON serialization fails
+                attributes = build_span_attributes(
+                    FrameworkSpanAttributes, span_attributes
+                )
 
-            attributes = FrameworkSpanAttributes(**span_attributes)
-
-            with tracer.start_as_current_span(
-                name="openai_agents.available_handoffs",
-                kind=SpanKind.CLIENT
-            ) as span:
                 try:
                     set_span_attributes(span, attributes)
                     result = wrapped(*args, **kwargs)
-                    
+
                     # Process handoff results
                     if result is not None:
                         handoffs_list = []
@@ -182,11 +197,11 @@ def get_handoffs(version: str, tracer: Tracer) -> Callable:
                         pass  # Silently fail if error recording fails
                     raise  # Re-raise the original error since it's from the wrapped function
 
-        except Exception:
-            try:
-                return wrapped(*args, **kwargs)
-            except Exception as wrapped_err:
-                raise wrapped_err
+            except Exception:
+                try:
+                    return wrapped(*args, **kwargs)
+                except Exception as wrapped_err:
+                    raise wrapped_err
 
     return traced_method
 
@@ -363,56 +378,73 @@ def get_new_response(version: str, tracer: Tracer) -> Callable:
         args: List[Any],
         kwargs: Any,
     ) -> Any:
-        try:
-            service_provider = SERVICE_PROVIDERS["OPENAI"]
-            extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-            span_attributes = {
-                "langtrace.sdk.name": "obiguard-trace-python-sdk",
-                "langtrace.service.name": service_provider,
-                "langtrace.service.type": "framework",
-                "langtrace.service.version": version,
-                "langtrace.version": v(LANGTRACE_SDK_NAME),
-                **(extra_attributes if extra_attributes is not None else {}),
-            }
+        # Determine span name based on agent name
+        agent_name = getattr(args[0], 'name', None) if args and len(args) > 0 else None
+        span_name = (f"openai_agents.{agent_name}" if agent_name
+                     else "openai_agents.agent_response")
+        span = tracer.start_span(
+            name=span_name,
+            kind=SpanKind.CLIENT
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return await wrapped(*args, **kwargs)
 
-            # Process input arguments
+        with trace.use_span(span, end_on_exit=True):
             try:
-                if args and len(args) >= 7:  # Check if we have all expected arguments
-                    agent = args[0]
-                    agent_name = getattr(agent, 'name', None) if agent else None
-                    input_details = {
-                        "agent": extract_agent_details(agent),
-                        "instructions": args[1],
-                        "message_history": extract_message_history(args[2]),
-                        "run_context": extract_run_context(args[5]),
-                        "run_config": extract_run_config(args[6])
-                    }
-                    span_attributes["openai_agents.inputs"] = json.dumps(input_details)
-
-                    # Set standard LLM prompts attribute
-                    if args[2]:  # message_history exists
-                        messages = []
-                        for msg in args[2]:
-                            if isinstance(msg, dict):
-                                messages.append({
-                                    "role": msg.get("role", "user"),
-                                    "content": msg.get("content", "")
-                                })
-                        if messages:
-                            span_attributes[SpanAttributes.LLM_PROMPTS] = json.dumps(messages)
-            except Exception:
-                pass  # Silently fail if input processing fails
-
-            attributes = FrameworkSpanAttributes(**span_attributes)
-            # Determine span name based on agent name
-            agent_name = getattr(args[0], 'name', None) if args and len(args) > 0 else None
-            span_name = (f"openai_agents.{agent_name}" if agent_name
-                         else "openai_agents.agent_response")
-
-            with tracer.start_as_current_span(
-                name=span_name,
-                kind=SpanKind.CLIENT
-            ) as span:
+                service_provider = SERVICE_PROVIDERS["OPENAI"]
+                extra_attributes = baggage.get_baggage(
+                    LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+                )
+                span_attributes = {
+                    "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                    "langtrace.service.name": service_provider,
+                    "langtrace.service.type": "framework",
+                    "langtrace.service.version": version,
+                    "langtrace.version": get_sdk_version(),
+                    **(extra_attributes if extra_attributes is not None else {}),
+                }
+
+                # Process input arguments
+                try:
+                    if (
+                        args and len(args) >= 7
+                    ):  # Check if we have all expected arguments
+                        agent = args[0]
+                        agent_name = getattr(agent, 'name', None) if agent else None
+                        input_details = {
+                            "agent": extract_agent_details(agent),
+                            "instructions": args[1],
+                            "message_history": extract_message_history(args[2]),
+                            "run_context": extract_run_context(args[5]),
+                            "run_config": extract_run_config(args[6]),
+                        }
+                        span_attributes["openai_agents.inputs"] = json.dumps(
+                            input_details
+                        )
+
+                        # Set standard LLM prompts attribute
+                        if args[2]:  # message_history exists
+                            messages = []
+                            for msg in args[2]:
+                                if isinstance(msg, dict):
+                                    messages.append(
+                                        {
+                                            "role": msg.get("role", "user"),
+                                            "content": msg.get("content", ""),
+                                        }
+                                    )
+                            if messages:
+                                span_attributes[SpanAttributes.LLM_PROMPTS] = (
+                                    json.dumps(messages)
+                                )
+                except Exception:
+                    pass  # Silently fail if input processing fails
+
+                attributes = build_span_attributes(
+                    FrameworkSpanAttributes, span_attributes
+                )
+
                 try:
                     set_span_attributes(span, attributes)
 
@@ -552,10 +584,10 @@ def get_new_response(version: str, tracer: Tracer) -> Callable:
 
                     raise
 
-        except Exception:  # Remove outer_err since it's unused
-            try:
-                return await wrapped(*args, **kwargs)
-            except Exception as wrapped_err:
-                raise wrapped_err
+            except Exception:  # Remove outer_err since it's unused
+                try:
+                    return await wrapped(*args, **kwargs)
+                except Exception as wrapped_err:
+                    raise wrapped_err
 
     return traced_method
@@ -16,12 +16,12 @@ limitations under the License.
 
 from typing import Collection
 
-from importlib_metadata import version as v
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 from wrapt import wrap_function_wrapper as _W
 
 from .patch import patch_agent, patch_memory
+from obiguard_trace_python_sdk.utils import get_package_version
 
 
 class PhiDataInstrumentation(BaseInstrumentor):
@@ -31,7 +31,7 @@ class PhiDataInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = v("phidata")
+        version = get_package_version("phidata")
 
         try:
             _W(
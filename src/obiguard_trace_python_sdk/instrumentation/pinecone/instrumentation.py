@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Collection
 
@@ -24,6 +23,7 @@ from wrapt import wrap_function_wrapper
 
 from obiguard_trace_python_sdk.constants.instrumentation.pinecone import APIS
 from obiguard_trace_python_sdk.instrumentation.pinecone.patch import generic_patch
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -38,7 +38,7 @@ class PineconeInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("pinecone")
+        version = get_package_version("pinecone")
         for operation_name, details in APIS.items():
             operation = details["OPERATION"]
             # Dynamically creating the patching call
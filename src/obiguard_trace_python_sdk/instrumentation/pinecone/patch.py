@@ -27,11 +27,10 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     SERVICE_PROVIDERS,
 )
 from obiguard_trace_python_sdk.constants.instrumentation.pinecone import APIS
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
 from obiguard_trace_python_sdk.utils.silently_fail import silently_fail
-from importlib_metadata import version as v
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 
 
 def generic_patch(operation_name, version, tracer):
@@ -40,35 +39,41 @@ def generic_patch(operation_name, version, tracer):
 
     def traced_method(wrapped, instance, args, kwargs):
         api = APIS[operation_name]
-        service_provider = SERVICE_PROVIDERS["PINECONE"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "vectordb",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "db.system": "pinecone",
-            "db.operation": api["OPERATION"],
-            "db.query": json.dumps(kwargs.get("query")),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        attributes = DatabaseSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(api["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["PINECONE"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "vectordb",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "db.system": "pinecone",
+                "db.operation": api["OPERATION"],
+                "db.query": json.dumps(kwargs.get("query")),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            attributes = build_span_attributes(DatabaseSpanAttributes, span_attributes)
 
             if span.is_recording():
                 set_span_attribute(span, "server.address", instance.config.host)
                 if operation_name == "QUERY":
                     set_query_input_attributes(span, kwargs)
 
-            for field, value in attributes.model_dump(by_alias=True).items():
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
             try:
@@ -18,8 +18,8 @@ from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 
 from typing import Collection
-from importlib_metadata import version as v
 from wrapt import wrap_function_wrapper as _W
+from obiguard_trace_python_sdk.utils import get_package_version
 from .patch import generic_patch
 from obiguard_trace_python_sdk.constants.instrumentation.pymongo import APIS
 
@@ -35,7 +35,7 @@ class PyMongoInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = v("pymongo")
+        version = get_package_version("pymongo")
         for api in APIS.values():
             _W(
                 module=api["MODULE"],
@@ -5,6 +5,8 @@ from obiguard_trace_python_sdk.utils.llm import (
     set_span_attribute,
 )
 from obiguard_trace_python_sdk.utils import deduce_args_and_kwargs, handle_span_error
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
+from opentelemetry import trace
 from opentelemetry.trace import SpanKind
 from obiguard_trace_python_sdk.constants.instrumentation.common import SERVICE_PROVIDERS
 from langtrace.trace_attributes import DatabaseSpanAttributes
@@ -14,22 +16,26 @@ import json
 
 def generic_patch(name, version, tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        database = instance.database.__dict__
-        span_attributes = {
-            **get_langtrace_attributes(
-                version=version,
-                service_provider=SERVICE_PROVIDERS["MONGODB"],
-                vendor_type="vectordb",
-            ),
-            "db.system": "mongodb",
-            "db.query": "aggregate",
-        }
+        span = tracer.start_span(
+            get_span_name(name), kind=SpanKind.CLIENT
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
 
-        attributes = DatabaseSpanAttributes(**span_attributes)
+        with trace.use_span(span, end_on_exit=True):
+            database = instance.database.__dict__
+            span_attributes = {
+                **get_langtrace_attributes(
+                    version=version,
+                    service_provider=SERVICE_PROVIDERS["MONGODB"],
+                    vendor_type="vectordb",
+                ),
+                "db.system": "mongodb",
+                "db.query": "aggregate",
+            }
 
-        with tracer.start_as_current_span(
-            get_span_name(name), kind=SpanKind.CLIENT
-        ) as span:
+            attributes = build_span_attributes(DatabaseSpanAttributes, span_attributes)
             if span.is_recording():
                 set_input_attributes(
                     span, deduce_args_and_kwargs(wrapped, *args, **kwargs)
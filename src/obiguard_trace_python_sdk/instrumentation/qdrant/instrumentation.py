@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Collection
 
@@ -24,6 +23,7 @@ from wrapt import wrap_function_wrapper
 
 from obiguard_trace_python_sdk.constants.instrumentation.qdrant import APIS
 from obiguard_trace_python_sdk.instrumentation.qdrant.patch import collection_patch
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.FATAL)
 
@@ -39,7 +39,7 @@ class QdrantInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("qdrant-client")
+        version = get_package_version("qdrant-client")
 
         for operation, _ in APIS.items():
             wrap_function_wrapper(
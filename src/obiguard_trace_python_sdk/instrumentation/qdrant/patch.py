@@ -18,7 +18,8 @@ import json
 from langtrace.trace_attributes import DatabaseSpanAttributes
 from obiguard_trace_python_sdk.utils.llm import get_span_name
 from obiguard_trace_python_sdk.utils.silently_fail import silently_fail
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import Status, StatusCode
@@ -29,9 +30,7 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import (
     SERVICE_PROVIDERS,
 )
 from obiguard_trace_python_sdk.constants.instrumentation.qdrant import APIS
-from importlib_metadata import version as v
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 
 
 def collection_patch(method, version, tracer):
@@ -41,28 +40,34 @@ def collection_patch(method, version, tracer):
 
     def traced_method(wrapped, instance, args, kwargs):
         api = APIS[method]
-        service_provider = SERVICE_PROVIDERS["QDRANT"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "vectordb",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "db.system": "qdrant",
-            "db.operation": api["OPERATION"],
-            "db.query": json.dumps(kwargs.get("query")),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        attributes = DatabaseSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(api["METHOD"]),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["QDRANT"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "vectordb",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "db.system": "qdrant",
+                "db.operation": api["OPERATION"],
+                "db.query": json.dumps(kwargs.get("query")),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            attributes = build_span_attributes(DatabaseSpanAttributes, span_attributes)
             collection_name = kwargs.get("collection_name") if kwargs.get("collection_name") is not None else (args[0] if args else None)
             operation = api["OPERATION"]
             set_span_attribute(span, "db.collection.name", collection_name)
@@ -83,7 +88,7 @@ def collection_patch(method, version, tracer):
             ]:
                 _set_batch_search_attributes(span, args, kwargs, operation)
 
-            for field, value in attributes.model_dump(by_alias=True).items():
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
             try:
@@ -1,11 +1,10 @@
 from typing import Collection
-from importlib_metadata import version as v
 from obiguard_trace_python_sdk.constants.instrumentation.vertexai import APIS
 from wrapt import wrap_function_wrapper as _W
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.trace import get_tracer
 from .patch import patch_vertexai
-from obiguard_trace_python_sdk.utils import is_package_installed
+from obiguard_trace_python_sdk.utils import get_package_version, is_package_installed
 
 
 class VertexAIInstrumentation(BaseInstrumentor):
@@ -19,9 +18,9 @@ class VertexAIInstrumentation(BaseInstrumentor):
         trace_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", trace_provider)
         version = (
-            v("vertexai")
+            get_package_version("vertexai")
             if is_package_installed("vertexai")
-            else v("google-cloud-aiplatform")
+            else get_package_version("google-cloud-aiplatform")
         )
 
         for _, api_config in APIS.items():
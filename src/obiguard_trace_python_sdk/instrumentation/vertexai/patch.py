@@ -3,7 +3,7 @@ from obiguard_trace_python_sdk.constants.instrumentation.common import SERVICE_P
 
 
 from obiguard_trace_python_sdk.utils.llm import (
-    calculate_prompt_tokens,
+    count_prompt_tokens,
     get_extra_attributes,
     get_langtrace_attributes,
     get_llm_request_attributes,
@@ -16,6 +16,7 @@ from obiguard_trace_python_sdk.utils.llm import (
 )
 from langtrace.trace_attributes import LLMSpanAttributes, SpanAttributes
 from obiguard_trace_python_sdk.utils.silently_fail import silently_fail
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 from opentelemetry.trace import Tracer, SpanKind, Span
 from opentelemetry import trace
 from opentelemetry.trace.propagation import set_span_in_context
@@ -25,38 +26,44 @@ import json
 
 def patch_vertexai(name, version, tracer: Tracer):
     def traced_method(wrapped, instance, args, kwargs):
-        service_provider = SERVICE_PROVIDERS["VERTEXAI"]
-        prompts = serialize_prompts(args, kwargs)
-
-        span_attributes = {
-            **get_langtrace_attributes(version, service_provider),
-            **get_llm_request_attributes(
-                kwargs,
-                prompts=prompts,
-                model=get_llm_model(instance, kwargs),
-            ),
-            **get_llm_url(instance),
-            SpanAttributes.LLM_PATH: "",
-            **get_extra_attributes(),
-        }
-        attributes = LLMSpanAttributes(**span_attributes)
         span = tracer.start_span(
             name=get_span_name(name),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
         )
+        if not span.is_recording():
+            return wrapped(*args, **kwargs)
 
         try:
+            service_provider = SERVICE_PROVIDERS["VERTEXAI"]
+            prompts = serialize_prompts(args, kwargs)
+
+            span_attributes = {
+                **get_langtrace_attributes(version, service_provider),
+                **get_llm_request_attributes(
+                    kwargs,
+                    prompts=prompts,
+                    model=get_llm_model(instance, kwargs),
+                ),
+                **get_llm_url(instance),
+                SpanAttributes.LLM_PATH: "",
+                **get_extra_attributes(),
+            }
+            attributes = build_span_attributes(LLMSpanAttributes, span_attributes)
             set_span_attributes(span, attributes)
             result = wrapped(*args, **kwargs)
             if is_streaming_response(result):
-                prompt_tokens = 0
-                for message in kwargs.get("message", {}):
-                    prompt_tokens += calculate_prompt_tokens(
-                        json.dumps(message), kwargs.get("model")
-                    )
+                prompt_tokens, prompt_tokens_estimated = count_prompt_tokens(
+                    [json.dumps(message) for message in kwargs.get("message", {})],
+                    kwargs.get("model"),
+                    span,
+                )
                 return StreamWrapper(
-                    stream=result, span=span, prompt_tokens=prompt_tokens
+                    stream=result,
+                    span=span,
+                    prompt_tokens=prompt_tokens,
+                    prompt_tokens_estimated=prompt_tokens_estimated,
+                    vendor="vertexai",
                 )
             else:
                 set_response_attributes(span, result)
@@ -88,7 +95,14 @@ def set_response_attributes(span: Span, result):
         output_tokens = usage.candidates_token_count
 
         set_usage_attributes(
-            span, {"input_tokens": input_tokens, "output_tokens": output_tokens}
+            span,
+            {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cached_content_token_count": getattr(
+                    usage, "cached_content_token_count", None
+                ),
+            },
         )
 
     if hasattr(result, "_prediction_response"):
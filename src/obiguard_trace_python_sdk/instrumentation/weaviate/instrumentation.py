@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import importlib.metadata
 import logging
 from typing import Collection
 
@@ -27,6 +26,7 @@ from obiguard_trace_python_sdk.instrumentation.weaviate.patch import (
     generic_collection_patch,
     generic_query_patch,
 )
+from obiguard_trace_python_sdk.utils import get_package_version
 
 logging.basicConfig(level=logging.DEBUG)  # Set to DEBUG for detailed logging
 
@@ -42,7 +42,7 @@ class WeaviateInstrumentation(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         tracer = get_tracer(__name__, "", tracer_provider)
-        version = importlib.metadata.version("weaviate-client")
+        version = get_package_version("weaviate-client")
         try:
             for api_name, api_config in APIS.items():
                 if api_config.get("OPERATION") in ["query", "generate"]:
@@ -17,19 +17,19 @@ limitations under the License.
 import json
 from datetime import datetime
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import DatabaseSpanAttributes
 from opentelemetry import baggage, trace
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.propagation import set_span_in_context
 from opentelemetry.trace.status import Status, StatusCode
 
-from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
+from obiguard_trace_python_sdk.utils import get_sdk_version
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, SERVICE_PROVIDERS)
 from obiguard_trace_python_sdk.constants.instrumentation.weaviate import APIS
 from obiguard_trace_python_sdk.utils.llm import get_span_name
 from obiguard_trace_python_sdk.utils.misc import extract_input_params, to_iso_format
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
 
 # Predefined metadata response attributes
 METADATA_ATTRIBUTES = [
@@ -126,36 +126,42 @@ def get_response_object_attributes(response_object):
 def create_traced_method(method_name, version, tracer, get_collection_name=None):
     def traced_method(wrapped, instance, args, kwargs):
         api = APIS[method_name]
-        service_provider = SERVICE_PROVIDERS["WEAVIATE"]
-        extra_attributes = baggage.get_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY)
-
-        collection_name = (
-            get_collection_name(instance, kwargs)
-            if get_collection_name
-            else instance._name
-        )
-
-        span_attributes = {
-            "langtrace.sdk.name": "obiguard-trace-python-sdk",
-            "langtrace.service.name": service_provider,
-            "langtrace.service.type": "vectordb",
-            "langtrace.service.version": version,
-            "langtrace.version": v(LANGTRACE_SDK_NAME),
-            "db.system": "weaviate",
-            "db.operation": api["OPERATION"],
-            "db.collection.name": collection_name,
-            "db.query": json.dumps(extract_inputs(args, kwargs)),
-            **(extra_attributes if extra_attributes is not None else {}),
-        }
-
-        attributes = DatabaseSpanAttributes(**span_attributes)
-
-        with tracer.start_as_current_span(
+        span = tracer.start_span(
             name=get_span_name(method_name),
             kind=SpanKind.CLIENT,
             context=set_span_in_context(trace.get_current_span()),
-        ) as span:
-            for field, value in attributes.model_dump(by_alias=True).items():
+        )
+        if not span.is_recording():
+            with trace.use_span(span, end_on_exit=True):
+                return wrapped(*args, **kwargs)
+
+        with trace.use_span(span, end_on_exit=True):
+            service_provider = SERVICE_PROVIDERS["WEAVIATE"]
+            extra_attributes = baggage.get_baggage(
+                LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
+            )
+
+            collection_name = (
+                get_collection_name(instance, kwargs)
+                if get_collection_name
+                else instance._name
+            )
+
+            span_attributes = {
+                "langtrace.sdk.name": "obiguard-trace-python-sdk",
+                "langtrace.service.name": service_provider,
+                "langtrace.service.type": "vectordb",
+                "langtrace.service.version": version,
+                "langtrace.version": get_sdk_version(),
+                "db.system": "weaviate",
+                "db.operation": api["OPERATION"],
+                "db.collection.name": collection_name,
+                "db.query": json.dumps(extract_inputs(args, kwargs)),
+                **(extra_attributes if extra_attributes is not None else {}),
+            }
+
+            attributes = build_span_attributes(DatabaseSpanAttributes, span_attributes)
+            for field, value in attributes.items():
                 if value is not None:
                     span.set_attribute(field, value)
             try:
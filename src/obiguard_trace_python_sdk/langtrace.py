@@ -14,22 +14,16 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import importlib
 import logging
 import os
 import sys
+import threading
 import warnings
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-import sentry_sdk
 from colorama import Fore
 from opentelemetry import trace, baggage, context
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
-    OTLPSpanExporter as GRPCExporter,
-)
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
-    OTLPSpanExporter as HTTPExporter,
-)
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import (
@@ -38,51 +32,18 @@ from opentelemetry.sdk.trace.export import (
     SimpleSpanProcessor,
 )
 from opentelemetry.util.re import parse_env_headers
-from sentry_sdk.types import Event, Hint
+from wrapt import register_post_import_hook
 
 from .constants import LANGTRACE_SDK_NAME, SENTRY_DSN
 from .constants.exporter.langtrace_exporter import (
     LANGTRACE_REMOTE_URL,
     LANGTRACE_SESSION_ID_HEADER,
 )
-from .constants.instrumentation.common import LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY
-from .instrumentation import (
-    AgnoInstrumentation,
-    AnthropicInstrumentation,
-    AutogenInstrumentation,
-    AWSBedrockInstrumentation,
-    CerebrasInstrumentation,
-    ChromaInstrumentation,
-    CleanLabInstrumentation,
-    CohereInstrumentation,
-    CrewAIInstrumentation,
-    CrewaiToolsInstrumentation,
-    DspyInstrumentation,
-    EmbedchainInstrumentation,
-    GeminiInstrumentation,
-    GoogleGenaiInstrumentation,
-    GraphlitInstrumentation,
-    GroqInstrumentation,
-    LangchainCommunityInstrumentation,
-    LangchainCoreInstrumentation,
-    LangchainInstrumentation,
-    LanggraphInstrumentation,
-    LiteLLMInstrumentation,
-    LlamaindexInstrumentation,
-    MilvusInstrumentation,
-    MistralInstrumentation,
-    Neo4jInstrumentation,
-    Neo4jGraphRAGInstrumentation,
-    OllamaInstrumentor,
-    OpenAIAgentsInstrumentation,
-    OpenAIInstrumentation,
-    PhiDataInstrumentation,
-    PineconeInstrumentation,
-    PyMongoInstrumentation,
-    QdrantInstrumentation,
-    VertexAIInstrumentation,
-    WeaviateInstrumentation,
+from .constants.instrumentation.common import (
+    INSTRUMENTATION_MODULES,
+    LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY,
 )
+from .extensions.cost_exporter import CostSpanExporter
 from .types import DisableInstrumentations, InstrumentationMethods
 from .utils import (
     check_if_sdk_is_outdated,
@@ -91,7 +52,89 @@ from .utils import (
     validate_instrumentations,
 )
 from .utils.langtrace_sampler import LangtraceSampler
-
+from .utils.runtime_config import reload_config
+from .utils.token_accounting import TokenAccountingSpanProcessor
+
+if TYPE_CHECKING:
+    from sentry_sdk.types import Event, Hint
+
+# Resolved on first use through the module `__getattr__` (PEP 562): the gRPC
+# stack is only imported when OTEL_EXPORTER_OTLP_PROTOCOL selects it, and
+# sentry/SQLAlchemy only when they are actually needed.
+_LAZY_IMPORTS = {
+    "GRPCExporter": (
+        "opentelemetry.exporter.otlp.proto.grpc.trace_exporter",
+        "OTLPSpanExporter",
+    ),
+    "HTTPExporter": (
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter",
+        "OTLPSpanExporter",
+    ),
+    "SQLAlchemyInstrumentor": (
+        "opentelemetry.instrumentation.sqlalchemy",
+        "SQLAlchemyInstrumentor",
+    ),
+    "sentry_sdk": ("sentry_sdk", None),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    module = importlib.import_module(module_name)
+    value = getattr(module, attribute) if attribute else module
+    globals()[name] = value
+    return value
+
+
+# Instrumentor class of each vendor, imported and created by
+# `instrument_package` only for the vendors that are instrumented.
+INSTRUMENTATIONS = {
+    "openai": "OpenAIInstrumentation",
+    "groq": "GroqInstrumentation",
+    "pinecone": "PineconeInstrumentation",
+    "llama-index": "LlamaindexInstrumentation",
+    "chromadb": "ChromaInstrumentation",
+    "embedchain": "EmbedchainInstrumentation",
+    "qdrant-client": "QdrantInstrumentation",
+    "langchain": "LangchainInstrumentation",
+    "langchain-core": "LangchainCoreInstrumentation",
+    "langchain-community": "LangchainCommunityInstrumentation",
+    "langgraph": "LanggraphInstrumentation",
+    "litellm": "LiteLLMInstrumentation",
+    "anthropic": "AnthropicInstrumentation",
+    "cohere": "CohereInstrumentation",
+    "weaviate-client": "WeaviateInstrumentation",
+    "sqlalchemy": "SQLAlchemyInstrumentor",
+    "ollama": "OllamaInstrumentor",
+    "dspy": "DspyInstrumentation",
+    "crewai": "CrewAIInstrumentation",
+    "vertexai": "VertexAIInstrumentation",
+    "google-cloud-aiplatform": "VertexAIInstrumentation",
+    "google-generativeai": "GeminiInstrumentation",
+    "google-genai": "GoogleGenaiInstrumentation",
+    "graphlit-client": "GraphlitInstrumentation",
+    "phidata": "PhiDataInstrumentation",
+    "agno": "AgnoInstrumentation",
+    "mistralai": "MistralInstrumentation",
+    "neo4j": "Neo4jInstrumentation",
+    "neo4j-graphrag": "Neo4jGraphRAGInstrumentation",
+    "boto3": "AWSBedrockInstrumentation",
+    "autogen": "AutogenInstrumentation",
+    "pymongo": "PyMongoInstrumentation",
+    "cerebras-cloud-sdk": "CerebrasInstrumentation",
+    "pymilvus": "MilvusInstrumentation",
+    "crewai-tools": "CrewaiToolsInstrumentation",
+    "cleanlab-tlm": "CleanLabInstrumentation",
+    "openai-agents": "OpenAIAgentsInstrumentation",
+}
+
+
+PROJECT_LOOKUP_TIMEOUT = 5
+# Projects found per API key. Failed lookups are not cached, so a transient
+# error is retried on the next lookup.
+_project_cache: Dict[Optional[str], Dict[str, Any]] = {}
 
 
 class LangtraceConfig:
@@ -105,6 +148,13 @@ class LangtraceConfig:
         self.disable_tracing_for_functions = kwargs.get("disable_tracing_for_functions")
         self.service_name = kwargs.get("service_name")
         self.disable_logging = kwargs.get("disable_logging", False)
+        self.lazy_instrumentation = kwargs.get("lazy_instrumentation", False)
+        self.deferred_token_counting = (
+            kwargs.get("deferred_token_counting")
+            or os.environ.get("LANGTRACE_DEFERRED_TOKEN_COUNTING", "false").lower()
+            == "true"
+        )
+        self.track_costs = kwargs.get("track_costs", True)
         self.headers = (
             kwargs.get("headers")
             or os.environ.get("LANGTRACE_HEADERS")
@@ -182,43 +232,70 @@ def get_exporter(config: LangtraceConfig, host: str):
     exporter_protocol = os.environ.get("OTEL_EXPORTER_OTLP_PROTOCOL", "http")
     if "http" in exporter_protocol.lower():
         host = append_api_path(host)
-        return HTTPExporter(endpoint=host, headers=headers)
+        return __getattr__("HTTPExporter")(endpoint=host, headers=headers)
     else:
-        return GRPCExporter(endpoint=host, headers=headers)
+        return __getattr__("GRPCExporter")(endpoint=host, headers=headers)
 
 
 def add_span_processor(provider: TracerProvider, config: LangtraceConfig, exporter):
     if config.write_spans_to_console:
-        provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+        exporter = ConsoleSpanExporter()
+        processor = SimpleSpanProcessor(exporter)
         print(Fore.BLUE + "Writing spans to console" + Fore.RESET)
 
     elif config.custom_remote_exporter or get_host(config) != LANGTRACE_REMOTE_URL:
         processor = (
-            BatchSpanProcessor(exporter)
+            batch_span_processor(config, exporter)
             if config.batch
             else SimpleSpanProcessor(exporter)
         )
-        provider.add_span_processor(processor)
         print(
             Fore.BLUE
             + f"Exporting spans to custom host: {get_host(config)}.."
             + Fore.RESET
         )
     else:
-        provider.add_span_processor(BatchSpanProcessor(exporter))
-        project = get_project(config)
-        if project:
-            print(Fore.BLUE + f"Exporting spans to {project['name']}.." + Fore.RESET)
-            print(
-                Fore.BLUE
-                + f"Langtrace Project URL: {LANGTRACE_REMOTE_URL}/project/{project['id']}/traces"
-                + Fore.RESET
-            )
-        else:
-            print(Fore.BLUE + "Exporting spans to Langtrace cloud.." + Fore.RESET)
-
-
-def get_project(config: LangtraceConfig):
+        processor = batch_span_processor(config, exporter)
+        if not config.disable_logging:
+            # The project name is informational only; never hold up init() on it.
+            threading.Thread(
+                target=print_project,
+                args=(config,),
+                name="langtrace-project-lookup",
+                daemon=True,
+            ).start()
+
+    if config.deferred_token_counting:
+        # Token counts are set before the exporting processor sees the span.
+        processor = TokenAccountingSpanProcessor(processor)
+    provider.add_span_processor(processor)
+
+
+def batch_span_processor(config: LangtraceConfig, exporter):
+    # Costs are only computed on the export thread of a batch processor; a
+    # SimpleSpanProcessor would price each span in the instrumented call.
+    if config.track_costs:
+        exporter = CostSpanExporter(exporter)
+    return BatchSpanProcessor(exporter)
+
+
+def print_project(config: LangtraceConfig):
+    project = get_project(config)
+    if project:
+        print(Fore.BLUE + f"Exporting spans to {project['name']}.." + Fore.RESET)
+        print(
+            Fore.BLUE
+            + f"Langtrace Project URL: {LANGTRACE_REMOTE_URL}/project/{project['id']}/traces"
+            + Fore.RESET
+        )
+    else:
+        print(Fore.BLUE + "Exporting spans to Langtrace cloud.." + Fore.RESET)
+
+
+def get_project(config: LangtraceConfig, timeout: float = PROJECT_LOOKUP_TIMEOUT):
+    if config.api_key in _project_cache:
+        return _project_cache[config.api_key]
+
     import requests
 
     try:
@@ -226,14 +303,20 @@ def get_project(config: LangtraceConfig):
         response = requests.get(
             f"{LANGTRACE_REMOTE_URL}/api/project",
             headers={"x-api-key": config.api_key},
+            timeout=timeout,
         )
-        return response.json()["project"]
+        project = response.json()["project"]
     except Exception as error:
-        return None
+        project = None
+
+    if project:
+        _project_cache[config.api_key] = project
+    return project
 
 
 def init_sentry(config: LangtraceConfig, host: str):
     if os.environ.get("LANGTRACE_ERROR_REPORTING", "True") == "True":
+        sentry_sdk = __getattr__("sentry_sdk")
         sentry_sdk.init(
             dsn=SENTRY_DSN,
             traces_sample_rate=1.0,
@@ -270,9 +353,13 @@ def init(
     headers: Dict[str, str] = {},
     session_id: Optional[str] = None,
     baggage_attributes: Optional[Dict[str, str]] = None,
+    lazy_instrumentation: bool = False,
+    deferred_token_counting: bool = False,
+    track_costs: bool = True,
 ):
 
     check_if_sdk_is_outdated()
+    reload_config()
     config = LangtraceConfig(
         api_key=api_key,
         batch=batch,
@@ -285,6 +372,9 @@ def init(
         disable_logging=disable_logging,
         headers=headers,
         session_id=session_id,
+        lazy_instrumentation=lazy_instrumentation,
+        deferred_token_counting=deferred_token_counting,
+        track_costs=track_costs,
     )
 
     if config.disable_logging:
@@ -313,51 +403,16 @@ def init(
 
     # os.environ["LANGTRACE_API_HOST"] = host.replace("/api/trace", "")
     trace.set_tracer_provider(provider)
-    all_instrumentations = {
-        "openai": OpenAIInstrumentation(),
-        "groq": GroqInstrumentation(),
-        "pinecone": PineconeInstrumentation(),
-        "llama-index": LlamaindexInstrumentation(),
-        "chromadb": ChromaInstrumentation(),
-        "embedchain": EmbedchainInstrumentation(),
-        "qdrant-client": QdrantInstrumentation(),
-        "langchain": LangchainInstrumentation(),
-        "langchain-core": LangchainCoreInstrumentation(),
-        "langchain-community": LangchainCommunityInstrumentation(),
-        "langgraph": LanggraphInstrumentation(),
-        "litellm": LiteLLMInstrumentation(),
-        "anthropic": AnthropicInstrumentation(),
-        "cohere": CohereInstrumentation(),
-        "weaviate-client": WeaviateInstrumentation(),
-        "sqlalchemy": SQLAlchemyInstrumentor(),
-        "ollama": OllamaInstrumentor(),
-        "dspy": DspyInstrumentation(),
-        "crewai": CrewAIInstrumentation(),
-        "vertexai": VertexAIInstrumentation(),
-        "google-cloud-aiplatform": VertexAIInstrumentation(),
-        "google-generativeai": GeminiInstrumentation(),
-        "google-genai": GoogleGenaiInstrumentation(),
-        "graphlit-client": GraphlitInstrumentation(),
-        "phidata": PhiDataInstrumentation(),
-        "agno": AgnoInstrumentation(),
-        "mistralai": MistralInstrumentation(),
-        "neo4j": Neo4jInstrumentation(),
-        "neo4j-graphrag": Neo4jGraphRAGInstrumentation(),
-        "boto3": AWSBedrockInstrumentation(),
-        "autogen": AutogenInstrumentation(),
-        "pymongo": PyMongoInstrumentation(),
-        "cerebras-cloud-sdk": CerebrasInstrumentation(),
-        "pymilvus": MilvusInstrumentation(),
-        "crewai-tools": CrewaiToolsInstrumentation(),
-        "cleanlab-tlm": CleanLabInstrumentation(),
-        "openai-agents": OpenAIAgentsInstrumentation(),
-    }
 
     if baggage_attributes:
         new_ctx = baggage.set_baggage(LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, baggage_attributes)
         context.attach(new_ctx)
 
-    init_instrumentations(config.disable_instrumentations, all_instrumentations)
+    init_instrumentations(
+        config.disable_instrumentations,
+        INSTRUMENTATIONS,
+        lazy=config.lazy_instrumentation,
+    )
     add_span_processor(provider, config, exporter)
 
     if config.disable_logging:
@@ -365,7 +420,7 @@ def init(
     # init_sentry(config, host)
 
 
-def before_send(event: Event, hint: Hint):
+def before_send(event: "Event", hint: "Hint"):
     # Check if there's an exception and stacktrace in the event
     if "exception" in event:
         exception = event["exception"]["values"][0]
@@ -384,16 +439,10 @@ def before_send(event: Event, hint: Hint):
 def init_instrumentations(
     disable_instrumentations: Optional[DisableInstrumentations],
     all_instrumentations: dict,
+    lazy: bool = False,
 ):
     if disable_instrumentations is None:
-        for name, v in all_instrumentations.items():
-            if is_package_installed(name):
-                try:
-                    v.instrument()
-                    warnings.filterwarnings("ignore", category=DeprecationWarning)
-                    warnings.filterwarnings("ignore", category=UserWarning)
-                except Exception as e:
-                    print(f"Skipping {name} due to error while instrumenting: {e}")
+        filtered_dict = all_instrumentations
 
     else:
 
@@ -413,11 +462,50 @@ def init_instrumentations(
                 k: v for k, v in all_instrumentations.items() if k not in vendors
             }
 
-        for name, v in filtered_dict.items():
-            if is_package_installed(name):
-                try:
-                    v.instrument()
-                    warnings.filterwarnings("ignore", category=DeprecationWarning)
-                    warnings.filterwarnings("ignore", category=UserWarning)
-                except Exception as e:
-                    print(f"Skipping {name} due to error while instrumenting: {e}")
\ No newline at end of file
+    for name, v in filtered_dict.items():
+        if lazy and name in INSTRUMENTATION_MODULES:
+            defer_instrumentation(name, v)
+        elif is_package_installed(name):
+            instrument_package(name, v)
+
+
+def load_instrumentation(instrumentation):
+    """
+    The instrumentor of an `all_instrumentations` entry: either an instance,
+    or the name of its class, which is imported and created here.
+    """
+    if not isinstance(instrumentation, str):
+        return instrumentation
+    if instrumentation in _LAZY_IMPORTS:
+        return __getattr__(instrumentation)()
+    from . import instrumentation as instrumentations
+
+    return getattr(instrumentations, instrumentation)()
+
+
+def instrument_package(name: str, instrumentation):
+    try:
+        instrumentation = load_instrumentation(instrumentation)
+        if instrumentation.is_instrumented_by_opentelemetry:
+            return
+        instrumentation.instrument()
+        warnings.filterwarnings("ignore", category=DeprecationWarning)
+        warnings.filterwarnings("ignore", category=UserWarning)
+    except Exception as e:
+        print(f"Skipping {name} due to error while instrumenting: {e}")
+
+
+def defer_instrumentation(name: str, instrumentation):
+    """
+    Instrument `name` the first time one of its modules is imported.
+
+    wrapt's post-import hooks are served by a finder on ``sys.meta_path``, so
+    the vendor SDK is only loaded (and patched) if the application imports it.
+    Modules that are already imported are instrumented immediately.
+    """
+
+    def hook(module):
+        instrument_package(name, instrumentation)
+
+    for module_name in INSTRUMENTATION_MODULES[name]:
+        register_post_import_hook(hook, module_name)
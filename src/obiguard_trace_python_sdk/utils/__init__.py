@@ -1,4 +1,5 @@
 from ..types import NOT_GIVEN, InstrumentationType
+from .runtime_config import get_config
 from .sdk_version_checker import SDKVersionChecker
 from opentelemetry.trace import Span
 from opentelemetry.semconv.attributes import (
@@ -7,8 +8,14 @@ from opentelemetry.semconv.attributes import (
 from opentelemetry.trace.status import Status, StatusCode
 
 from langtrace.trace_attributes import SpanAttributes
+from functools import lru_cache
+from typing import Dict, Optional
+import importlib
+import importlib.metadata
 import inspect
 import os
+import re
+import threading
 
 
 def set_span_attribute(span: Span, name, value):
@@ -22,8 +29,7 @@ def set_span_attribute(span: Span, name, value):
 
 
 def set_event_prompt(span: Span, prompt):
-    enabled = os.environ.get("TRACE_PROMPT_COMPLETION_DATA", "true")
-    if enabled.lower() == "false":
+    if not get_config().trace_prompt_completion_data:
         return
 
     span.add_event(
@@ -48,11 +54,15 @@ def deduce_args_and_kwargs(func, *args, **kwargs):
 
 
 def check_if_sdk_is_outdated():
-    SDKVersionChecker().check()
+    if os.environ.get("LANGTRACE_SDK_VERSION_CHECK", "true").lower() == "false":
+        return
+    SDKVersionChecker().check_in_background()
     return
 
 
+@lru_cache(maxsize=None)
 def get_sdk_version():
+    # Looked up once: span attributes read this on every traced call.
     return SDKVersionChecker().get_sdk_version()
 
 
@@ -90,11 +100,58 @@ def validate_instrumentations(disable_instrumentations):
                 )
 
 
+_installed_distributions: Optional[Dict[str, str]] = None
+_installed_distributions_lock = threading.Lock()
+
+
+def _normalize_package_name(package_name: str) -> str:
+    return re.sub(r"[-_.]+", "-", package_name).lower()
+
+
+def get_installed_distributions() -> Dict[str, str]:
+    """
+    Map of normalized distribution name to version, built with a single scan
+    of the environment and reused until `invalidate_installed_distributions`.
+    """
+    global _installed_distributions
+
+    installed = _installed_distributions
+    if installed is None:
+        with _installed_distributions_lock:
+            if _installed_distributions is None:
+                index = {}
+                for dist in importlib.metadata.distributions():
+                    name = dist.metadata["Name"]
+                    if name:
+                        # First match on sys.path wins, like importlib.metadata.version
+                        index.setdefault(_normalize_package_name(name), dist.version)
+                _installed_distributions = index
+            installed = _installed_distributions
+    return installed
+
+
+def invalidate_installed_distributions():
+    """
+    Drop the cached distribution index, e.g. after a live `pip install`.
+    """
+    global _installed_distributions
+
+    importlib.invalidate_caches()
+    with _installed_distributions_lock:
+        _installed_distributions = None
+
+
 def is_package_installed(package_name):
-    import pkg_resources
+    return _normalize_package_name(package_name) in get_installed_distributions()
+
 
-    installed_packages = {p.key for p in pkg_resources.working_set}
-    return package_name in installed_packages
+def get_package_version(package_name) -> str:
+    version = get_installed_distributions().get(_normalize_package_name(package_name))
+    if version is None:
+        # Not in the index (installed after it was built, or missing): fall
+        # back to the direct lookup, which raises PackageNotFoundError.
+        return importlib.metadata.version(package_name)
+    return version
 
 
 def handle_span_error(span: Span, error):
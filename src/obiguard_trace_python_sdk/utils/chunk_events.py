@@ -0,0 +1,152 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+from time import perf_counter
+
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.trace import Span
+
+from ..constants.instrumentation.common import (
+    LLM_COMPLETION_CHUNK_COUNT,
+    LLM_COMPLETION_CHUNK_INDEX,
+    LLM_COMPLETION_CHUNKS,
+    LLM_COMPLETION_CHUNKS_CHARACTERS,
+    LLM_COMPLETION_CHUNKS_COUNT,
+    LLM_COMPLETION_CHUNKS_DROPPED,
+    LLM_COMPLETION_CHUNKS_EVENTS,
+)
+from .runtime_config import get_config
+
+# Values of `LANGTRACE_STREAM_CHUNK_EVENTS` that record chunk events; any
+# other value, "none" by default, records none.
+CHUNK_EVENT_MODES = ("chunk", "window", "aggregate")
+
+# Chunk or window events kept per stream. Chunks past the limit are only
+# counted in the summary event, so a span never holds more than
+# MAX_CHUNK_EVENTS + 1 chunk events whatever the length of the stream.
+MAX_CHUNK_EVENTS = 64
+
+
+class ChunkEvents:
+    """
+    Records the content chunks of a streamed completion as span events:
+
+    - "chunk": one `gen_ai.completion.chunk` event per chunk.
+    - "window": one `gen_ai.completion.chunk` event per window of
+      `stream_chunk_window` chunks or `stream_chunk_window_ms` milliseconds,
+      whichever fills first, holding the window's joined text.
+    - "aggregate": no per-chunk events.
+
+    Every mode ends with one `gen_ai.completion.chunks` summary event with
+    the number of chunks and characters streamed.
+    """
+
+    __slots__ = (
+        "span",
+        "mode",
+        "window",
+        "window_seconds",
+        "chunks",
+        "characters",
+        "events",
+        "dropped",
+        "_record_content",
+        "_pending",
+        "_pending_index",
+        "_window_start",
+    )
+
+    def __init__(self, span: Span, mode="window", window=64, window_ms=250):
+        self.span = span
+        self.mode = mode
+        self.window = window
+        self.window_seconds = window_ms / 1e3
+        self.chunks = 0
+        self.characters = 0
+        self.events = 0
+        self.dropped = 0
+        self._record_content = get_config().trace_prompt_completion_data
+        self._pending = []
+        self._pending_index = 0
+        self._window_start = 0.0
+
+    @classmethod
+    def for_span(cls, span: Span):
+        """
+        Chunk events for `span` in the configured mode, or None when chunk
+        events are off.
+        """
+        config = get_config()
+        if config.stream_chunk_events not in CHUNK_EVENT_MODES:
+            return None
+        return cls(
+            span,
+            config.stream_chunk_events,
+            config.stream_chunk_window,
+            config.stream_chunk_window_ms,
+        )
+
+    def add(self, text):
+        index = self.chunks
+        self.chunks += 1
+        self.characters += len(text)
+        if self.mode == "aggregate" or not self._record_content:
+            return
+        if self.events >= MAX_CHUNK_EVENTS:
+            self.dropped += 1
+            return
+        if self.mode == "chunk":
+            self._add_event(text, index, 1)
+            return
+        if not self._pending:
+            self._pending_index = index
+            self._window_start = perf_counter()
+        self._pending.append(text)
+        if (
+            len(self._pending) >= self.window
+            or perf_counter() - self._window_start >= self.window_seconds
+        ):
+            self._flush_window()
+
+    def end(self):
+        """Flush the open window and add the summary event."""
+        if self._pending:
+            self._flush_window()
+        self.span.add_event(
+            name=LLM_COMPLETION_CHUNKS,
+            attributes={
+                LLM_COMPLETION_CHUNKS_COUNT: self.chunks,
+                LLM_COMPLETION_CHUNKS_CHARACTERS: self.characters,
+                LLM_COMPLETION_CHUNKS_EVENTS: self.events,
+                LLM_COMPLETION_CHUNKS_DROPPED: self.dropped,
+            },
+        )
+
+    def _flush_window(self):
+        self._add_event("".join(self._pending), self._pending_index, len(self._pending))
+        self._pending = []
+
+    def _add_event(self, text, index, count):
+        self.events += 1
+        self.span.add_event(
+            name=SpanAttributes.LLM_CONTENT_COMPLETION_CHUNK,
+            attributes={
+                SpanAttributes.LLM_CONTENT_COMPLETION_CHUNK: json.dumps(text),
+                LLM_COMPLETION_CHUNK_INDEX: index,
+                LLM_COMPLETION_CHUNK_COUNT: count,
+            },
+        )
@@ -15,23 +15,37 @@ limitations under the License.
 """
 
 import json
-import os
-from typing import Any, Dict, Union
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Union
 
-from importlib_metadata import version as v
 from langtrace.trace_attributes import SpanAttributes
 from opentelemetry import baggage
 from opentelemetry.trace import Span
 from opentelemetry.trace.status import StatusCode
-from tiktoken import get_encoding, list_encoding_names
 
 from obiguard_trace_python_sdk.constants import LANGTRACE_SDK_NAME
 from obiguard_trace_python_sdk.constants.instrumentation.common import (
-    LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, TIKTOKEN_MODEL_MAPPING)
-from obiguard_trace_python_sdk.constants.instrumentation.openai import \
-    OPENAI_COST_TABLE
+    LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY, LLM_USAGE_TOKENS_ESTIMATED)
 from obiguard_trace_python_sdk.types import NOT_GIVEN
-from obiguard_trace_python_sdk.utils import set_span_attribute
+from obiguard_trace_python_sdk.utils import get_sdk_version, set_span_attribute
+from obiguard_trace_python_sdk.utils.chunk_events import ChunkEvents
+from obiguard_trace_python_sdk.utils.pricing import get_price_table
+from obiguard_trace_python_sdk.utils.prompt_cache import (
+    prompt_cache_usage,
+    record_prompt_cache_usage,
+)
+from obiguard_trace_python_sdk.utils.prompt_token_cache import prompt_token_cache
+from obiguard_trace_python_sdk.utils.runtime_config import get_config
+from obiguard_trace_python_sdk.utils.stream_capture import StreamCapture
+from obiguard_trace_python_sdk.utils.stream_timing import StreamTimer
+from obiguard_trace_python_sdk.utils.token_accounting import (
+    defer_token_count,
+    defers_token_counts,
+    discard_token_count,
+    update_token_count,
+)
+from obiguard_trace_python_sdk.utils.tokenizers import load_encoding, model_encoding
 
 
 def get_span_name(operation_name):
@@ -50,24 +64,70 @@ def estimate_tokens(prompt):
     return 0
 
 
-def set_event_completion_chunk(span: Span, chunk):
-    enabled = os.environ.get("TRACE_PROMPT_COMPLETION_DATA", "true")
-    if enabled.lower() == "false":
-        return
-    span.add_event(
-        name=SpanAttributes.LLM_CONTENT_COMPLETION_CHUNK,
-        attributes={
-            SpanAttributes.LLM_CONTENT_COMPLETION_CHUNK: json.dumps(chunk),
-        },
-    )
-
-
 def estimate_tokens_using_tiktoken(prompt, model):
     """
     Estimate the number of tokens in a prompt using tiktoken."""
-    encoding = get_encoding(model)
-    tokens = encoding.encode(prompt)
-    return len(tokens)
+    encoding = load_encoding(model)
+    if encoding is None:
+        return estimate_tokens(prompt)
+    return len(encoding.encode(prompt, disallowed_special=()))
+
+
+class IncrementalTokenCounter:
+    """
+    Counts the tokens of text that arrives in pieces, such as a streamed
+    completion. Pieces are encoded in batches as they arrive instead of all
+    at once at the end. Batches are cut at a single space between two
+    non-space characters, where the tokenizer's pre-split always breaks, so
+    the total equals the count of the joined text.
+    """
+
+    BATCH_SIZE = 2048
+
+    def __init__(self, encoding_name="cl100k_base"):
+        self.encoding = load_encoding(encoding_name)
+        if self.encoding is None:
+            raise ValueError(f"Encoding {encoding_name} is not available locally")
+        self.count = 0
+        self._pending = []
+        self._pending_size = 0
+        self._encode_at = self.BATCH_SIZE
+
+    def add(self, text):
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self._encode_at:
+            self._encode_pending(final=False)
+
+    def total(self):
+        if self._pending:
+            self._encode_pending(final=True)
+        return self.count
+
+    def _encode_pending(self, final):
+        text = "".join(self._pending)
+        rest = ""
+        if not final:
+            cut = _last_word_boundary(text)
+            if cut <= 0:
+                # No safe cut yet (e.g. text without spaces); retry a batch later.
+                self._pending = [text]
+                self._encode_at = self._pending_size + self.BATCH_SIZE
+                return
+            text, rest = text[:cut], text[cut:]
+        self.count += len(self.encoding.encode(text, disallowed_special=()))
+        self._pending = [rest] if rest else []
+        self._pending_size = len(rest)
+        self._encode_at = self.BATCH_SIZE
+
+
+def _last_word_boundary(text):
+    cut = text.rfind(" ", 0, len(text) - 1)
+    while cut > 0:
+        if not text[cut - 1].isspace() and not text[cut + 1].isspace():
+            return cut
+        cut = text.rfind(" ", 0, cut)
+    return -1
 
 
 def calculate_prompt_tokens(prompt_content, model):
@@ -75,22 +135,58 @@ def calculate_prompt_tokens(prompt_content, model):
     Calculate the number of tokens in a prompt. If the model is supported by tiktoken, use it for the estimation.
     """
     try:
-        tiktoken_model = TIKTOKEN_MODEL_MAPPING[model]
-        return estimate_tokens_using_tiktoken(prompt_content, tiktoken_model)
+        encoding_name, _ = model_encoding(model)
+        return estimate_tokens_using_tiktoken(prompt_content, encoding_name)
     except Exception:
         return estimate_tokens(prompt_content)  # Fallback method
 
 
-def calculate_price_from_usage(model, usage):
+def count_prompt_tokens(prompt_contents, model, span=None):
     """
-    Calculate the price of a model based on its usage."""
-    cost_table = OPENAI_COST_TABLE.get(model)
-    if cost_table:
-        return (
-            cost_table["input"] * usage["prompt_tokens"]
-            + cost_table["output"] * usage["completion_tokens"]
-        ) / 1000
-    return 0
+    Total tokens of a prompt made of several pieces, such as the serialized
+    messages of a chat request, and whether the total is an estimate because
+    the model's own tokenizer was not available. Counts of pieces seen before
+    come from the prompt token cache, so resending a conversation's history
+    is cheap.
+
+    When a token accounting processor handles `span`, the pieces are left to
+    it and the total is None.
+    """
+    if span is not None and defer_token_count(
+        span, model=model, prompt_contents=prompt_contents
+    ):
+        return None, False
+    encoding_name, exact = model_encoding(model)
+    if encoding_name is not None:
+        try:
+            counts = prompt_token_cache.count(prompt_contents, encoding_name)
+            return sum(counts), not exact
+        except Exception:
+            pass
+    return sum(estimate_tokens(content) for content in prompt_contents), True
+
+
+def calculate_prompt_tokens_batch(prompt_contents, model):
+    """Total tokens of a prompt made of several pieces; see `count_prompt_tokens`."""
+    return count_prompt_tokens(prompt_contents, model)[0]
+
+
+def calculate_price_from_usage(model, usage, provider="openai"):
+    """
+    Calculate the price of a model of `provider` based on its usage, at the
+    list prices of the current price table. `usage` may include
+    `cached_tokens`, the part of the prompt tokens served from the provider's
+    prompt cache."""
+    rates = get_price_table().rates(provider, model)
+    if rates is None:
+        return 0
+    input_rate, output_rate, cached_rate = rates
+    cached_tokens = usage.get("cached_tokens", 0)
+    return (
+        (usage["prompt_tokens"] - cached_tokens) * input_rate
+        + cached_tokens * cached_rate
+        + usage["completion_tokens"] * output_rate
+    ) / 1e6
 
 
 def convert_mistral_messages_to_serializable(mistral_messages):
@@ -232,15 +328,25 @@ def convert_gemini_messages_to_serializable(formatted_messages, system_message=N
     return serializable_messages
 
 
-def get_langtrace_attributes(version, service_provider, vendor_type="llm"):
-    return {
-        SpanAttributes.LANGTRACE_SDK_NAME: LANGTRACE_SDK_NAME,
-        SpanAttributes.LANGTRACE_VERSION: v(LANGTRACE_SDK_NAME),
-        SpanAttributes.LANGTRACE_SERVICE_VERSION: version,
-        SpanAttributes.LANGTRACE_SERVICE_NAME: service_provider,
-        SpanAttributes.LANGTRACE_SERVICE_TYPE: vendor_type,
-        SpanAttributes.LLM_SYSTEM: service_provider.lower(),
-    }
+@lru_cache(maxsize=256)
+def get_langtrace_attributes(
+    version, service_provider, vendor_type="llm"
+) -> Mapping[str, Any]:
+    """
+    Static attributes of an instrumentor's spans. They only depend on the
+    arguments, so the template is built once and shared read-only; merge it
+    with `{**get_langtrace_attributes(...), ...}`.
+    """
+    return MappingProxyType(
+        {
+            SpanAttributes.LANGTRACE_SDK_NAME: LANGTRACE_SDK_NAME,
+            SpanAttributes.LANGTRACE_VERSION: get_sdk_version(),
+            SpanAttributes.LANGTRACE_SERVICE_VERSION: version,
+            SpanAttributes.LANGTRACE_SERVICE_NAME: service_provider,
+            SpanAttributes.LANGTRACE_SERVICE_TYPE: vendor_type,
+            SpanAttributes.LLM_SYSTEM: service_provider.lower(),
+        }
+    )
 
 
 def get_llm_request_attributes(kwargs, prompts=None, model=None, operation_name="chat"):
@@ -343,6 +449,8 @@ def set_usage_attributes(span, usage):
 
     input_tokens = usage.get("input_tokens") or usage.get("prompt_tokens") or 0
     output_tokens = usage.get("output_tokens") or usage.get("completion_tokens") or 0
+    cache_read, cache_write, uncounted = prompt_cache_usage(usage)
+    input_tokens = int(input_tokens) + uncounted
 
     set_span_attribute(
         span,
@@ -367,6 +475,8 @@ def set_usage_attributes(span, usage):
             span, SpanAttributes.LLM_USAGE_SEARCH_UNITS, usage["search_units"]
         )
 
+    record_prompt_cache_usage(span, input_tokens, cache_read, cache_write)
+
 
 def get_tool_calls(item):
     if isinstance(item, dict):
@@ -381,8 +491,7 @@ def get_tool_calls(item):
 
 
 def set_event_completion(span: Span, result_content):
-    enabled = os.environ.get("TRACE_PROMPT_COMPLETION_DATA", "true")
-    if enabled.lower() == "false":
+    if not get_config().trace_prompt_completion_data:
         return
 
     span.add_event(
@@ -394,74 +503,201 @@ def set_event_completion(span: Span, result_content):
 
 
 def set_span_attributes(span: Span, attributes: Any) -> None:
-    from pydantic import BaseModel
+    attrs = attributes
+    if not isinstance(attributes, dict):
+        from pydantic import BaseModel
 
-    attrs = (
-        attributes.model_dump(by_alias=True)
-        if isinstance(attributes, BaseModel)
-        else attributes
-    )
+        if isinstance(attributes, BaseModel):
+            attrs = attributes.model_dump(by_alias=True)
 
     for field, value in attrs.items():
         set_span_attribute(span, field, value)
 
 
+# Event types that identify a stream's vendor from its first chunk.
+ANTHROPIC_STREAM_EVENTS = frozenset(
+    {
+        "message_start",
+        "content_block_start",
+        "content_block_delta",
+        "content_block_stop",
+        "message_delta",
+        "message_stop",
+        "ping",
+    }
+)
+COHERE_STREAM_EVENTS = frozenset(
+    {
+        "message-start",
+        "content-start",
+        "content-delta",
+        "content-end",
+        "tool-plan-delta",
+        "tool-call-start",
+        "tool-call-delta",
+        "tool-call-end",
+        "citation-start",
+        "citation-end",
+        "message-end",
+        "debug",
+    }
+)
+
+
+def detect_stream_vendor(chunk):
+    """
+    Guess which vendor produced a stream from its first chunk. Returns `None`
+    when the chunk is not recognised.
+    """
+    if isinstance(chunk, dict):
+        return "ollama"
+    data = getattr(chunk, "data", None)
+    if data is not None and getattr(data, "choices", None) is not None:
+        return "mistral"
+    if getattr(chunk, "choices", None) is not None:
+        if getattr(chunk, "x_groq", None) is not None:
+            return "groq"
+        return "openai"
+    chunk_type = getattr(chunk, "type", None)
+    if isinstance(chunk_type, str):
+        if chunk_type.startswith("response."):
+            return "openai_responses"
+        if chunk_type in ANTHROPIC_STREAM_EVENTS:
+            return "anthropic"
+        if chunk_type in COHERE_STREAM_EVENTS:
+            return "cohere"
+    if hasattr(chunk, "candidates") or hasattr(chunk, "usage_metadata"):
+        return "vertexai"
+    return None
+
+
 class StreamWrapper:
+    """
+    Records the completion and usage of a streamed LLM response as the caller
+    reads it. Each chunk is handled by the processor of its vendor, passed by
+    the instrumentor as `vendor` or detected from the first chunk; streams
+    that are not recognised fall back to probing every known chunk shape.
+    """
+
     span: Span
 
     def __init__(
-        self, stream, span, prompt_tokens=0, function_call=False, tool_calls=False
+        self,
+        stream,
+        span,
+        prompt_tokens=0,
+        function_call=False,
+        tool_calls=False,
+        vendor=None,
+        prompt_tokens_estimated=False,
     ):
         self.stream = stream
         self.span = span
         self.prompt_tokens = prompt_tokens
+        self.prompt_tokens_estimated = prompt_tokens_estimated
+        self._counted_prompt_tokens = prompt_tokens
         self.function_call = function_call
         self.tool_calls = tool_calls
-        self.result_content = []
+        self.result_content = StreamCapture()
         self.completion_tokens = 0
         self._span_started = False
         self._response_model = None
+        self._chunk_processor = self.CHUNK_PROCESSORS.get(vendor)
+        self._timer = StreamTimer.for_span(span)
+        self._token_counter = None
+        self._completion_tokens_estimated = False
+        self.cached_input_tokens = None
+        self.cache_creation_input_tokens = None
+        # A truncated capture cannot be counted later, so it is counted as it
+        # streams even when a token accounting processor is active.
+        self._defer_tokens = (
+            defers_token_counts(span) and get_config().stream_capture_limit is None
+        )
+        self._chunk_events = ChunkEvents.for_span(span)
         self.setup()
 
     def setup(self):
         if not self._span_started:
             self._span_started = True
 
+    def _encoding(self):
+        return model_encoding(self._response_model)
+
+    def _defer_usage(self):
+        """
+        Leave the usage the provider did not report to the token accounting
+        processor, which counts it from the completion text after the span
+        ends. Returns whether it did.
+        """
+        if self.prompt_tokens is not None and self.completion_tokens:
+            discard_token_count(self.span)
+            return False
+        fields = {
+            "prompt_tokens": self.prompt_tokens,
+            "prompt_tokens_estimated": self.prompt_tokens_estimated
+            and self.prompt_tokens == self._counted_prompt_tokens,
+            "completion_tokens": self.completion_tokens or None,
+            "completion_text": None
+            if self.completion_tokens
+            else self.result_content.text(),
+            "generation_seconds": self._timer.generation_time(),
+        }
+        if self._response_model:
+            fields["model"] = self._response_model
+        return defer_token_count(self.span, **fields)
+
+    def _read_cache_usage(self, usage):
+        """
+        Keep the prompt cache usage of a usage report. Returns the cached
+        input tokens the report leaves out of its input tokens.
+        """
+        cache_read, cache_write, uncounted = prompt_cache_usage(usage)
+        if cache_read is not None:
+            self.cached_input_tokens = cache_read
+        if cache_write is not None:
+            self.cache_creation_input_tokens = cache_write
+        return uncounted
+
     def cleanup(self):
-        if self.completion_tokens == 0:
-            response_model = "cl100k_base"
-            if self._response_model in list_encoding_names():
-                response_model = self._response_model
-            self.completion_tokens = estimate_tokens_using_tiktoken(
-                "".join(self.result_content), response_model
-            )
+        deferred = self._defer_tokens and self._defer_usage()
+        if self.prompt_tokens is None and not deferred:
+            self.prompt_tokens = 0
+        if self.completion_tokens == 0 and not deferred:
+            encoding_name, exact = self._encoding()
+            self._completion_tokens_estimated = not exact and bool(self.result_content)
+            if self._token_counter is not None:
+                self.completion_tokens = self._token_counter.total()
+            elif encoding_name is not None:
+                self.completion_tokens = estimate_tokens_using_tiktoken(
+                    self.result_content.text(), encoding_name
+                )
+            else:
+                self.completion_tokens = estimate_tokens(self.result_content.text())
         if self._span_started:
             set_span_attribute(
                 self.span,
                 SpanAttributes.LLM_RESPONSE_MODEL,
                 self._response_model,
             )
-            set_span_attribute(
+            if not deferred:
+                self._set_usage_attributes()
+                # A prompt left to the processor is counted with these.
+                update_token_count(self.span, completion_tokens=self.completion_tokens)
+            record_prompt_cache_usage(
                 self.span,
-                SpanAttributes.LLM_USAGE_PROMPT_TOKENS,
                 self.prompt_tokens,
+                self.cached_input_tokens,
+                self.cache_creation_input_tokens,
             )
-            set_span_attribute(
-                self.span,
-                SpanAttributes.LLM_USAGE_COMPLETION_TOKENS,
-                self.completion_tokens,
-            )
-            set_span_attribute(
-                self.span,
-                SpanAttributes.LLM_USAGE_TOTAL_TOKENS,
-                self.prompt_tokens + self.completion_tokens,
-            )
+            self._timer.record(self.span, None if deferred else self.completion_tokens)
+            if self._chunk_events is not None:
+                self._chunk_events.end()
             set_event_completion(
                 self.span,
                 [
                     {
                         "role": "assistant",
-                        "content": "".join(self.result_content),
+                        "content": self.result_content.text(),
                     }
                 ],
             )
@@ -596,10 +832,12 @@ class StreamWrapper:
             usage = chunk.response.usage
             self.completion_tokens = usage.output_tokens
             self.prompt_tokens = usage.input_tokens
+            self._read_cache_usage(usage)
         # Anthropic & OpenAI
         if hasattr(chunk, "type") and chunk.type == "message_start":
             if hasattr(chunk.message, "usage") and chunk.message.usage is not None:
-                self.prompt_tokens = chunk.message.usage.input_tokens
+                usage = chunk.message.usage
+                self.prompt_tokens = usage.input_tokens + self._read_cache_usage(usage)
 
         # CohereV2
         if hasattr(chunk, "type") and chunk.type == "message-end":
@@ -625,10 +863,19 @@ class StreamWrapper:
             if hasattr(chunk.usage, "completion_tokens"):
                 self.completion_tokens = chunk.usage.completion_tokens
 
+            self._read_cache_usage(chunk.usage)
+
+        # Groq
+        x_groq = getattr(chunk, "x_groq", None)
+        if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+            self.prompt_tokens = x_groq.usage.prompt_tokens
+            self.completion_tokens = x_groq.usage.completion_tokens
+
         # VertexAI
         if hasattr(chunk, "usage_metadata") and chunk.usage_metadata is not None:
             self.completion_tokens = chunk.usage_metadata.candidates_token_count
             self.prompt_tokens = chunk.usage_metadata.prompt_token_count
+            self._read_cache_usage(chunk.usage_metadata)
 
         # Ollama
         if isinstance(chunk, dict):
@@ -637,7 +884,7 @@ class StreamWrapper:
             if "eval_count" in chunk:
                 self.completion_tokens = chunk["eval_count"]
 
-    def process_chunk(self, chunk):
+    def process_generic_chunk(self, chunk):
         # Mistral nests the chunk data under a `data` attribute
         if (
             hasattr(chunk, "data")
@@ -650,3 +897,197 @@ class StreamWrapper:
         self.set_response_model(chunk=chunk)
         self.build_streaming_response(chunk=chunk)
         self.set_usage_attributes(chunk=chunk)
+
+    def process_openai_chunk(self, chunk):
+        if self._response_model is None:
+            self._response_model = getattr(chunk, "model", None)
+
+        content = None
+        for choice in chunk.choices or ():
+            delta = choice.delta
+            if not delta:
+                continue
+            if not self.function_call and not self.tool_calls:
+                if delta.content is not None:
+                    content = delta.content
+            elif self.function_call:
+                function_call = delta.function_call
+                if function_call is not None and function_call.arguments is not None:
+                    content = function_call.arguments
+            elif delta.tool_calls is not None:
+                content = None
+                for tool_call in delta.tool_calls:
+                    if (
+                        tool_call
+                        and tool_call.function is not None
+                        and tool_call.function.arguments is not None
+                    ):
+                        content = tool_call.function.arguments
+                        break
+        if content:
+            self.result_content.append(content)
+
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            self.prompt_tokens = getattr(usage, "prompt_tokens", self.prompt_tokens)
+            self.completion_tokens = getattr(
+                usage, "completion_tokens", self.completion_tokens
+            )
+            self._read_cache_usage(usage)
+
+    def process_mistral_chunk(self, chunk):
+        self.process_openai_chunk(chunk.data)
+
+    def process_groq_chunk(self, chunk):
+        self.process_openai_chunk(chunk)
+        # Groq reports usage under `x_groq` on the last chunk.
+        x_groq = chunk.x_groq
+        if x_groq is not None and x_groq.usage is not None:
+            self.prompt_tokens = x_groq.usage.prompt_tokens
+            self.completion_tokens = x_groq.usage.completion_tokens
+            self._read_cache_usage(x_groq.usage)
+
+    def process_openai_responses_chunk(self, chunk):
+        if chunk.type == "response.output_text.delta":
+            # The text is only collected from response.completed.
+            self._timer.content()
+        elif chunk.type == "response.completed":
+            response = chunk.response
+            if self._response_model is None:
+                self._response_model = getattr(response, "model", None)
+            self.result_content.append(response.output_text)
+            self.completion_tokens = response.usage.output_tokens
+            self.prompt_tokens = response.usage.input_tokens
+            self._read_cache_usage(response.usage)
+
+    def process_anthropic_chunk(self, chunk):
+        chunk_type = chunk.type
+        if chunk_type == "content_block_delta":
+            text = getattr(chunk.delta, "text", None)
+            if text is not None:
+                self.result_content.append(text)
+        elif chunk_type == "message_start":
+            message = chunk.message
+            if self._response_model is None:
+                self._response_model = message.model
+            if message.usage is not None:
+                # Anthropic leaves cache reads and writes out of input_tokens.
+                self.prompt_tokens = message.usage.input_tokens + (
+                    self._read_cache_usage(message.usage)
+                )
+        elif chunk_type == "message_delta" and chunk.usage is not None:
+            self.completion_tokens = chunk.usage.output_tokens
+
+    def process_cohere_chunk(self, chunk):
+        chunk_type = chunk.type
+        if chunk_type in ("content-start", "content-delta"):
+            message = getattr(chunk.delta, "message", None) if chunk.delta else None
+            content = getattr(message, "content", None) if message else None
+            text = getattr(content, "text", None) if content else None
+            if text is not None:
+                self.result_content.append(text)
+        elif chunk_type == "message-end":
+            usage = getattr(chunk.delta, "usage", None) if chunk.delta else None
+            billed_units = getattr(usage, "billed_units", None) if usage else None
+            if billed_units is not None:
+                self.completion_tokens = int(billed_units.output_tokens)
+                self.prompt_tokens = int(billed_units.input_tokens)
+
+    def process_vertexai_chunk(self, chunk):
+        text = getattr(chunk, "text", None)
+        if text is None:
+            for candidate in getattr(chunk, "candidates", None) or ():
+                if candidate.content is None:
+                    continue
+                for part in candidate.content.parts:
+                    if part.text is not None:
+                        text = part.text
+                        break
+                if text is not None:
+                    break
+        if text:
+            self.result_content.append(text)
+
+        usage = getattr(chunk, "usage_metadata", None)
+        if usage is not None:
+            self.completion_tokens = usage.candidates_token_count
+            self.prompt_tokens = usage.prompt_token_count
+            self._read_cache_usage(usage)
+
+    def process_ollama_chunk(self, chunk):
+        # Plain dicts before ollama 0.4, subscriptable models since.
+        if self._response_model is None:
+            self._response_model = chunk.get("model")
+        message = chunk.get("message")
+        if message and message.get("content") is not None:
+            self.result_content.append(message["content"])
+        if chunk.get("prompt_eval_count") is not None:
+            self.prompt_tokens = chunk["prompt_eval_count"]
+        if chunk.get("eval_count") is not None:
+            self.completion_tokens = chunk["eval_count"]
+
+    CHUNK_PROCESSORS = {
+        "generic": process_generic_chunk,
+        "openai": process_openai_chunk,
+        "groq": process_groq_chunk,
+        "openai_responses": process_openai_responses_chunk,
+        "mistral": process_mistral_chunk,
+        "anthropic": process_anthropic_chunk,
+        "cohere": process_cohere_chunk,
+        "vertexai": process_vertexai_chunk,
+        "ollama": process_ollama_chunk,
+    }
+
+    # Streams that may end without reporting usage. Their completion tokens
+    # are counted as the content arrives rather than all at once at the end.
+    COUNTED_PROCESSORS = (process_generic_chunk, process_openai_chunk)
+
+    def _set_usage_attributes(self):
+        set_span_attribute(
+            self.span,
+            SpanAttributes.LLM_USAGE_PROMPT_TOKENS,
+            self.prompt_tokens,
+        )
+        set_span_attribute(
+            self.span,
+            SpanAttributes.LLM_USAGE_COMPLETION_TOKENS,
+            self.completion_tokens,
+        )
+        set_span_attribute(
+            self.span,
+            SpanAttributes.LLM_USAGE_TOTAL_TOKENS,
+            self.prompt_tokens + self.completion_tokens,
+        )
+        # A provider that reported usage replaced the counted prompt tokens.
+        if self._completion_tokens_estimated or (
+            self.prompt_tokens_estimated
+            and self.prompt_tokens == self._counted_prompt_tokens
+        ):
+            set_span_attribute(self.span, LLM_USAGE_TOKENS_ESTIMATED, True)
+
+    def process_chunk(self, chunk):
+        self._timer.chunk()
+        if self._chunk_processor is None:
+            self._chunk_processor = self.CHUNK_PROCESSORS.get(
+                detect_stream_vendor(chunk), StreamWrapper.process_generic_chunk
+            )
+        # Chunk processors append at most one piece of content per chunk.
+        appended = self.result_content.appended
+        self._chunk_processor(self, chunk)
+        if self.result_content.appended != appended:
+            self._timer.content()
+            if (
+                self._chunk_processor in self.COUNTED_PROCESSORS
+                and not self._defer_tokens
+            ):
+                self.count_content(self.result_content.last)
+            if self._chunk_events is not None:
+                self._chunk_events.add(self.result_content.last)
+
+    def count_content(self, text):
+        if self._token_counter is None:
+            encoding_name, _ = self._encoding()
+            if encoding_name is None:
+                return
+            self._token_counter = IncrementalTokenCounter(encoding_name)
+        self._token_counter.add(text)
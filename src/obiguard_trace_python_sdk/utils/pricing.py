@@ -0,0 +1,249 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import re
+from array import array
+from functools import lru_cache
+
+from langtrace.trace_attributes import SpanAttributes
+
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    LLM_USAGE_CACHED_INPUT_TOKENS,
+    LLM_USAGE_COST,
+    LLM_USAGE_COST_PRICE_TABLE,
+)
+from obiguard_trace_python_sdk.constants.pricing import (
+    CURRENT_PRICE_TABLE,
+    PRICE_TABLE_ALIASES,
+    PRICE_TABLE_ROUTERS,
+    PRICE_TABLE_VENDOR_PREFIXED,
+    PRICE_TABLES,
+)
+from obiguard_trace_python_sdk.utils.runtime_config import get_config
+from obiguard_trace_python_sdk.utils.token_accounting import with_attributes
+
+# Batches at least this large are priced with NumPy when it is installed.
+# Below it, the fixed cost of the array operations outweighs the per-span
+# savings.
+VECTORIZE_MIN = 128
+
+# Characters that may follow a listed model name in a released model id:
+# `gpt-4o-2024-08-06`, `claude-3-5-sonnet@20240620`, `amazon.nova-pro-v1:0`.
+_SUFFIX_START = "-:@."
+
+# Cross-region inference profiles of Bedrock model ids: `us.anthropic...`.
+_BEDROCK_REGION = re.compile(r"^(us|eu|apac|us-gov)\.")
+
+MAX_CACHED_MODELS = 4096
+
+
+class PriceTable:
+    """
+    Token rates of one version of the price tables, looked up by the
+    provider (`gen_ai.system`) and model of a span. Models are only priced
+    from their provider's table, the table it is an alias of, or, on
+    Bedrock, the table of the model vendor; only routers such as LiteLLM
+    search every table. Self-hosted models (Ollama, vLLM) are not priced.
+    """
+
+    def __init__(self, prices, version=None):
+        self.version = version
+        self._models = {
+            provider: (models, sorted(models, key=len, reverse=True))
+            for provider, models in prices.items()
+        }
+        self._rates = {}
+
+    @classmethod
+    def load(cls, version=None):
+        """The table `version`, by default `LANGTRACE_PRICE_TABLE` or the latest."""
+        version = version or get_config().price_table or CURRENT_PRICE_TABLE
+        return cls(PRICE_TABLES[version], version)
+
+    def rates(self, provider, model):
+        """
+        `(input, output, cached input)` USD per million tokens of `model`, or
+        None when it is not priced. Cached input falls back to the input rate.
+        """
+        key = (provider, model)
+        try:
+            return self._rates[key]
+        except KeyError:
+            pass
+        rates = self._lookup(provider, model)
+        if len(self._rates) >= MAX_CACHED_MODELS:
+            self._rates.clear()
+        self._rates[key] = rates
+        return rates
+
+    def _lookup(self, provider, model):
+        if not model:
+            return None
+        model = model.lower()
+        provider = (provider or "").lower()
+        provider = PRICE_TABLE_ALIASES.get(provider, provider)
+        if provider in PRICE_TABLE_ROUTERS:
+            providers = list(self._models)
+        else:
+            providers = [provider] if provider in self._models else []
+            if provider in PRICE_TABLE_VENDOR_PREFIXED:
+                vendor = _vendor(model)
+                if vendor in self._models and vendor != provider:
+                    providers.append(vendor)
+        for name in _candidate_names(model):
+            for provider in providers:
+                rates = self._match(provider, name)
+                if rates is not None:
+                    input_rate, output_rate, cached_rate = rates
+                    if cached_rate is None:
+                        cached_rate = input_rate
+                    return (input_rate, output_rate, cached_rate)
+        return None
+
+    def _match(self, provider, name):
+        models, by_length = self._models[provider]
+        if name in models:
+            return models[name]
+        for model in by_length:
+            if name.startswith(model) and name[len(model)] in _SUFFIX_START:
+                return models[model]
+        return None
+
+
+_price_tables = {}
+
+
+def get_price_table(version=None):
+    """The shared `PriceTable` of `version`; see `PriceTable.load`."""
+    version = version or get_config().price_table or CURRENT_PRICE_TABLE
+    table = _price_tables.get(version)
+    if table is None:
+        table = _price_tables[version] = PriceTable.load(version)
+    return table
+
+
+def _candidate_names(model):
+    """The model id, then without its router or Bedrock vendor prefix."""
+    yield model
+    if "/" in model:
+        model = model.rsplit("/", 1)[-1]
+        yield model
+    if _BEDROCK_REGION.match(model):
+        model = _BEDROCK_REGION.sub("", model)
+        yield model
+    if "." in model.split("-", 1)[0]:
+        yield model.split(".", 1)[1]
+
+
+def _vendor(model):
+    """The vendor prefix of a Bedrock model id, such as `anthropic`."""
+    model = _BEDROCK_REGION.sub("", model)
+    if "." in model.split("-", 1)[0]:
+        return model.split(".", 1)[0]
+    return None
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    # Optional, and imported on first use by the exporter rather than at
+    # startup; without it costs are summed in Python.
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def batch_costs(input_tokens, output_tokens, cached_tokens, rate_index, rates):
+    """
+    Cost in USD of each span of a batch. The token counts are columns of
+    uncached input, output and cached input tokens (`array("d")`), and
+    `rate_index` (`array("q")`) selects each span's row of `rates`, the
+    `(input, output, cached input)` USD per million tokens.
+    """
+    np = _numpy() if len(rate_index) >= VECTORIZE_MIN else None
+    if np is not None:
+        matrix = np.asarray(rates, dtype=np.float64)
+        matrix = matrix[np.frombuffer(rate_index, dtype=np.int64)]
+        costs = (
+            np.frombuffer(input_tokens) * matrix[:, 0]
+            + np.frombuffer(output_tokens) * matrix[:, 1]
+            + np.frombuffer(cached_tokens) * matrix[:, 2]
+        ) / 1e6
+        return costs.tolist()
+    costs = []
+    for uncached, output, cached, index in zip(
+        input_tokens, output_tokens, cached_tokens, rate_index
+    ):
+        input_rate, output_rate, cached_rate = rates[index]
+        costs.append(
+            (uncached * input_rate + output * output_rate + cached * cached_rate) / 1e6
+        )
+    return costs
+
+
+def price_spans(spans, price_table):
+    """
+    `spans` with `gen_ai.usage.cost` set on the LLM spans whose model is in
+    `price_table`, priced together in one batch. Unpriced spans are returned
+    as they are.
+    """
+    rows = []
+    input_tokens = array("d")
+    output_tokens = array("d")
+    cached_tokens = array("d")
+    rate_index = array("q")
+    rates = {}
+    for index, span in enumerate(spans):
+        attributes = span.attributes
+        if not attributes or LLM_USAGE_COST in attributes:
+            continue
+        prompt = attributes.get(SpanAttributes.LLM_USAGE_PROMPT_TOKENS)
+        completion = attributes.get(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS)
+        if prompt is None and completion is None:
+            continue
+        span_rates = price_table.rates(
+            attributes.get(SpanAttributes.LLM_SYSTEM),
+            attributes.get(SpanAttributes.LLM_RESPONSE_MODEL)
+            or attributes.get(SpanAttributes.LLM_REQUEST_MODEL),
+        )
+        if span_rates is None:
+            continue
+        try:
+            # Cached input tokens are part of the input tokens.
+            cached = float(attributes.get(LLM_USAGE_CACHED_INPUT_TOKENS) or 0)
+            uncached = max(float(prompt or 0) - cached, 0.0)
+            output = float(completion or 0)
+        except (TypeError, ValueError):
+            continue
+        input_tokens.append(uncached)
+        output_tokens.append(output)
+        cached_tokens.append(cached)
+        rate_index.append(rates.setdefault(span_rates, len(rates)))
+        rows.append(index)
+    if not rows:
+        return spans
+
+    costs = batch_costs(
+        input_tokens, output_tokens, cached_tokens, rate_index, list(rates)
+    )
+    spans = list(spans)
+    for index, cost in zip(rows, costs):
+        spans[index] = with_attributes(
+            spans[index],
+            {LLM_USAGE_COST: cost, LLM_USAGE_COST_PRICE_TABLE: price_table.version},
+        )
+    return spans
@@ -0,0 +1,132 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from functools import lru_cache
+
+from opentelemetry import metrics
+from opentelemetry.trace import Span
+
+from ..constants.instrumentation.common import (
+    LLM_USAGE_CACHE_CREATION_INPUT_TOKENS,
+    LLM_USAGE_CACHED_INPUT_TOKENS,
+)
+from .stream_timing import METRIC_ATTRIBUTES
+
+# Where providers report the input tokens read from their prompt cache as
+# part of the input tokens: OpenAI (and the compatible xAI, Groq and Cerebras
+# APIs), the OpenAI Responses API, DeepSeek, Gemini and Vertex AI, and the
+# usage dicts instrumentors build themselves.
+CACHED_INPUT_FIELDS = (
+    ("prompt_tokens_details", "cached_tokens"),
+    ("input_tokens_details", "cached_tokens"),
+    ("prompt_cache_hit_tokens",),
+    ("cached_content_token_count",),
+    ("cached_tokens",),
+)
+
+
+@lru_cache(maxsize=None)
+def get_prompt_cache_instruments(meter_provider=None):
+    meter = metrics.get_meter(__name__, meter_provider=meter_provider)
+    return {
+        "hit_ratio": meter.create_histogram(
+            "gen_ai.client.prompt_cache.hit_ratio",
+            unit="1",
+            description="Share of the input tokens of a request read from the "
+            "provider's prompt cache",
+        ),
+        "input_tokens": meter.create_counter(
+            "gen_ai.client.prompt_cache.input_tokens",
+            unit="{token}",
+            description="Input tokens of requests to models with a prompt cache",
+        ),
+        "cached_input_tokens": meter.create_counter(
+            "gen_ai.client.prompt_cache.cached_input_tokens",
+            unit="{token}",
+            description="Input tokens read from the provider's prompt cache",
+        ),
+    }
+
+
+def _count(usage, *path):
+    value = usage
+    for name in path:
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            value = value.get(name)
+        else:
+            value = getattr(value, name, None)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return int(value)
+
+
+def prompt_cache_usage(usage):
+    """
+    `(cache_read, cache_write, uncounted)` input tokens of a provider's usage
+    report, a dict or a response object. `cache_read` and `cache_write` are
+    None when the report has no such field. Anthropic, and Bedrock, leave
+    both out of their `input_tokens`; `uncounted` is that part, which the
+    caller adds to the prompt tokens so that they are all the input tokens.
+    Reports in the OpenAI format count them in `prompt_tokens` already.
+    """
+    if usage is None:
+        return None, None, 0
+    cache_read = _count(usage, "cache_read_input_tokens")
+    cache_write = _count(usage, "cache_creation_input_tokens")
+    uncounted = 0
+    if _count(usage, "prompt_tokens") is None:
+        uncounted = (cache_read or 0) + (cache_write or 0)
+    if cache_read is None:
+        for path in CACHED_INPUT_FIELDS:
+            cache_read = _count(usage, *path)
+            if cache_read is not None:
+                break
+    return cache_read, cache_write, uncounted
+
+
+def record_prompt_cache_usage(span: Span, input_tokens, cache_read, cache_write=None):
+    """
+    Set the prompt cache usage attributes on `span` and record the cache hit
+    ratio of its model. Nothing is recorded for providers that did not report
+    cache usage. Instrumentors that set the usage of a span more than once
+    update its attributes, but its metrics are only recorded the first time.
+    """
+    if cache_read is None and cache_write is None:
+        return
+    span_attributes = getattr(span, "attributes", None) or {}
+    recorded = (
+        LLM_USAGE_CACHED_INPUT_TOKENS in span_attributes
+        or LLM_USAGE_CACHE_CREATION_INPUT_TOKENS in span_attributes
+    )
+    attributes = {}
+    if cache_read is not None:
+        attributes[LLM_USAGE_CACHED_INPUT_TOKENS] = cache_read
+    if cache_write is not None:
+        attributes[LLM_USAGE_CACHE_CREATION_INPUT_TOKENS] = cache_write
+    span.set_attributes(attributes)
+    if recorded or not input_tokens:
+        return
+
+    metric_attributes = {
+        key: span_attributes[key] for key in METRIC_ATTRIBUTES if key in span_attributes
+    }
+    cache_read = min(cache_read or 0, input_tokens)
+    instruments = get_prompt_cache_instruments()
+    instruments["hit_ratio"].record(cache_read / input_tokens, metric_attributes)
+    instruments["input_tokens"].add(input_tokens, metric_attributes)
+    instruments["cached_input_tokens"].add(cache_read, metric_attributes)
@@ -1,5 +1,4 @@
 import os
-import requests
 from urllib.parse import urlencode
 from typing import Optional, TypedDict, Dict, List
 
@@ -43,6 +42,8 @@ def get_prompt_from_registry(
     Raises:
         Exception: If the fetch operation fails or returns an error.
     """
+    import requests
+
     try:
         query_params = {"promptset_id": prompt_registry_id}
         if options:
@@ -0,0 +1,110 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import sys
+from collections import OrderedDict
+from threading import Lock
+
+from obiguard_trace_python_sdk.utils.tokenizers import load_encoding
+
+# Pieces tokenized together with `encode_batch`, which spreads them over
+# tiktoken's thread pool. Smaller batches, or a single CPU, are encoded one
+# by one since starting the pool costs more than it saves.
+ENCODE_BATCH_MIN = 8
+
+
+class PromptTokenCache:
+    """
+    Bounded LRU of the token counts of prompt pieces: serialized messages and
+    function schemas. A multi-turn conversation resends its whole history on
+    every request, so after the first turn only the new messages have to be
+    tokenized.
+
+    Entries are keyed by the encoding, the built-in hash of the piece and its
+    length rather than by the piece itself, so the cache holds no prompt text.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._counts = OrderedDict()
+        self._lock = Lock()
+
+    def count(self, pieces, encoding_name):
+        """Token count of each of `pieces` under the tiktoken `encoding_name`."""
+        counts = [0] * len(pieces)
+        keys = [(encoding_name, hash(piece), len(piece)) for piece in pieces]
+        missing = []
+        with self._lock:
+            for index, key in enumerate(keys):
+                cached = self._counts.get(key)
+                if cached is None:
+                    missing.append(index)
+                else:
+                    self._counts.move_to_end(key)
+                    counts[index] = cached
+            self.hits += len(pieces) - len(missing)
+            self.misses += len(missing)
+        if not missing:
+            return counts
+
+        for index, count in zip(
+            missing, self._encode(encoding_name, [pieces[i] for i in missing])
+        ):
+            counts[index] = count
+        with self._lock:
+            for index in missing:
+                self._counts[keys[index]] = counts[index]
+            while len(self._counts) > self.maxsize:
+                self._counts.popitem(last=False)
+        return counts
+
+    @staticmethod
+    def _encode(encoding_name, pieces):
+        encoding = load_encoding(encoding_name)
+        if len(pieces) >= ENCODE_BATCH_MIN and (os.cpu_count() or 1) > 1:
+            encoded = encoding.encode_batch(pieces, disallowed_special=())
+            return [len(tokens) for tokens in encoded]
+        return [len(encoding.encode(piece, disallowed_special=())) for piece in pieces]
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit rate and size of the cache, with its approximate memory use."""
+        with self._lock:
+            entries = list(self._counts.items())
+            hits, misses = self.hits, self.misses
+        memory = sys.getsizeof(self._counts) + sum(
+            sys.getsizeof(key) + sys.getsizeof(count) for key, count in entries
+        )
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(entries),
+            "maxsize": self.maxsize,
+            "memory_bytes": memory,
+        }
+
+
+prompt_token_cache = PromptTokenCache()
@@ -0,0 +1,99 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+from typing import Mapping, NamedTuple, Optional
+
+
+def _is_true(value: str) -> bool:
+    # For flags that are off by default: only "true" turns them on.
+    return value.lower() == "true"
+
+
+def _is_not_false(value: str) -> bool:
+    # For flags that are on by default: only "false" turns them off.
+    return value.lower() != "false"
+
+
+def _limit(value: Optional[str]) -> Optional[int]:
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return None
+    return limit if limit > 0 else None
+
+
+class RuntimeConfig(NamedTuple):
+    """
+    Settings read on every traced call or event. Built once from the
+    environment instead of looking each variable up per event; call
+    `reload_config()` after changing the environment at runtime.
+    """
+
+    trace_prompt_completion_data: bool = True
+    session_id: Optional[str] = None
+    validate_span_attributes: bool = False
+    stream_capture_limit: Optional[int] = None
+    stream_chunk_events: str = "none"
+    stream_chunk_window: int = 64
+    stream_chunk_window_ms: int = 250
+    tokenizer_cache_dir: Optional[str] = None
+    price_table: Optional[str] = None
+
+    @classmethod
+    def from_environ(cls, environ: Optional[Mapping[str, str]] = None):
+        environ = os.environ if environ is None else environ
+        return cls(
+            trace_prompt_completion_data=_is_not_false(
+                environ.get("TRACE_PROMPT_COMPLETION_DATA", "true")
+            ),
+            session_id=environ.get("LANGTRACE_SESSION_ID") or None,
+            validate_span_attributes=_is_true(
+                environ.get("LANGTRACE_VALIDATE_SPAN_ATTRIBUTES", "false")
+            ),
+            stream_capture_limit=_limit(environ.get("LANGTRACE_STREAM_CAPTURE_LIMIT")),
+            stream_chunk_events=environ.get(
+                "LANGTRACE_STREAM_CHUNK_EVENTS", "none"
+            ).lower(),
+            stream_chunk_window=_limit(environ.get("LANGTRACE_STREAM_CHUNK_WINDOW"))
+            or 64,
+            stream_chunk_window_ms=_limit(
+                environ.get("LANGTRACE_STREAM_CHUNK_WINDOW_MS")
+            )
+            or 250,
+            tokenizer_cache_dir=environ.get("LANGTRACE_TOKENIZER_CACHE_DIR") or None,
+            price_table=environ.get("LANGTRACE_PRICE_TABLE") or None,
+        )
+
+
+# Replaced as a whole, never mutated, so readers always see one consistent
+# snapshot without taking a lock.
+_config = RuntimeConfig.from_environ()
+
+
+def get_config() -> RuntimeConfig:
+    return _config
+
+
+def reload_config(**overrides) -> RuntimeConfig:
+    """
+    Rebuild the runtime config from the current environment and swap it in.
+    Keyword arguments override individual fields, e.g.
+    `reload_config(trace_prompt_completion_data=False)`.
+    """
+    global _config
+    _config = RuntimeConfig.from_environ()._replace(**overrides)
+    return _config
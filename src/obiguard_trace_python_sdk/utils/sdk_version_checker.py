@@ -1,38 +1,91 @@
 from importlib.metadata import version
+import json
+import os
+import sys
+import tempfile
+import threading
 import time
-import requests
 from colorama import Fore
 
+LATEST_RELEASE_URL = (
+    "https://api.github.com/repos/Scale3-Labs/langtrace-python-sdk/releases/latest"
+)
+VERSION_CHECK_TIMEOUT = 5
+
+
+def get_user_cache_dir():
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "obiguard_trace_python_sdk")
+
 
 class SDKVersionChecker:
     _cache: None
     _cache_duration: int
+    _cache_path: str
     _current_version: str
     _latest_version: str
 
-    def __init__(self):
+    def __init__(self, cache_path=None):
         self._cache = {"timestamp": 0, "latest_version": None}
         self._cache_duration = 3600  # Cache for 1 hour
+        self._cache_path = cache_path or os.path.join(
+            get_user_cache_dir(), "version_check.json"
+        )
         self._current_version = version("obiguard_trace_python_sdk")
+        self._latest_version = None
+
+    def _load_cache(self):
+        try:
+            with open(self._cache_path, "r") as f:
+                cached = json.load(f)
+            if isinstance(cached, dict) and "timestamp" in cached:
+                self._cache.update(cached)
+        except (OSError, ValueError):
+            pass
+
+    def _save_cache(self):
+        # Write to a temp file and rename so concurrent processes never read
+        # a partially written cache.
+        try:
+            directory = os.path.dirname(self._cache_path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._cache, f)
+            os.replace(tmp_path, self._cache_path)
+        except OSError:
+            pass
 
     def fetch_latest(self):
         try:
+            import requests
+
             current_time = time.time()
-            if (
-                current_time - self._cache["timestamp"] < self._cache_duration
-                and self._cache["latest_version"]
-            ):
-                return self._cache["latest_version"]
-
-            response = requests.get(
-                "https://api.github.com/repos/Scale3-Labs/langtrace-python-sdk/releases/latest",
-                timeout=20,
-            )
-            response.raise_for_status()
-            latest_version = response.json()["tag_name"]
-            self._cache.update(
-                {"timestamp": current_time, "latest_version": latest_version}
-            )
+            self._load_cache()
+            # Failed lookups are cached too, so offline hosts do not retry on
+            # every process start.
+            if current_time - self._cache["timestamp"] < self._cache_duration:
+                self._latest_version = self._cache["latest_version"]
+                return self._latest_version
+
+            latest_version = None
+            try:
+                response = requests.get(
+                    LATEST_RELEASE_URL,
+                    timeout=VERSION_CHECK_TIMEOUT,
+                )
+                response.raise_for_status()
+                latest_version = response.json()["tag_name"]
+            finally:
+                self._cache.update(
+                    {"timestamp": current_time, "latest_version": latest_version}
+                )
+                self._save_cache()
             self._latest_version = latest_version
             return latest_version
         except Exception as err:
@@ -54,3 +107,13 @@ class SDKVersionChecker:
                 + f"Warning: Your Langtrace SDK version {self._current_version} is outdated. Please upgrade to {self._latest_version}."
                 + Fore.RESET
             )
+
+    def check_in_background(self):
+        """
+        Run `check` on a daemon thread so callers never wait on the network.
+        """
+        thread = threading.Thread(
+            target=self.check, name="langtrace-version-check", daemon=True
+        )
+        thread.start()
+        return thread
@@ -0,0 +1,61 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Type
+
+from pydantic import BaseModel
+
+from .runtime_config import get_config
+
+
+@lru_cache(maxsize=None)
+def get_alias_table(model: Type[BaseModel]) -> Mapping[str, str]:
+    """
+    Map every field name and alias of `model` to the key it is exported under.
+    """
+    table = {}
+    for name, field in model.model_fields.items():
+        alias = field.alias or name
+        table[name] = alias
+        table[alias] = alias
+    return MappingProxyType(table)
+
+
+def build_span_attributes(
+    model: Type[BaseModel], attributes: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build the span attributes `model(**attributes).model_dump(by_alias=True)`
+    would produce, without the validate-then-serialize round trip. Unknown keys
+    are kept as is and `None` values are dropped, as `set_span_attribute` would
+    skip them anyway.
+
+    Set `LANGTRACE_VALIDATE_SPAN_ATTRIBUTES=true` to also validate the result
+    against `model`, raising `pydantic.ValidationError` on mismatches. This
+    costs more than the rest of the instrumentation combined, so it is only
+    meant for debugging.
+    """
+    aliases = get_alias_table(model)
+    built = {
+        aliases.get(key, key): value
+        for key, value in attributes.items()
+        if value is not None
+    }
+    if get_config().validate_span_attributes:
+        model.model_validate(built)
+    return built
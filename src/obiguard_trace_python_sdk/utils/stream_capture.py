@@ -0,0 +1,104 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import deque
+from typing import Optional
+
+from .runtime_config import get_config
+
+TRUNCATION_MARKER = "\n...[{} characters truncated]...\n"
+
+
+class StreamCapture:
+    """
+    Collects the text of a streamed completion for its span. Pieces are kept
+    in a list and joined once, when the stream ends.
+
+    With a `limit` (in characters, `LANGTRACE_STREAM_CAPTURE_LIMIT` by
+    default) only the first and last `limit // 2` characters are kept; the
+    middle is dropped as the stream is read and `text()` replaces it with a
+    truncation marker.
+    """
+
+    __slots__ = (
+        "appended",
+        "last",
+        "truncated",
+        "_head",
+        "_head_free",
+        "_tail",
+        "_tail_size",
+        "_tail_limit",
+    )
+
+    def __init__(self, limit: Optional[int] = None):
+        if limit is None:
+            limit = get_config().stream_capture_limit
+        self.appended = 0
+        self.last = None
+        self.truncated = 0
+        self._head = []
+        self._tail = deque()
+        self._tail_size = 0
+        if limit:
+            self._head_free = limit // 2
+            self._tail_limit = limit - limit // 2
+        else:
+            self._head_free = None
+            self._tail_limit = None
+
+    def __bool__(self):
+        return self.appended > 0
+
+    def append(self, text):
+        self.appended += 1
+        self.last = text
+        if self._head_free is None:
+            self._head.append(text)
+            return
+        if self._head_free:
+            head = text[: self._head_free]
+            self._head.append(head)
+            self._head_free -= len(head)
+            text = text[len(head) :]
+            if not text:
+                return
+        self._append_tail(text)
+
+    def _append_tail(self, text):
+        tail = self._tail
+        tail.append(text)
+        self._tail_size += len(text)
+        excess = self._tail_size - self._tail_limit
+        while excess > 0:
+            first = len(tail[0])
+            if first <= excess:
+                tail.popleft()
+            else:
+                tail[0] = tail[0][excess:]
+                first = excess
+            self._tail_size -= first
+            self.truncated += first
+            excess -= first
+
+    def text(self):
+        head = "".join(self._head)
+        if not self._tail:
+            return head
+        tail = "".join(self._tail)
+        if not self.truncated:
+            return head + tail
+        return head + TRUNCATION_MARKER.format(self.truncated) + tail
@@ -0,0 +1,204 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import time
+from array import array
+from functools import lru_cache
+from time import perf_counter
+
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry import metrics
+from opentelemetry.trace import Span
+
+from ..constants.instrumentation.common import (
+    LLM_INTER_CHUNK_GAP_MAX,
+    LLM_INTER_CHUNK_GAP_P50,
+    LLM_INTER_CHUNK_GAP_P99,
+    LLM_TIME_TO_FIRST_CHUNK,
+    LLM_TIME_TO_FIRST_TOKEN,
+    LLM_TOKENS_PER_SECOND,
+)
+
+# Inter-chunk gaps kept per stream. Longer streams overwrite the oldest gaps,
+# so percentiles cover the last MAX_GAP_SAMPLES chunks; the max is exact.
+MAX_GAP_SAMPLES = 1024
+
+# Span attributes copied onto the metric data points.
+METRIC_ATTRIBUTES = (SpanAttributes.LLM_SYSTEM, SpanAttributes.LLM_REQUEST_MODEL)
+
+
+@lru_cache(maxsize=None)
+def get_stream_instruments(meter_provider=None):
+    meter = metrics.get_meter(__name__, meter_provider=meter_provider)
+    return {
+        "time_to_first_chunk": meter.create_histogram(
+            "gen_ai.client.stream.time_to_first_chunk",
+            unit="s",
+            description="Time from sending a streaming request to its first chunk",
+        ),
+        "time_to_first_token": meter.create_histogram(
+            "gen_ai.client.stream.time_to_first_token",
+            unit="s",
+            description="Time from sending a streaming request to its first content",
+        ),
+        # One point per stream each, not one per chunk: recording every gap
+        # would cost a histogram update per chunk when the stream ends.
+        "inter_chunk_gap_p50": meter.create_histogram(
+            "gen_ai.client.stream.inter_chunk_gap.p50",
+            unit="s",
+            description="Median time between consecutive chunks of a stream",
+        ),
+        "inter_chunk_gap_p99": meter.create_histogram(
+            "gen_ai.client.stream.inter_chunk_gap.p99",
+            unit="s",
+            description="99th percentile time between consecutive chunks of a stream",
+        ),
+        "inter_chunk_gap_max": meter.create_histogram(
+            "gen_ai.client.stream.inter_chunk_gap.max",
+            unit="s",
+            description="Longest time between consecutive chunks of a stream",
+        ),
+        "tokens_per_second": meter.create_histogram(
+            "gen_ai.client.stream.tokens_per_second",
+            unit="{token}/s",
+            description="Output tokens per second after the first content",
+        ),
+    }
+
+
+def percentile(ordered, fraction):
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class StreamTimer:
+    """
+    Times a streamed response as the caller reads it. `chunk()` is called as
+    each chunk arrives and `content()` when that chunk carried output; both
+    only read the monotonic clock. `record()` turns the timings into span
+    attributes and metrics once the stream is done.
+    """
+
+    __slots__ = (
+        "start",
+        "first_chunk",
+        "first_content",
+        "last_chunk",
+        "chunks",
+        "max_gap",
+        "_gaps",
+    )
+
+    def __init__(self, start=None):
+        self.start = perf_counter() if start is None else start
+        self.first_chunk = None
+        self.first_content = None
+        self.last_chunk = None
+        self.chunks = 0
+        self.max_gap = 0.0
+        self._gaps = array("d", bytes(8 * MAX_GAP_SAMPLES))
+
+    @classmethod
+    def for_span(cls, span: Span):
+        """
+        Time from the start of `span`, which the instrumentors start right
+        before sending the request.
+        """
+        start_time = getattr(span, "start_time", None)
+        if not start_time:
+            return cls()
+        elapsed = max(time.time_ns() - start_time, 0) / 1e9
+        return cls(perf_counter() - elapsed)
+
+    def chunk(self):
+        now = perf_counter()
+        last = self.last_chunk
+        if last is None:
+            self.first_chunk = now
+        else:
+            gap = now - last
+            self._gaps[(self.chunks - 1) % MAX_GAP_SAMPLES] = gap
+            if gap > self.max_gap:
+                self.max_gap = gap
+        self.last_chunk = now
+        self.chunks += 1
+
+    def content(self):
+        if self.first_content is None:
+            self.first_content = self.last_chunk
+
+    def generation_time(self):
+        """Seconds from the first content to the last chunk, if any passed."""
+        if self.first_content is None or self.last_chunk <= self.first_content:
+            return None
+        return self.last_chunk - self.first_content
+
+    def gaps(self):
+        return self._gaps[: min(self.chunks - 1, MAX_GAP_SAMPLES)]
+
+    def attributes(self, output_tokens=None):
+        if self.first_chunk is None:
+            return {}
+        attributes = {LLM_TIME_TO_FIRST_CHUNK: self.first_chunk - self.start}
+        if self.first_content is not None:
+            attributes[LLM_TIME_TO_FIRST_TOKEN] = self.first_content - self.start
+            elapsed = self.generation_time()
+            if output_tokens and elapsed:
+                attributes[LLM_TOKENS_PER_SECOND] = output_tokens / elapsed
+        gaps = sorted(self.gaps())
+        if gaps:
+            attributes[LLM_INTER_CHUNK_GAP_P50] = percentile(gaps, 0.5)
+            attributes[LLM_INTER_CHUNK_GAP_P99] = percentile(gaps, 0.99)
+            attributes[LLM_INTER_CHUNK_GAP_MAX] = self.max_gap
+        return attributes
+
+    def record(self, span: Span, output_tokens=None):
+        """
+        Set the timing attributes on `span` and record the stream metrics.
+        Call once, before ending the span.
+        """
+        attributes = self.attributes(output_tokens)
+        if not attributes:
+            return
+        span.set_attributes(attributes)
+
+        span_attributes = getattr(span, "attributes", None) or {}
+        metric_attributes = {
+            key: span_attributes[key]
+            for key in METRIC_ATTRIBUTES
+            if key in span_attributes
+        }
+        instruments = get_stream_instruments()
+        instruments["time_to_first_chunk"].record(
+            attributes[LLM_TIME_TO_FIRST_CHUNK], metric_attributes
+        )
+        if LLM_TIME_TO_FIRST_TOKEN in attributes:
+            instruments["time_to_first_token"].record(
+                attributes[LLM_TIME_TO_FIRST_TOKEN], metric_attributes
+            )
+        if LLM_TOKENS_PER_SECOND in attributes:
+            instruments["tokens_per_second"].record(
+                attributes[LLM_TOKENS_PER_SECOND], metric_attributes
+            )
+        if LLM_INTER_CHUNK_GAP_MAX in attributes:
+            instruments["inter_chunk_gap_p50"].record(
+                attributes[LLM_INTER_CHUNK_GAP_P50], metric_attributes
+            )
+            instruments["inter_chunk_gap_p99"].record(
+                attributes[LLM_INTER_CHUNK_GAP_P99], metric_attributes
+            )
+            instruments["inter_chunk_gap_max"].record(
+                attributes[LLM_INTER_CHUNK_GAP_MAX], metric_attributes
+            )
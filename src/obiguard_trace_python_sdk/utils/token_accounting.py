@@ -0,0 +1,286 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Condition, Lock
+
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    LLM_TOKENS_PER_SECOND,
+    LLM_USAGE_TOKENS_ESTIMATED,
+)
+from obiguard_trace_python_sdk.utils.stream_timing import (
+    METRIC_ATTRIBUTES,
+    get_stream_instruments,
+)
+
+logger = logging.getLogger(__name__)
+
+# Spans whose token counts wait for the processor. Spans that are never
+# ended would keep their entry, so past this many new spans are counted
+# on the request path again.
+MAX_PENDING = 10000
+
+_pending = {}
+_pending_lock = Lock()
+_active_processors = 0
+
+
+class DeferredTokenCount:
+    """
+    What a span's token counts are computed from once it ends: the counts
+    the provider reported, or else the raw prompt pieces and completion text.
+    """
+
+    __slots__ = (
+        "model",
+        "prompt_contents",
+        "prompt_tokens",
+        "prompt_tokens_estimated",
+        "completion_text",
+        "completion_tokens",
+        "generation_seconds",
+    )
+
+    def __init__(self):
+        self.model = None
+        self.prompt_contents = None
+        self.prompt_tokens = None
+        self.prompt_tokens_estimated = False
+        self.completion_text = None
+        self.completion_tokens = None
+        self.generation_seconds = None
+
+
+def defers_token_counts(span):
+    """Whether the token counts of `span` can be left to the processor."""
+    return _active_processors > 0 and span.is_recording()
+
+
+def defer_token_count(span, **fields):
+    """
+    Record `fields` of the `DeferredTokenCount` of `span` for the processor
+    to count. Returns False, and records nothing, when no processor is
+    active or too many spans are pending; the caller then counts inline.
+    """
+    if not defers_token_counts(span):
+        return False
+    span_id = span.get_span_context().span_id
+    with _pending_lock:
+        deferred = _pending.get(span_id)
+        if deferred is None:
+            if len(_pending) >= MAX_PENDING:
+                return False
+            deferred = _pending[span_id] = DeferredTokenCount()
+        for name, value in fields.items():
+            setattr(deferred, name, value)
+    return True
+
+
+def update_token_count(span, **fields):
+    """
+    Record `fields` on the pending count of `span`, if it has one: counts
+    made inline for a span whose other counts were deferred.
+    """
+    if _active_processors == 0:
+        return
+    with _pending_lock:
+        deferred = _pending.get(span.get_span_context().span_id)
+        if deferred is not None:
+            for name, value in fields.items():
+                setattr(deferred, name, value)
+
+
+def discard_token_count(span):
+    with _pending_lock:
+        _pending.pop(span.get_span_context().span_id, None)
+
+
+def count_tokens(
+    model,
+    prompt_contents,
+    prompt_tokens,
+    prompt_tokens_estimated,
+    completion_text,
+    completion_tokens,
+):
+    """
+    Usage attributes of a deferred count: the prompt and completion tokens
+    that were deferred or reported, but not those of a side that was neither,
+    which the span already has. A module-level function of plain arguments,
+    so it also runs in a process pool.
+    """
+    # Imported here: utils.llm imports this module to defer its counts.
+    from obiguard_trace_python_sdk.utils.llm import (
+        count_prompt_tokens,
+        estimate_tokens,
+        estimate_tokens_using_tiktoken,
+    )
+    from obiguard_trace_python_sdk.utils.tokenizers import model_encoding
+
+    attributes = {}
+    estimated = False
+    if prompt_tokens is None and prompt_contents is not None:
+        prompt_tokens, prompt_tokens_estimated = count_prompt_tokens(
+            prompt_contents, model
+        )
+    if prompt_tokens is not None:
+        attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] = prompt_tokens
+        estimated |= prompt_tokens_estimated
+    if completion_tokens is None and completion_text is not None:
+        encoding_name, exact = model_encoding(model)
+        if encoding_name is not None:
+            completion_tokens = estimate_tokens_using_tiktoken(
+                completion_text, encoding_name
+            )
+        else:
+            completion_tokens = estimate_tokens(completion_text)
+        estimated |= bool(completion_text) and not exact
+    if completion_tokens is not None:
+        attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS] = completion_tokens
+    if estimated:
+        attributes[LLM_USAGE_TOKENS_ESTIMATED] = True
+    return attributes
+
+
+class TokenAccountingSpanProcessor(SpanProcessor):
+    """
+    Computes the token counts that instrumentors leave to it, off the
+    application's thread, and passes each span on to `span_processor` (the
+    exporting processor) once its counts are set. While one is active,
+    streams and prompts are not tokenized on the request path; only a
+    reference to their text is kept until the span ends.
+
+    Counting runs on `executor`, by default one worker thread. A
+    `ProcessPoolExecutor` moves it off the interpreter entirely.
+    """
+
+    def __init__(self, span_processor, executor=None):
+        global _active_processors
+        self._span_processor = span_processor
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="langtrace-token-accounting"
+        )
+        self._futures = set()
+        self._idle = Condition()
+        self._shutdown = False
+        with _pending_lock:
+            _active_processors += 1
+
+    def on_start(self, span, parent_context=None):
+        self._span_processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span):
+        with _pending_lock:
+            deferred = _pending.pop(span.context.span_id, None)
+        if deferred is None:
+            self._span_processor.on_end(span)
+            return
+        arguments = (
+            deferred.model,
+            deferred.prompt_contents,
+            deferred.prompt_tokens,
+            deferred.prompt_tokens_estimated,
+            deferred.completion_text,
+            deferred.completion_tokens,
+        )
+        try:
+            future = self._executor.submit(count_tokens, *arguments)
+        except RuntimeError:
+            # The executor is shut down; count on this thread instead.
+            self._export(span, deferred, count_tokens(*arguments))
+            return
+        with self._idle:
+            self._futures.add(future)
+        future.add_done_callback(partial(self._counted, span, deferred))
+
+    def _counted(self, span, deferred, future):
+        try:
+            attributes = future.result()
+        except Exception:
+            logger.exception("Failed to count the tokens of span %s", span.name)
+            attributes = {}
+        try:
+            self._export(span, deferred, attributes)
+        finally:
+            with self._idle:
+                self._futures.discard(future)
+                if not self._futures:
+                    self._idle.notify_all()
+
+    def _export(self, span, deferred, attributes):
+        if attributes:
+            # The total of the counted tokens and those already on the span.
+            attributes[SpanAttributes.LLM_USAGE_TOTAL_TOKENS] = sum(
+                attributes.get(key, (span.attributes or {}).get(key)) or 0
+                for key in (
+                    SpanAttributes.LLM_USAGE_PROMPT_TOKENS,
+                    SpanAttributes.LLM_USAGE_COMPLETION_TOKENS,
+                )
+            )
+        completion_tokens = attributes.get(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS)
+        if completion_tokens and deferred.generation_seconds:
+            tokens_per_second = completion_tokens / deferred.generation_seconds
+            attributes[LLM_TOKENS_PER_SECOND] = tokens_per_second
+            get_stream_instruments()["tokens_per_second"].record(
+                tokens_per_second,
+                {
+                    key: span.attributes[key]
+                    for key in METRIC_ATTRIBUTES
+                    if key in span.attributes
+                },
+            )
+        if attributes:
+            span = with_attributes(span, attributes)
+        self._span_processor.on_end(span)
+
+    def shutdown(self):
+        global _active_processors
+        if not self._shutdown:
+            self._shutdown = True
+            with _pending_lock:
+                _active_processors -= 1
+            self._executor.shutdown(wait=True)
+        self._span_processor.shutdown()
+
+    def force_flush(self, timeout_millis=30000):
+        with self._idle:
+            counted = self._idle.wait_for(
+                lambda: not self._futures, timeout=timeout_millis / 1e3
+            )
+        return counted and self._span_processor.force_flush(timeout_millis)
+
+
+def with_attributes(span, attributes):
+    """A copy of the ended `span` with `attributes` added."""
+    return ReadableSpan(
+        name=span.name,
+        context=span.context,
+        parent=span.parent,
+        resource=span.resource,
+        attributes={**(span.attributes or {}), **attributes},
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
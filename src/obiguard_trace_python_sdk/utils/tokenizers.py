@@ -0,0 +1,180 @@
+"""
+Copyright (c) 2024 Scale3 Labs
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
+from threading import Lock
+
+from tiktoken import get_encoding
+from tiktoken.load import read_file_cached
+
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    TIKTOKEN_MODEL_MAPPING,
+)
+from obiguard_trace_python_sdk.utils.runtime_config import get_config
+
+try:
+    from tiktoken.model import encoding_name_for_model
+except ImportError:  # tiktoken < 0.4
+    encoding_name_for_model = None
+
+# BPE file of each encoding. tiktoken caches it under the SHA-1 of its URL,
+# which is how a cached copy is found without fetching anything.
+BPE_FILES = {
+    "r50k_base": "https://openaipublic.blob.core.windows.net/encodings/r50k_base.tiktoken",
+    "p50k_base": "https://openaipublic.blob.core.windows.net/encodings/p50k_base.tiktoken",
+    "p50k_edit": "https://openaipublic.blob.core.windows.net/encodings/p50k_base.tiktoken",
+    "cl100k_base": "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+    "o200k_base": "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+}
+
+# Encodings of model families, for names tiktoken does not know (older
+# releases, provider prefixes). A family matches its own name and the names
+# that continue it with "-".
+MODEL_FAMILY_ENCODINGS = (
+    ("gpt-4o", "o200k_base"),
+    ("chatgpt-4o", "o200k_base"),
+    ("gpt-4.1", "o200k_base"),
+    ("gpt-4.5", "o200k_base"),
+    ("gpt-5", "o200k_base"),
+    ("o1", "o200k_base"),
+    ("o3", "o200k_base"),
+    ("o4", "o200k_base"),
+    ("gpt-4", "cl100k_base"),
+    ("gpt-3.5", "cl100k_base"),
+    ("gpt-35", "cl100k_base"),
+    ("text-embedding-3", "cl100k_base"),
+    ("text-embedding-ada-002", "cl100k_base"),
+)
+
+# Counts tokens, as an estimate, for models whose tokenizer is not known.
+FALLBACK_ENCODING = "cl100k_base"
+
+# Encodings downloaded by `preload_encodings` by default.
+PRELOAD_ENCODINGS = ("cl100k_base", "o200k_base")
+
+_encodings = {}
+_lock = Lock()
+
+
+@lru_cache(maxsize=256)
+def resolve_encoding(model):
+    """
+    Name of the tiktoken encoding of `model`, or None when it is not an
+    OpenAI model. Provider prefixes (`openai/gpt-4o`) and fine-tuned names
+    (`ft:gpt-4o-mini:org::id`) resolve to their base model.
+    """
+    if not model or not isinstance(model, str):
+        return None
+    name = model.rsplit("/", 1)[-1].lower()
+    if name.startswith("ft:"):
+        name = name.split(":")[1]
+    if name in TIKTOKEN_MODEL_MAPPING:
+        return TIKTOKEN_MODEL_MAPPING[name]
+    if encoding_name_for_model is not None:
+        try:
+            return encoding_name_for_model(name)
+        except KeyError:
+            pass
+    for family, encoding_name in MODEL_FAMILY_ENCODINGS:
+        if name == family or name.startswith(family + "-"):
+            return encoding_name
+    return None
+
+
+def tokenizer_cache_dir():
+    """
+    Directory the BPE files are read from: `LANGTRACE_TOKENIZER_CACHE_DIR`,
+    otherwise tiktoken's own cache directory.
+    """
+    configured = get_config().tokenizer_cache_dir
+    if configured:
+        return configured
+    for variable in ("TIKTOKEN_CACHE_DIR", "DATA_GYM_CACHE_DIR"):
+        if variable in os.environ:
+            return os.environ[variable]
+    return os.path.join(tempfile.gettempdir(), "data-gym-cache")
+
+
+def _cached_bpe_file(encoding_name, cache_dir):
+    url = BPE_FILES.get(encoding_name)
+    if url is None or not cache_dir:
+        return None
+    return os.path.join(cache_dir, hashlib.sha1(url.encode()).hexdigest())
+
+
+@contextmanager
+def _tiktoken_cache_dir(cache_dir):
+    previous = os.environ.get("TIKTOKEN_CACHE_DIR")
+    os.environ["TIKTOKEN_CACHE_DIR"] = cache_dir
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["TIKTOKEN_CACHE_DIR"]
+        else:
+            os.environ["TIKTOKEN_CACHE_DIR"] = previous
+
+
+def load_encoding(encoding_name):
+    """
+    The tiktoken encoding `encoding_name`, loaded once per process. Only BPE
+    files already in the cache directory are used, so tracing never fetches
+    anything over the network; returns None when the file is not there.
+    """
+    encoding = _encodings.get(encoding_name)
+    if encoding is not None:
+        return encoding
+    cache_dir = tokenizer_cache_dir()
+    path = _cached_bpe_file(encoding_name, cache_dir)
+    if path is None or not os.path.exists(path):
+        return None
+    with _lock:
+        if encoding_name not in _encodings:
+            with _tiktoken_cache_dir(cache_dir):
+                _encodings[encoding_name] = get_encoding(encoding_name)
+    return _encodings[encoding_name]
+
+
+def model_encoding(model):
+    """
+    Name of the encoding to count the tokens of `model` with, and whether it
+    is the model's own. Models without a locally available tokenizer are
+    counted with the fallback encoding, as an estimate. The name is None when
+    no encoding is available at all.
+    """
+    encoding_name = resolve_encoding(model)
+    if encoding_name is not None and load_encoding(encoding_name) is not None:
+        return encoding_name, True
+    if load_encoding(FALLBACK_ENCODING) is not None:
+        return FALLBACK_ENCODING, False
+    return None, False
+
+
+def preload_encodings(encoding_names=PRELOAD_ENCODINGS, cache_dir=None):
+    """
+    Download the BPE files of `encoding_names` into `cache_dir` (by default
+    the tokenizer cache directory). Meant for build or deploy time, e.g. a
+    Dockerfile step, so that traced processes find them locally.
+    """
+    cache_dir = cache_dir or tokenizer_cache_dir()
+    with _lock, _tiktoken_cache_dir(cache_dir):
+        for encoding_name in encoding_names:
+            read_file_cached(BPE_FILES[encoding_name])
+    return cache_dir
@@ -21,7 +21,6 @@ from deprecated import deprecated
 from functools import wraps
 from typing import Optional
 
-import requests
 from opentelemetry import baggage, context, trace
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.propagation import set_span_in_context
@@ -32,6 +31,7 @@ from ..constants.exporter.langtrace_exporter import (
 from ..constants.instrumentation.common import (
     LANGTRACE_ADDITIONAL_SPAN_ATTRIBUTES_KEY,
 )
+from ..utils.runtime_config import get_config
 from ..utils.types import (
     EvaluationAPIData,
     LangTraceApiError,
@@ -62,7 +62,7 @@ def with_langtrace_root_span(
                 trace_id = str(span.get_span_context().trace_id)
 
                 # Attach session ID if available
-                session_id = os.environ.get("LANGTRACE_SESSION_ID")
+                session_id = get_config().session_id
                 if session_id:
                     span.set_attribute("session.id", session_id)
 
@@ -89,7 +89,7 @@ def with_langtrace_root_span(
                 trace_id = span.get_span_context().trace_id
 
                 # Attach session ID if available
-                session_id = os.environ.get("LANGTRACE_SESSION_ID")
+                session_id = get_config().session_id
                 if session_id:
                     span.set_attribute("session.id", session_id)
 
@@ -166,6 +166,8 @@ class SendUserFeedback:
         self._langtrace_api_key = os.environ.get("LANGTRACE_API_KEY", None)
 
     def evaluate(self, data: EvaluationAPIData) -> None:
+        import requests
+
         try:
             if self._langtrace_api_key is None:
                 print(Fore.RED)
@@ -221,6 +223,8 @@ class SendUserFeedback:
             raise LangTraceApiError(str(err), 500)
 
     def get_evaluation(self, span_id: str) -> Optional[LangTraceEvaluation]:
+        import requests
+
         try:
             response = requests.get(
                 f"{self._langtrace_host}/api/evaluation",
@@ -0,0 +1,74 @@
+import io
+import json
+
+from botocore.response import StreamingBody
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from obiguard_trace_python_sdk.instrumentation.aws_bedrock.patch import handle_call
+from obiguard_trace_python_sdk.instrumentation.aws_bedrock.stream_body_wrapper import (
+    BufferedStreamBody,
+)
+
+PAYLOAD = json.dumps({"completion": "x" * 5000, "stop_reason": "stop"}).encode()
+
+
+def buffered_body(payload=PAYLOAD):
+    return BufferedStreamBody(io.BytesIO(payload), len(payload))
+
+
+def test_whole_read_returns_the_buffer_without_copying():
+    body = buffered_body()
+
+    data = body.read()
+
+    assert data == PAYLOAD
+    assert data is body._buffer
+    assert body.read() == b""
+
+
+def test_partial_reads_follow_the_cursor():
+    body = buffered_body()
+
+    assert b"".join(body.iter_chunks(chunk_size=333)) == PAYLOAD
+    assert body.read(10) == b""
+
+
+def test_readinto_copies_from_the_buffer():
+    body = buffered_body()
+    target = bytearray(4096)
+
+    parts = []
+    while count := body.readinto(target):
+        parts.append(bytes(target[:count]))
+
+    assert b"".join(parts) == PAYLOAD
+
+
+def test_json_is_parsed_once_and_keeps_the_cursor():
+    body = buffered_body()
+
+    parsed = body.json()
+
+    assert body.json() is parsed
+    assert json.loads(body.read()) == parsed
+
+
+def test_handle_call_leaves_the_body_readable():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    span = provider.get_tracer(__name__).start_span("bedrock")
+    kwargs = {
+        "modelId": "anthropic.claude-v2",
+        "body": json.dumps({"prompt": "Hi", "max_tokens_to_sample": 10}),
+    }
+    response = {"body": StreamingBody(io.BytesIO(PAYLOAD), len(PAYLOAD))}
+
+    handle_call(span, kwargs, response)
+    span.end()
+
+    assert json.loads(response["body"].read()) == json.loads(PAYLOAD)
+    (finished,) = exporter.get_finished_spans()
+    assert finished.attributes
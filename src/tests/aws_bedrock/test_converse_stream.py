@@ -0,0 +1,96 @@
+import json
+import threading
+
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    LLM_TIME_TO_FIRST_TOKEN,
+    LLM_TOKENS_PER_SECOND,
+)
+from obiguard_trace_python_sdk.instrumentation.aws_bedrock.patch import (
+    patch_converse_stream,
+)
+
+
+def get_tracer():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider.get_tracer(__name__), exporter
+
+
+def delta(text):
+    return {"contentBlockDelta": {"delta": {"text": text}, "contentBlockIndex": 0}}
+
+
+def model_stream(released):
+    yield {"messageStart": {"role": "assistant"}}
+    yield delta("Hello")
+    # The model keeps generating until the caller has seen the first token.
+    if not released.wait(timeout=2):
+        raise TimeoutError("the stream was drained before it was returned")
+    yield delta(" world")
+    yield {"messageStop": {"stopReason": "end_turn"}}
+    yield {"metadata": {"usage": {"inputTokens": 3, "outputTokens": 2}}}
+
+
+def completion_event(span):
+    (event,) = [e for e in span.events if e.name == SpanAttributes.LLM_CONTENT_COMPLETION]
+    return event
+
+
+def converse_stream(released, **kwargs):
+    return {"ResponseMetadata": {}, "stream": model_stream(released)}
+
+
+def test_first_event_arrives_before_the_model_finishes():
+    tracer, exporter = get_tracer()
+    released = threading.Event()
+    traced = patch_converse_stream(
+        lambda **kwargs: converse_stream(released, **kwargs), tracer, "1.0.0"
+    )
+
+    response = traced(
+        modelId="anthropic.claude-3-haiku",
+        messages=[{"role": "user", "content": [{"text": "hi"}]}],
+    )
+    events = iter(response["stream"])
+
+    assert next(events) == {"messageStart": {"role": "assistant"}}
+    assert next(events) == delta("Hello")
+    assert exporter.get_finished_spans() == ()
+
+    released.set()
+    assert len(list(events)) == 3
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes[LLM_TIME_TO_FIRST_TOKEN] > 0
+    assert span.attributes[LLM_TOKENS_PER_SECOND] > 0
+    assert span.attributes["gen_ai.usage.output_tokens"] == 2
+    assert json.loads(completion_event(span).attributes["gen_ai.completion"]) == [
+        {"role": "assistant", "content": "Hello world"}
+    ]
+
+
+def test_closing_the_stream_ends_the_span():
+    tracer, exporter = get_tracer()
+    released = threading.Event()
+    released.set()
+    traced = patch_converse_stream(
+        lambda **kwargs: converse_stream(released, **kwargs), tracer, "1.0.0"
+    )
+
+    response = traced(modelId="anthropic.claude-3-haiku", messages=[])
+    events = iter(response["stream"])
+    next(events)
+    next(events)
+    events.close()
+
+    (span,) = exporter.get_finished_spans()
+    assert LLM_TOKENS_PER_SECOND not in span.attributes
+    assert json.loads(completion_event(span).attributes["gen_ai.completion"]) == [
+        {"role": "assistant", "content": "Hello"}
+    ]
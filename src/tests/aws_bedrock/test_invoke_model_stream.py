@@ -0,0 +1,196 @@
+import json
+
+import pytest
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from obiguard_trace_python_sdk.instrumentation.aws_bedrock.patch import (
+    handle_streaming_call,
+)
+
+METRICS = {
+    "amazon-bedrock-invocationMetrics": {"inputTokenCount": 7, "outputTokenCount": 3}
+}
+
+
+def event(chunk):
+    return {"chunk": {"bytes": json.dumps(chunk).encode()}}
+
+
+STREAMS = {
+    "anthropic.claude-3-haiku": (
+        {"messages": [{"role": "user", "content": "Hi"}], "max_tokens": 10},
+        [
+            {
+                "type": "message_start",
+                "message": {
+                    "role": "assistant",
+                    "content": [],
+                    "usage": {"input_tokens": 7, "output_tokens": 1},
+                },
+            },
+            {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {"type": "text", "text": ""},
+            },
+            {"type": "content_block_delta", "index": 0, "delta": {"text": "Hello"}},
+            {"type": "content_block_delta", "index": 0, "delta": {"text": " there"}},
+            {"type": "content_block_stop", "index": 0},
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn"},
+                "usage": {"output_tokens": 3},
+            },
+            {"type": "message_stop", **METRICS},
+        ],
+    ),
+    "anthropic.claude-v2": (
+        {"prompt": "Human: Hi Assistant:", "max_tokens_to_sample": 10},
+        [
+            {"completion": "Hello", "stop_reason": None},
+            {"completion": " there", "stop_reason": "stop_sequence", **METRICS},
+        ],
+    ),
+    "amazon.titan-text-express-v1": (
+        {"inputText": "Hi"},
+        [
+            {
+                "outputText": "Hello",
+                "index": 0,
+                "inputTextTokenCount": 7,
+                "totalOutputTextTokenCount": None,
+                "completionReason": None,
+            },
+            {
+                "outputText": " there",
+                "index": 0,
+                "totalOutputTextTokenCount": 3,
+                "completionReason": "FINISH",
+                **METRICS,
+            },
+        ],
+    ),
+    "meta.llama3-8b-instruct-v1:0": (
+        {"prompt": "Hi"},
+        [
+            {
+                "generation": "Hello",
+                "prompt_token_count": 7,
+                "generation_token_count": 1,
+                "stop_reason": None,
+            },
+            {
+                "generation": " there",
+                "prompt_token_count": None,
+                "generation_token_count": 3,
+                "stop_reason": "stop",
+                **METRICS,
+            },
+        ],
+    ),
+    "cohere.command-r-v1:0": (
+        {"message": "Hi"},
+        [
+            {"event_type": "stream-start", "is_finished": False},
+            {"event_type": "text-generation", "text": "Hello", "is_finished": False},
+            {"event_type": "text-generation", "text": " there", "is_finished": False},
+            {
+                "event_type": "stream-end",
+                "is_finished": True,
+                "finish_reason": "COMPLETE",
+                **METRICS,
+            },
+        ],
+    ),
+}
+
+
+@pytest.mark.parametrize("model_id", sorted(STREAMS))
+def test_stream_is_rebuilt_into_one_completion(model_id):
+    request_body, chunks = STREAMS[model_id]
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    span = provider.get_tracer(__name__).start_span("bedrock")
+    response = {"body": [event(chunk) for chunk in chunks]}
+
+    kwargs = {"modelId": model_id, "body": json.dumps(request_body)}
+    handle_streaming_call(span, kwargs, response)
+    received = list(response["body"])
+
+    assert len(received) == len(chunks)
+    (finished,) = exporter.get_finished_spans()
+    (completion,) = [
+        event
+        for event in finished.events
+        if event.name == SpanAttributes.LLM_CONTENT_COMPLETION
+    ]
+    # Messages API completions are the content blocks themselves.
+    (message,) = json.loads(completion.attributes[SpanAttributes.LLM_COMPLETIONS])
+    assert message.get("content", message.get("text")) == "Hello there"
+    assert finished.attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] == 7
+    assert finished.attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS] == 3
+
+
+def test_stream_without_a_finish_marker_ends_when_exhausted():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    span = provider.get_tracer(__name__).start_span("bedrock")
+    response = {"body": [event({"generation": "Hello", "stop_reason": None})]}
+
+    handle_streaming_call(
+        span, {"modelId": "meta.llama3", "body": json.dumps({"prompt": "Hi"})}, response
+    )
+    assert exporter.get_finished_spans() == ()
+    list(response["body"])
+
+    assert len(exporter.get_finished_spans()) == 1
+
+
+def test_failed_stream_ends_the_span_with_the_error():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    span = provider.get_tracer(__name__).start_span("bedrock")
+
+    def failing_body():
+        yield event({"generation": "Hello", "stop_reason": None})
+        raise ConnectionError("stream reset")
+
+    response = {"body": failing_body()}
+    handle_streaming_call(
+        span, {"modelId": "meta.llama3", "body": json.dumps({"prompt": "Hi"})}, response
+    )
+    with pytest.raises(ConnectionError):
+        list(response["body"])
+
+    (finished,) = exporter.get_finished_spans()
+    assert finished.status.status_code == StatusCode.ERROR
+    assert [event.name for event in finished.events][0] == "exception"
+
+
+def test_abandoned_stream_ends_the_span():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    span = provider.get_tracer(__name__).start_span("bedrock")
+    response = {
+        "body": [
+            event({"generation": "Hello", "stop_reason": None}),
+            event({"generation": " there", "stop_reason": None}),
+        ]
+    }
+
+    handle_streaming_call(
+        span, {"modelId": "meta.llama3", "body": json.dumps({"prompt": "Hi"})}, response
+    )
+    events = iter(response["body"])
+    next(events)
+    events.close()
+
+    assert len(exporter.get_finished_spans()) == 1
@@ -0,0 +1,113 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from obiguard_trace_python_sdk.instrumentation.google_genai.patch import (
+    patch_google_genai_streaming,
+    patch_google_genai_streaming_async,
+)
+
+KWARGS = {"model": "gemini-2.0-flash", "contents": "Say hello"}
+
+
+def get_tracer():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider.get_tracer(__name__), exporter
+
+
+def chunk(text, finish_reason=None, usage=None):
+    return SimpleNamespace(
+        model_version="gemini-2.0-flash-001",
+        candidates=[
+            SimpleNamespace(
+                finish_reason=finish_reason,
+                content=SimpleNamespace(parts=[SimpleNamespace(text=text)]),
+            )
+        ],
+        usage_metadata=usage,
+    )
+
+
+CHUNKS = [
+    chunk("Hel"),
+    chunk(
+        "lo",
+        finish_reason="STOP",
+        usage=SimpleNamespace(prompt_token_count=3, candidates_token_count=2),
+    ),
+]
+
+
+def completion(span):
+    (event,) = [
+        e for e in span.events if e.name == SpanAttributes.LLM_CONTENT_COMPLETION
+    ]
+    return json.loads(event.attributes[SpanAttributes.LLM_COMPLETIONS])
+
+
+def assert_stream_recorded(span):
+    assert span.attributes[SpanAttributes.LLM_RESPONSE_MODEL] == "gemini-2.0-flash-001"
+    assert span.attributes[SpanAttributes.LLM_RESPONSE_FINISH_REASON] == "STOP"
+    assert span.attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS] == 2
+    assert completion(span) == [{"role": "assistant", "content": "Hello"}]
+
+
+def test_stream_is_returned_before_it_is_read():
+    tracer, exporter = get_tracer()
+    read = []
+
+    def generate_content_stream(**kwargs):
+        for c in CHUNKS:
+            read.append(c)
+            yield c
+
+    traced = patch_google_genai_streaming(tracer, "1.0.0")
+    stream = traced(generate_content_stream, None, (), KWARGS)
+
+    assert read == []
+    assert next(stream) is CHUNKS[0]
+    assert exporter.get_finished_spans() == ()
+    assert list(stream) == CHUNKS[1:]
+
+    (span,) = exporter.get_finished_spans()
+    assert_stream_recorded(span)
+
+
+def test_closing_the_stream_ends_the_span():
+    tracer, exporter = get_tracer()
+    traced = patch_google_genai_streaming(tracer, "1.0.0")
+    stream = traced(lambda **kwargs: iter(CHUNKS), None, (), KWARGS)
+
+    next(stream)
+    stream.close()
+
+    (span,) = exporter.get_finished_spans()
+    assert completion(span) == [{"role": "assistant", "content": "Hel"}]
+
+
+def test_async_stream_passes_chunks_through():
+    tracer, exporter = get_tracer()
+
+    async def chunks():
+        for c in CHUNKS:
+            yield c
+
+    async def generate_content_stream(**kwargs):
+        return chunks()
+
+    async def consume():
+        traced = patch_google_genai_streaming_async(tracer, "1.0.0")
+        stream = await traced(generate_content_stream, None, (), KWARGS)
+        return [c async for c in stream]
+
+    assert asyncio.run(consume()) == CHUNKS
+
+    (span,) = exporter.get_finished_spans()
+    assert_stream_recorded(span)
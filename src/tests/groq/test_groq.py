@@ -104,6 +104,9 @@ def test_chat_completion_streaming(exporter, groq_client):
     )
 
     assert_token_count(attributes)
+    # Usage comes from the `x_groq` field of the last chunk.
+    assert attributes.get(SpanAttributes.LLM_USAGE_PROMPT_TOKENS) == 20
+    assert attributes.get(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS) == 656
     assert_completion_in_events(groq_span.events)
 
 
@@ -139,4 +142,6 @@ async def test_async_chat_completion_streaming(async_groq_client, exporter):
     )
 
     assert_token_count(attributes)
+    assert attributes.get(SpanAttributes.LLM_USAGE_PROMPT_TOKENS) == 20
+    assert attributes.get(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS) == 585
     assert_completion_in_events(groq_span.events)
@@ -0,0 +1,99 @@
+import json
+
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry import trace
+
+from obiguard_trace_python_sdk import reload_config
+from obiguard_trace_python_sdk.bench.streaming import openai_stream
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    LLM_COMPLETION_CHUNK_COUNT,
+    LLM_COMPLETION_CHUNK_INDEX,
+    LLM_COMPLETION_CHUNKS,
+    LLM_COMPLETION_CHUNKS_COUNT,
+    LLM_COMPLETION_CHUNKS_DROPPED,
+    LLM_COMPLETION_CHUNKS_EVENTS,
+)
+from obiguard_trace_python_sdk.utils import chunk_events, runtime_config
+from obiguard_trace_python_sdk.utils.chunk_events import MAX_CHUNK_EVENTS, ChunkEvents
+from obiguard_trace_python_sdk.utils.llm import StreamWrapper
+
+
+def record(exporter, pieces, **kwargs):
+    with trace.get_tracer(__name__).start_as_current_span("stream") as span:
+        events = ChunkEvents(span, **kwargs)
+        for piece in pieces:
+            events.add(piece)
+        events.end()
+    (span,) = exporter.get_finished_spans()
+    chunks = [
+        event for event in span.events
+        if event.name == SpanAttributes.LLM_CONTENT_COMPLETION_CHUNK
+    ]
+    (summary,) = [event for event in span.events if event.name == LLM_COMPLETION_CHUNKS]
+    return chunks, summary.attributes
+
+
+def test_window_events_coalesce_chunks(exporter):
+    pieces = [str(i) for i in range(1000)]
+
+    chunks, summary = record(exporter, pieces, mode="window", window=64)
+
+    assert len(chunks) == 16
+    assert [event.attributes[LLM_COMPLETION_CHUNK_INDEX] for event in chunks] == list(
+        range(0, 1000, 64)
+    )
+    assert sum(event.attributes[LLM_COMPLETION_CHUNK_COUNT] for event in chunks) == 1000
+    text = "".join(
+        json.loads(event.attributes[SpanAttributes.LLM_CONTENT_COMPLETION_CHUNK])
+        for event in chunks
+    )
+    assert text == "".join(pieces)
+    assert summary[LLM_COMPLETION_CHUNKS_COUNT] == 1000
+    assert summary[LLM_COMPLETION_CHUNKS_EVENTS] == 16
+    assert summary[LLM_COMPLETION_CHUNKS_DROPPED] == 0
+
+
+def test_window_closes_after_its_time_span(exporter, monkeypatch):
+    now = iter(range(100))
+    monkeypatch.setattr(chunk_events, "perf_counter", lambda: next(now) * 0.1)
+
+    chunks, _ = record(exporter, ["a"] * 10, mode="window", window=64, window_ms=250)
+
+    # Each window is opened at one tick and checked on the following ones.
+    assert [event.attributes[LLM_COMPLETION_CHUNK_COUNT] for event in chunks] == [
+        3, 3, 3, 1,
+    ]
+
+
+def test_chunk_events_are_bounded(exporter):
+    chunks, summary = record(exporter, ["tok"] * 10000, mode="chunk")
+
+    assert len(chunks) == MAX_CHUNK_EVENTS
+    assert summary[LLM_COMPLETION_CHUNKS_COUNT] == 10000
+    assert summary[LLM_COMPLETION_CHUNKS_DROPPED] == 10000 - MAX_CHUNK_EVENTS
+
+
+def test_aggregate_mode_only_adds_the_summary(exporter):
+    chunks, summary = record(exporter, ["tok"] * 100, mode="aggregate")
+
+    assert chunks == []
+    assert summary[LLM_COMPLETION_CHUNKS_COUNT] == 100
+
+
+def test_stream_wrapper_follows_the_configured_mode(exporter, monkeypatch):
+    monkeypatch.setattr(runtime_config, "_config", runtime_config.get_config())
+    tracer = trace.get_tracer(__name__)
+
+    for mode in ["none", "window"]:
+        reload_config(stream_chunk_events=mode, stream_chunk_window=10)
+        span = tracer.start_span(mode)
+        for _ in StreamWrapper(iter(openai_stream(100)), span, vendor="openai"):
+            pass
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    names = [event.name for event in spans["none"].events]
+    assert SpanAttributes.LLM_CONTENT_COMPLETION_CHUNK not in names
+    assert LLM_COMPLETION_CHUNKS not in names
+    names = [event.name for event in spans["window"].events]
+    assert names.count(SpanAttributes.LLM_CONTENT_COMPLETION_CHUNK) == 10
+    assert names.count(LLM_COMPLETION_CHUNKS) == 1
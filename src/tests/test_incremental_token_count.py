@@ -0,0 +1,62 @@
+import random
+
+import pytest
+from opentelemetry.trace import INVALID_SPAN
+from tiktoken import get_encoding
+
+from obiguard_trace_python_sdk.bench.streaming import openai_chunk
+from obiguard_trace_python_sdk.utils import llm
+from obiguard_trace_python_sdk.utils.llm import IncrementalTokenCounter, StreamWrapper
+from obiguard_trace_python_sdk.utils.tokenizers import model_encoding
+
+PIECES = [
+    "Hello", " world", ",", " it's", "  two  spaces", "\n\n", "tabs\t", " 12345",
+    " 日本語", "のテキスト", " émoji 🎉", " don't", "'ll", " ", "x", " <|endoftext|>",
+]
+
+
+def random_text_pieces(seed, count):
+    rng = random.Random(seed)
+    return [rng.choice(PIECES) for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_count_matches_count_of_joined_text(seed):
+    pieces = random_text_pieces(seed, 3000)
+    counter = IncrementalTokenCounter()
+    for piece in pieces:
+        counter.add(piece)
+
+    expected = get_encoding("cl100k_base").encode(
+        "".join(pieces), disallowed_special=()
+    )
+    assert counter.total() == len(expected)
+
+
+def test_text_without_spaces_is_counted_at_the_end():
+    counter = IncrementalTokenCounter()
+    for _ in range(3000):
+        counter.add("日本語")
+
+    assert counter.count == 0
+    expected = get_encoding("cl100k_base").encode("日本語" * 3000)
+    assert counter.total() == len(expected)
+
+
+def test_stream_without_usage_is_not_tokenized_at_the_end(monkeypatch):
+    pieces = random_text_pieces(0, 3000)
+    chunks = [openai_chunk(piece) for piece in pieces]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("stream was tokenized at the end")
+
+    monkeypatch.setattr(llm, "estimate_tokens_using_tiktoken", fail)
+    wrapper = StreamWrapper(iter(chunks), INVALID_SPAN, vendor="openai")
+    for _ in wrapper:
+        pass
+
+    encoding_name, _ = model_encoding(chunks[0].model)
+    expected = get_encoding(encoding_name).encode(
+        "".join(pieces), disallowed_special=()
+    )
+    assert wrapper.completion_tokens == len(expected)
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def test_sdk_import_defers_heavy_modules():
+    code = (
+        "import sys, obiguard_trace_python_sdk\n"
+        "heavy = ['grpc', 'sentry_sdk', 'sqlalchemy', 'numpy', 'requests',"
+        " 'obiguard_trace_python_sdk.instrumentation.openai']\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_instrumentation_classes_resolve_lazily():
+    from obiguard_trace_python_sdk import instrumentation
+
+    assert instrumentation.OpenAIInstrumentation.__name__ == "OpenAIInstrumentation"
+    assert "OpenAIInstrumentation" in dir(instrumentation)
+
+
+INIT_CODE = """
+import contextlib, io, sys
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from obiguard_trace_python_sdk import langtrace
+from obiguard_trace_python_sdk.types import InstrumentationType
+
+with contextlib.redirect_stdout(io.StringIO()):
+    langtrace.init(custom_remote_exporter=InMemorySpanExporter(), batch=False, {})
+heavy = [
+    'sqlalchemy',
+    'opentelemetry.instrumentation.sqlalchemy',
+    'botocore',
+    'tiktoken',
+    'requests',
+    'obiguard_trace_python_sdk.instrumentation.openai',
+]
+print(','.join(m for m in heavy if m in sys.modules))
+"""
+
+
+@pytest.mark.parametrize(
+    "init_kwargs",
+    [
+        "lazy_instrumentation=True",
+        "disable_instrumentations={'all_except': [InstrumentationType.OPENAI]}",
+    ],
+)
+def test_init_only_loads_the_instrumentations_it_applies(init_kwargs):
+    # The update check imports requests on its own thread.
+    env = dict(os.environ, LANGTRACE_SDK_VERSION_CHECK="false")
+    result = subprocess.run(
+        [sys.executable, "-c", INIT_CODE.format(init_kwargs)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = result.stdout.strip().split(",")
+    assert "sqlalchemy" not in loaded
+    assert "opentelemetry.instrumentation.sqlalchemy" not in loaded
+    if init_kwargs.startswith("lazy"):
+        assert loaded == [""]
@@ -0,0 +1,45 @@
+import sys
+
+from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
+
+from obiguard_trace_python_sdk import langtrace
+
+
+class DummyInstrumentation(BaseInstrumentor):
+    calls = 0
+
+    def instrumentation_dependencies(self):
+        return []
+
+    def _instrument(self, **kwargs):
+        DummyInstrumentation.calls += 1
+
+    def _uninstrument(self, **kwargs):
+        pass
+
+
+def test_lazy_instrumentation_waits_for_import(tmp_path, monkeypatch):
+    (tmp_path / "lazy_vendor_sdk.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setitem(
+        langtrace.INSTRUMENTATION_MODULES, "lazy-vendor-sdk", ("lazy_vendor_sdk",)
+    )
+    instrumentation = DummyInstrumentation()
+
+    langtrace.init_instrumentations(
+        None, {"lazy-vendor-sdk": instrumentation}, lazy=True
+    )
+    assert DummyInstrumentation.calls == 0
+    assert "lazy_vendor_sdk" not in sys.modules
+
+    import lazy_vendor_sdk  # noqa: F401
+
+    assert DummyInstrumentation.calls == 1
+    assert instrumentation.is_instrumented_by_opentelemetry
+
+    # A repeated import must not instrument again.
+    import lazy_vendor_sdk  # noqa: F401,F811
+
+    assert DummyInstrumentation.calls == 1
+    instrumentation.uninstrument()
+    sys.modules.pop("lazy_vendor_sdk", None)
@@ -0,0 +1,39 @@
+import importlib.metadata
+
+import pytest
+
+from obiguard_trace_python_sdk import utils
+from obiguard_trace_python_sdk.utils import (
+    get_package_version,
+    invalidate_installed_distributions,
+    is_package_installed,
+)
+
+
+def test_installed_distributions_are_scanned_once(monkeypatch):
+    invalidate_installed_distributions()
+    scans = []
+    distributions = importlib.metadata.distributions
+
+    def counting_distributions():
+        scans.append(1)
+        return distributions()
+
+    monkeypatch.setattr(utils.importlib.metadata, "distributions", counting_distributions)
+
+    assert is_package_installed("opentelemetry-sdk")
+    assert is_package_installed("OpenTelemetry_SDK")
+    assert not is_package_installed("surely-not-an-installed-package")
+    assert get_package_version("opentelemetry-sdk") == importlib.metadata.version(
+        "opentelemetry-sdk"
+    )
+    assert len(scans) == 1
+
+    invalidate_installed_distributions()
+    is_package_installed("opentelemetry-sdk")
+    assert len(scans) == 2
+
+
+def test_get_package_version_missing_package():
+    with pytest.raises(importlib.metadata.PackageNotFoundError):
+        get_package_version("surely-not-an-installed-package")
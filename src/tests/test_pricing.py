@@ -0,0 +1,112 @@
+import pytest
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from obiguard_trace_python_sdk import reload_config
+from obiguard_trace_python_sdk.bench.pricing import llm_spans
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    LLM_USAGE_CACHED_INPUT_TOKENS,
+    LLM_USAGE_COST,
+    LLM_USAGE_COST_PRICE_TABLE,
+)
+from obiguard_trace_python_sdk.constants.pricing import CURRENT_PRICE_TABLE
+from obiguard_trace_python_sdk.extensions.cost_exporter import CostSpanExporter
+from obiguard_trace_python_sdk.utils import pricing, runtime_config
+from obiguard_trace_python_sdk.utils.llm import calculate_price_from_usage
+from obiguard_trace_python_sdk.utils.pricing import (
+    PriceTable,
+    get_price_table,
+    price_spans,
+)
+
+
+@pytest.mark.parametrize(
+    "provider, model, rates",
+    [
+        ("openai", "gpt-4o-2024-08-06", (2.5, 10.0, 1.25)),
+        ("openai", "gpt-4o-2024-05-13", (5.0, 15.0, 5.0)),
+        ("openai", "gpt-4o-mini", (0.15, 0.6, 0.075)),
+        ("azure", "gpt-4o", (2.5, 10.0, 1.25)),
+        ("anthropic", "claude-3-5-sonnet-20241022", (3.0, 15.0, 0.3)),
+        ("litellm", "anthropic/claude-3-5-sonnet-20241022", (3.0, 15.0, 0.3)),
+        (
+            "aws bedrock",
+            "us.anthropic.claude-3-5-haiku-20241022-v1:0",
+            (0.8, 4.0, 0.08),
+        ),
+        ("aws bedrock", "amazon.nova-pro-v1:0", (0.8, 3.2, 0.2)),
+        ("vertex ai", "gemini-2.0-flash-001", (0.1, 0.4, 0.025)),
+        ("aws bedrock", "meta.llama3-8b-instruct-v1:0", (0.3, 0.6, 0.3)),
+        ("aws bedrock", "us.meta.llama3-2-90b-instruct-v1:0", None),
+        ("ollama", "mistral-large", None),
+        ("ollama", "gpt-4o", None),
+        ("vllm", "llama-3.3-70b-versatile", None),
+        (None, "gpt-4o", None),
+        ("openai", "claude-3-5-sonnet-20241022", None),
+        ("openai", "gpt-4oz", None),
+        ("openai", "unknown-model", None),
+        ("openai", None, None),
+    ],
+)
+def test_models_resolve_to_the_rates_of_their_family(provider, model, rates):
+    assert PriceTable.load(CURRENT_PRICE_TABLE).rates(provider, model) == rates
+
+
+def test_vectorized_costs_match_the_python_fallback(monkeypatch):
+    if pricing._numpy() is None:
+        pytest.skip("numpy is not installed")
+    spans = llm_spans(256)
+    price_table = get_price_table(CURRENT_PRICE_TABLE)
+
+    vectorized = price_spans(spans, price_table)
+    monkeypatch.setattr(pricing, "VECTORIZE_MIN", len(spans) + 1)
+    python = price_spans(spans, price_table)
+
+    assert [span.attributes[LLM_USAGE_COST] for span in vectorized] == pytest.approx(
+        [span.attributes[LLM_USAGE_COST] for span in python]
+    )
+
+
+@pytest.fixture
+def cost_exporter():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(
+        SimpleSpanProcessor(
+            CostSpanExporter(exporter, get_price_table(CURRENT_PRICE_TABLE))
+        )
+    )
+    return provider.get_tracer(__name__), exporter
+
+
+def test_exported_spans_are_priced(cost_exporter):
+    tracer, exporter = cost_exporter
+    with tracer.start_as_current_span("chat") as span:
+        span.set_attribute(SpanAttributes.LLM_SYSTEM, "openai")
+        span.set_attribute(SpanAttributes.LLM_RESPONSE_MODEL, "gpt-4o-2024-08-06")
+        span.set_attribute(SpanAttributes.LLM_USAGE_PROMPT_TOKENS, 1000)
+        span.set_attribute(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS, 100)
+        span.set_attribute(LLM_USAGE_CACHED_INPUT_TOKENS, 600)
+    with tracer.start_as_current_span("retrieve"):
+        pass
+
+    chat, retrieve = exporter.get_finished_spans()
+
+    assert chat.attributes[LLM_USAGE_COST] == pytest.approx(
+        (400 * 2.5 + 600 * 1.25 + 100 * 10.0) / 1e6
+    )
+    assert chat.attributes[LLM_USAGE_COST_PRICE_TABLE] == CURRENT_PRICE_TABLE
+    assert LLM_USAGE_COST not in retrieve.attributes
+
+
+def test_usage_is_priced_from_the_configured_table(monkeypatch):
+    monkeypatch.setattr(runtime_config, "_config", runtime_config.get_config())
+    usage = {"prompt_tokens": 1000, "completion_tokens": 1000}
+
+    reload_config(price_table="2024-03-01")
+
+    assert calculate_price_from_usage("gpt-4", usage) == pytest.approx(0.09)
+    assert get_price_table().version == "2024-03-01"
+    assert calculate_price_from_usage("unknown-model", usage) == 0
@@ -0,0 +1,82 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+
+from obiguard_trace_python_sdk import langtrace
+from obiguard_trace_python_sdk.extensions.cost_exporter import CostSpanExporter
+from obiguard_trace_python_sdk.langtrace import LangtraceConfig, add_span_processor
+
+
+def test_project_lookup_does_not_block_span_processor(monkeypatch):
+    monkeypatch.setattr(langtrace, "_project_cache", {})
+    release = threading.Event()
+    looked_up = threading.Event()
+    response = MagicMock()
+    response.json.return_value = {"project": {"id": "1", "name": "test"}}
+
+    def slow_get(*args, **kwargs):
+        assert kwargs["timeout"] == langtrace.PROJECT_LOOKUP_TIMEOUT
+        release.wait(5)
+        looked_up.set()
+        return response
+
+    provider = MagicMock(spec=TracerProvider)
+    config = LangtraceConfig(api_key="test-key")
+
+    with patch("requests.get", side_effect=slow_get):
+        add_span_processor(provider, config, MagicMock())
+        provider.add_span_processor.assert_called_once()
+        assert not looked_up.is_set()
+
+        release.set()
+        assert looked_up.wait(5)
+
+    # The cached result is reused without another request.
+    with patch("requests.get") as get:
+        for _ in range(50):
+            if "test-key" in langtrace._project_cache:
+                break
+            time.sleep(0.1)
+        assert langtrace.get_project(config) == {"id": "1", "name": "test"}
+        get.assert_not_called()
+
+
+def test_failed_project_lookup_is_retried(monkeypatch):
+    monkeypatch.setattr(langtrace, "_project_cache", {})
+    response = MagicMock()
+    response.json.return_value = {"project": {"id": "1", "name": "test"}}
+    config = LangtraceConfig(api_key="test-key")
+
+    with patch("requests.get", side_effect=TimeoutError) as get:
+        assert langtrace.get_project(config) is None
+        assert langtrace.get_project(config) is None
+        assert get.call_count == 2
+
+    with patch("requests.get", return_value=response) as get:
+        assert langtrace.get_project(config) == {"id": "1", "name": "test"}
+        assert langtrace.get_project(config) == {"id": "1", "name": "test"}
+        get.assert_called_once()
+
+
+def test_costs_are_only_priced_behind_a_batch_processor(monkeypatch):
+    monkeypatch.setattr(langtrace, "get_project", lambda config: None)
+    exporter = MagicMock()
+
+    provider = MagicMock(spec=TracerProvider)
+    add_span_processor(provider, LangtraceConfig(api_key="test-key"), exporter)
+    (processor,), _ = provider.add_span_processor.call_args
+    assert isinstance(processor, BatchSpanProcessor)
+    assert isinstance(processor.span_exporter, CostSpanExporter)
+    processor.shutdown()
+
+    provider = MagicMock(spec=TracerProvider)
+    config = LangtraceConfig(
+        api_key="test-key", api_host="http://localhost:3000", batch=False
+    )
+    add_span_processor(provider, config, exporter)
+    (processor,), _ = provider.add_span_processor.call_args
+    assert isinstance(processor, SimpleSpanProcessor)
+    assert processor.span_exporter is exporter
@@ -0,0 +1,187 @@
+from types import SimpleNamespace as NS
+
+import pytest
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from obiguard_trace_python_sdk.bench.streaming import anthropic_stream, openai_chunk
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    LLM_USAGE_CACHE_CREATION_INPUT_TOKENS,
+    LLM_USAGE_CACHED_INPUT_TOKENS,
+)
+from obiguard_trace_python_sdk.instrumentation.aws_bedrock.patch import converse_usage
+from obiguard_trace_python_sdk.utils import prompt_cache
+from obiguard_trace_python_sdk.utils.llm import StreamWrapper, set_usage_attributes
+from obiguard_trace_python_sdk.utils.prompt_cache import prompt_cache_usage
+
+
+@pytest.mark.parametrize(
+    "usage, expected",
+    [
+        # OpenAI, object and dict
+        (
+            NS(prompt_tokens=2000, prompt_tokens_details=NS(cached_tokens=1536)),
+            (1536, None, 0),
+        ),
+        ({"prompt_tokens": 2000, "prompt_tokens_details": None}, (None, None, 0)),
+        # OpenAI Responses
+        (
+            NS(input_tokens=2000, input_tokens_details=NS(cached_tokens=1024)),
+            (1024, None, 0),
+        ),
+        # Anthropic
+        (
+            {
+                "input_tokens": 20,
+                "cache_read_input_tokens": 1800,
+                "cache_creation_input_tokens": 200,
+            },
+            (1800, 200, 2000),
+        ),
+        # LiteLLM reports Anthropic's fields within prompt_tokens
+        ({"prompt_tokens": 2020, "cache_read_input_tokens": 1800}, (1800, None, 0)),
+        # DeepSeek
+        ({"prompt_tokens": 900, "prompt_cache_hit_tokens": 640}, (640, None, 0)),
+        # Gemini
+        (NS(prompt_token_count=4096, cached_content_token_count=4000), (4000, None, 0)),
+        # Bedrock Converse
+        (
+            converse_usage(
+                {
+                    "inputTokens": 10,
+                    "outputTokens": 5,
+                    "cacheReadInputTokens": 1000,
+                    "cacheWriteInputTokens": 0,
+                }
+            ),
+            (1000, 0, 1000),
+        ),
+        ({"input_tokens": 10, "output_tokens": 5}, (None, None, 0)),
+        (None, (None, None, 0)),
+    ],
+)
+def test_cache_usage_is_read_from_each_provider_format(usage, expected):
+    assert prompt_cache_usage(usage) == expected
+
+
+@pytest.fixture
+def traced(monkeypatch):
+    reader = InMemoryMetricReader()
+    instruments = prompt_cache.get_prompt_cache_instruments(
+        MeterProvider(metric_readers=[reader])
+    )
+    monkeypatch.setattr(
+        prompt_cache, "get_prompt_cache_instruments", lambda: instruments
+    )
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer(__name__)
+
+    def start_span(system, model):
+        return tracer.start_span(
+            "chat",
+            attributes={
+                SpanAttributes.LLM_SYSTEM: system,
+                SpanAttributes.LLM_REQUEST_MODEL: model,
+            },
+        )
+
+    def metrics():
+        data = reader.get_metrics_data()
+        if data is None:
+            return {}
+        (resource_metrics,) = data.resource_metrics
+        (scope_metrics,) = resource_metrics.scope_metrics
+        return {
+            metric.name: metric.data.data_points for metric in scope_metrics.metrics
+        }
+
+    return start_span, exporter, metrics
+
+
+def test_anthropic_cache_tokens_are_part_of_the_prompt_tokens(traced):
+    start_span, exporter, metrics = traced
+    span = start_span("anthropic", "claude-sonnet-4")
+    usage = {
+        "input_tokens": 20,
+        "output_tokens": 50,
+        "cache_read_input_tokens": 1800,
+        "cache_creation_input_tokens": 180,
+    }
+
+    set_usage_attributes(span, usage)
+    # Instrumentors may set the usage of a span again; it is recorded once.
+    set_usage_attributes(span, usage)
+    span.end()
+
+    (finished,) = exporter.get_finished_spans()
+    assert finished.attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] == 2000
+    assert finished.attributes[SpanAttributes.LLM_USAGE_TOTAL_TOKENS] == 2050
+    assert finished.attributes[LLM_USAGE_CACHED_INPUT_TOKENS] == 1800
+    assert finished.attributes[LLM_USAGE_CACHE_CREATION_INPUT_TOKENS] == 180
+    points = metrics()
+    (hit_ratio,) = points["gen_ai.client.prompt_cache.hit_ratio"]
+    assert hit_ratio.count == 1
+    assert hit_ratio.sum == pytest.approx(0.9)
+    assert hit_ratio.attributes == {
+        SpanAttributes.LLM_SYSTEM: "anthropic",
+        SpanAttributes.LLM_REQUEST_MODEL: "claude-sonnet-4",
+    }
+    assert points["gen_ai.client.prompt_cache.input_tokens"][0].value == 2000
+    assert points["gen_ai.client.prompt_cache.cached_input_tokens"][0].value == 1800
+
+
+def test_streams_record_cache_usage_per_model(traced):
+    start_span, exporter, metrics = traced
+    usage = NS(
+        prompt_tokens=1000,
+        completion_tokens=2,
+        prompt_tokens_details=NS(cached_tokens=250),
+    )
+    for model in ("gpt-4o", "gpt-4o", "gpt-4o-mini"):
+        chunks = [openai_chunk("tok"), openai_chunk("tok", usage=usage)]
+        span = start_span("openai", model)
+        for _ in StreamWrapper(iter(chunks), span, vendor="openai"):
+            pass
+
+    chunks = anthropic_stream(10)
+    chunks[0].message.usage.cache_read_input_tokens = 300
+    chunks[0].message.usage.cache_creation_input_tokens = 0
+    for _ in StreamWrapper(
+        iter(chunks), start_span("anthropic", "claude-3-5-sonnet"), vendor="anthropic"
+    ):
+        pass
+
+    spans = exporter.get_finished_spans()
+    assert [span.attributes[LLM_USAGE_CACHED_INPUT_TOKENS] for span in spans] == [
+        250,
+        250,
+        250,
+        300,
+    ]
+    assert spans[-1].attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] == 312
+    hit_ratios = {
+        point.attributes[SpanAttributes.LLM_REQUEST_MODEL]: point
+        for point in metrics()["gen_ai.client.prompt_cache.hit_ratio"]
+    }
+    assert hit_ratios["gpt-4o"].count == 2
+    assert hit_ratios["gpt-4o"].sum == pytest.approx(0.5)
+    assert hit_ratios["gpt-4o-mini"].count == 1
+    assert hit_ratios["claude-3-5-sonnet"].sum == pytest.approx(300 / 312)
+
+
+def test_providers_without_cache_usage_record_nothing(traced):
+    start_span, exporter, metrics = traced
+    span = start_span("cohere", "command-r")
+
+    set_usage_attributes(span, {"input_tokens": 12, "output_tokens": 5})
+    span.end()
+
+    (finished,) = exporter.get_finished_spans()
+    assert LLM_USAGE_CACHED_INPUT_TOKENS not in finished.attributes
+    assert "gen_ai.client.prompt_cache.hit_ratio" not in metrics()
@@ -0,0 +1,70 @@
+import json
+
+from tiktoken import get_encoding
+
+from obiguard_trace_python_sdk.utils.llm import calculate_prompt_tokens_batch
+from obiguard_trace_python_sdk.utils.prompt_token_cache import (
+    ENCODE_BATCH_MIN,
+    PromptTokenCache,
+    prompt_token_cache,
+)
+
+ENCODING = "cl100k_base"
+
+
+def messages(turns):
+    history = []
+    for turn in range(turns):
+        history.append({"role": "user", "content": f"question {turn} <|endoftext|>"})
+        history.append({"role": "assistant", "content": f"answer {turn} 日本語"})
+    return [json.dumps(str(message)) for message in history]
+
+
+def test_counts_match_tiktoken():
+    pieces = messages(ENCODE_BATCH_MIN)
+    encoding = get_encoding(ENCODING)
+
+    counts = PromptTokenCache().count(pieces, ENCODING)
+
+    assert counts == [
+        len(encoding.encode(piece, disallowed_special=())) for piece in pieces
+    ]
+
+
+def test_history_is_counted_once_across_turns():
+    cache = PromptTokenCache()
+    cache.count(messages(1), ENCODING)
+
+    counts = cache.count(messages(2), ENCODING)
+
+    assert counts == PromptTokenCache().count(messages(2), ENCODING)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 4, 4)
+    assert stats["hit_rate"] == 2 / 6
+    assert stats["memory_bytes"] > 0
+
+
+def test_least_recently_used_counts_are_evicted():
+    cache = PromptTokenCache(maxsize=2)
+    cache.count(["a", "b"], ENCODING)
+    cache.count(["a"], ENCODING)
+
+    cache.count(["c"], ENCODING)
+    cache.count(["a", "b"], ENCODING)
+
+    assert cache.stats()["size"] == 2
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_batch_total_uses_the_cache_for_known_models():
+    prompt_token_cache.clear()
+    pieces = messages(2)
+
+    total = calculate_prompt_tokens_batch(pieces, "gpt-4")
+
+    assert total == sum(PromptTokenCache().count(pieces, ENCODING))
+    assert prompt_token_cache.stats()["misses"] == len(pieces)
+
+
+def test_batch_total_estimates_unknown_models():
+    assert calculate_prompt_tokens_batch(["one two", "three"], "unknown-model") == 3
@@ -0,0 +1,60 @@
+from opentelemetry import trace
+
+from obiguard_trace_python_sdk import reload_config
+from obiguard_trace_python_sdk.utils import runtime_config
+from obiguard_trace_python_sdk.utils.llm import set_event_completion
+from obiguard_trace_python_sdk.utils.runtime_config import RuntimeConfig, get_config
+
+
+def test_runtime_config_from_environ():
+    config = RuntimeConfig.from_environ(
+        {
+            "TRACE_PROMPT_COMPLETION_DATA": "False",
+            "LANGTRACE_SESSION_ID": "session-1",
+            "LANGTRACE_VALIDATE_SPAN_ATTRIBUTES": "TRUE",
+            "LANGTRACE_STREAM_CAPTURE_LIMIT": "4096",
+        }
+    )
+
+    assert config == RuntimeConfig(
+        trace_prompt_completion_data=False,
+        session_id="session-1",
+        validate_span_attributes=True,
+        stream_capture_limit=4096,
+    )
+    assert RuntimeConfig.from_environ({}) == RuntimeConfig()
+    for invalid in ["", "0", "-1", "lots"]:
+        config = RuntimeConfig.from_environ({"LANGTRACE_STREAM_CAPTURE_LIMIT": invalid})
+        assert config.stream_capture_limit is None
+
+    # Prompt and completion capture is only turned off by "false".
+    for value in ["true", "1", "yes", "True ", ""]:
+        config = RuntimeConfig.from_environ({"TRACE_PROMPT_COMPLETION_DATA": value})
+        assert config.trace_prompt_completion_data
+
+
+def test_environment_is_only_read_on_reload(monkeypatch):
+    monkeypatch.setattr(runtime_config, "_config", get_config())
+    monkeypatch.setenv("TRACE_PROMPT_COMPLETION_DATA", "false")
+    assert get_config().trace_prompt_completion_data
+
+    reload_config()
+    assert not get_config().trace_prompt_completion_data
+
+    reload_config(trace_prompt_completion_data=True)
+    assert get_config().trace_prompt_completion_data
+
+
+def test_completion_events_follow_reloaded_config(exporter, monkeypatch):
+    monkeypatch.setattr(runtime_config, "_config", get_config())
+    tracer = trace.get_tracer(__name__)
+
+    with tracer.start_as_current_span("enabled") as span:
+        set_event_completion(span, [{"role": "assistant", "content": "hi"}])
+    reload_config(trace_prompt_completion_data=False)
+    with tracer.start_as_current_span("disabled") as span:
+        set_event_completion(span, [{"role": "assistant", "content": "hi"}])
+
+    events = {s.name: s.events for s in exporter.get_finished_spans()}
+    assert len(events["enabled"]) == 1
+    assert events["disabled"] == ()
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock, patch
+
+from obiguard_trace_python_sdk.utils.sdk_version_checker import SDKVersionChecker
+
+
+def test_latest_version_is_shared_through_disk_cache(tmp_path):
+    cache_path = str(tmp_path / "version_check.json")
+    response = MagicMock()
+    response.json.return_value = {"tag_name": "99.0.0"}
+
+    with patch("requests.get", return_value=response) as get:
+        assert SDKVersionChecker(cache_path=cache_path).fetch_latest() == "99.0.0"
+        # A new checker (e.g. another process) reads the cached result.
+        checker = SDKVersionChecker(cache_path=cache_path)
+        assert checker.is_outdated()
+        assert get.call_count == 1
+
+
+def test_failed_lookup_is_cached(tmp_path):
+    cache_path = str(tmp_path / "version_check.json")
+
+    with patch("requests.get", side_effect=OSError("offline")) as get:
+        assert SDKVersionChecker(cache_path=cache_path).fetch_latest() is None
+        assert SDKVersionChecker(cache_path=cache_path).fetch_latest() is None
+        assert get.call_count == 1
+
+
+def test_check_in_background_does_not_block(tmp_path):
+    checker = SDKVersionChecker(cache_path=str(tmp_path / "version_check.json"))
+
+    with patch.object(checker, "check") as check:
+        thread = checker.check_in_background()
+        thread.join(timeout=5)
+
+    assert thread.daemon
+    check.assert_called_once()
@@ -3,6 +3,7 @@ import pytest
 from opentelemetry.trace import SpanKind
 from obiguard_trace_python_sdk.langtrace import LangtraceConfig
 from obiguard_trace_python_sdk.extensions.langtrace_exporter import LangTraceExporter
+from obiguard_trace_python_sdk.utils.runtime_config import reload_config
 from obiguard_trace_python_sdk.utils.with_root_span import with_langtrace_root_span
 from obiguard_trace_python_sdk.constants.exporter.langtrace_exporter import LANGTRACE_SESSION_ID_HEADER
 
@@ -10,6 +11,7 @@ def test_session_id_from_env(exporter):
     # Test session ID from environment variable
     test_session_id = "test-session-123"
     os.environ["LANGTRACE_SESSION_ID"] = test_session_id
+    reload_config()
 
     @with_langtrace_root_span()
     def test_function():
@@ -24,6 +26,7 @@ def test_session_id_from_env(exporter):
 
     # Cleanup
     del os.environ["LANGTRACE_SESSION_ID"]
+    reload_config()
 
 def test_session_id_in_config():
     # Test session ID through LangtraceConfig
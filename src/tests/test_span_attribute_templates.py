@@ -0,0 +1,25 @@
+import pytest
+from langtrace.trace_attributes import SpanAttributes
+
+from obiguard_trace_python_sdk.utils import get_sdk_version
+from obiguard_trace_python_sdk.utils.llm import get_langtrace_attributes
+
+
+def test_langtrace_attributes_template_is_shared():
+    template = get_langtrace_attributes("1.0.0", "OpenAI")
+
+    assert get_langtrace_attributes("1.0.0", "OpenAI") is template
+    assert get_langtrace_attributes("1.0.0", "Anthropic") is not template
+    assert template[SpanAttributes.LANGTRACE_VERSION] == get_sdk_version()
+    assert template[SpanAttributes.LLM_SYSTEM] == "openai"
+
+
+def test_langtrace_attributes_template_is_read_only():
+    template = get_langtrace_attributes("1.0.0", "OpenAI")
+
+    with pytest.raises(TypeError):
+        template[SpanAttributes.LLM_SYSTEM] = "other"
+
+    attributes = {**template, SpanAttributes.LLM_SYSTEM: "other"}
+    assert template[SpanAttributes.LLM_SYSTEM] == "openai"
+    assert attributes[SpanAttributes.LLM_SYSTEM] == "other"
@@ -0,0 +1,53 @@
+import pytest
+from langtrace.trace_attributes import DatabaseSpanAttributes, LLMSpanAttributes
+from pydantic import ValidationError
+
+from obiguard_trace_python_sdk.utils import runtime_config
+from obiguard_trace_python_sdk.utils.span_attributes import build_span_attributes
+
+LLM_ATTRIBUTES = {
+    "langtrace.sdk.name": "obiguard-trace-python-sdk",
+    "langtrace.service.name": "OpenAI",
+    "langtrace.service.type": "llm",
+    "langtrace.version": "1.0.0",
+    "url.full": "https://api.openai.com/v1/",
+    "url.path": "/chat/completions",
+    "gen_ai.operation.name": "chat",
+    "gen_ai.request.model": "gpt-4o",
+    "gen_ai.request.temperature": 0.5,
+    "gen_ai.request.top_k": None,
+    "custom.attribute": "value",
+}
+
+
+def test_build_span_attributes_matches_model_dump():
+    expected = {
+        key: value
+        for key, value in LLMSpanAttributes(**LLM_ATTRIBUTES)
+        .model_dump(by_alias=True)
+        .items()
+        if value is not None
+    }
+
+    assert build_span_attributes(LLMSpanAttributes, LLM_ATTRIBUTES) == expected
+
+
+def test_build_span_attributes_maps_field_names_to_aliases():
+    attributes = build_span_attributes(
+        DatabaseSpanAttributes, {"db_system": "chromadb", "db.query": "{}"}
+    )
+
+    assert attributes == {"db.system": "chromadb", "db.query": "{}"}
+
+
+def test_build_span_attributes_validates_when_enabled(monkeypatch):
+    incomplete = {"langtrace.service.name": "OpenAI"}
+    assert build_span_attributes(LLMSpanAttributes, incomplete) == incomplete
+
+    monkeypatch.setattr(
+        runtime_config,
+        "_config",
+        runtime_config.get_config()._replace(validate_span_attributes=True),
+    )
+    with pytest.raises(ValidationError):
+        build_span_attributes(LLMSpanAttributes, incomplete)
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+from opentelemetry.trace import INVALID_SPAN
+
+from obiguard_trace_python_sdk import reload_config
+from obiguard_trace_python_sdk.bench.streaming import openai_stream
+from obiguard_trace_python_sdk.utils import runtime_config
+from obiguard_trace_python_sdk.utils.llm import StreamWrapper
+from obiguard_trace_python_sdk.utils.stream_capture import (
+    TRUNCATION_MARKER,
+    StreamCapture,
+)
+
+
+def test_unlimited_capture_keeps_everything():
+    capture = StreamCapture(limit=0)
+    for piece in ["Hello", ", ", "world"]:
+        capture.append(piece)
+
+    assert capture.text() == "Hello, world"
+    assert capture.truncated == 0
+    assert capture.appended == 3
+    assert capture.last == "world"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_limited_capture_keeps_head_and_tail(seed):
+    rng = random.Random(seed)
+    limit = rng.randint(1, 200)
+    pieces = ["".join(rng.choices("abcdef", k=rng.randint(0, 40))) for _ in range(50)]
+
+    capture = StreamCapture(limit=limit)
+    for piece in pieces:
+        capture.append(piece)
+
+    full = "".join(pieces)
+    head, tail = limit // 2, limit - limit // 2
+    if len(full) <= limit:
+        assert capture.text() == full
+    else:
+        dropped = len(full) - limit
+        assert capture.truncated == dropped
+        assert capture.text() == (
+            full[:head] + TRUNCATION_MARKER.format(dropped) + full[-tail:]
+        )
+    assert capture._tail_size <= tail
+
+
+def test_stream_wrapper_uses_the_configured_limit(monkeypatch):
+    monkeypatch.setattr(runtime_config, "_config", runtime_config.get_config())
+    reload_config(stream_capture_limit=10)
+
+    wrapper = StreamWrapper(iter(openai_stream(100)), INVALID_SPAN, vendor="openai")
+    for _ in wrapper:
+        pass
+
+    assert wrapper.result_content.text() == (
+        "tokto" + TRUNCATION_MARKER.format(287) + "oktok"
+    )
+    assert wrapper.completion_tokens == 100
@@ -0,0 +1,65 @@
+import pytest
+from opentelemetry.trace import INVALID_SPAN
+
+from obiguard_trace_python_sdk.bench.streaming import STREAMS
+from obiguard_trace_python_sdk.utils.llm import StreamWrapper, detect_stream_vendor
+
+
+def consume(chunks, vendor):
+    wrapper = StreamWrapper(iter(chunks), INVALID_SPAN, vendor=vendor)
+    for _ in wrapper:
+        pass
+    return wrapper
+
+
+@pytest.mark.parametrize("vendor", sorted(STREAMS))
+def test_vendor_processor_matches_generic_processor(vendor):
+    chunks = STREAMS[vendor](5)
+
+    specialized = consume(chunks, vendor)
+    generic = consume(chunks, "generic")
+
+    assert specialized.result_content.text() == generic.result_content.text()
+    assert specialized.prompt_tokens == generic.prompt_tokens == 12
+    assert specialized.completion_tokens == generic.completion_tokens == 5
+
+
+@pytest.mark.parametrize("vendor", sorted(STREAMS))
+def test_vendor_is_detected_from_the_first_chunk(vendor):
+    chunks = STREAMS[vendor](5)
+
+    assert detect_stream_vendor(chunks[0]) == vendor
+    wrapper = consume(chunks, None)
+    assert wrapper._chunk_processor is StreamWrapper.CHUNK_PROCESSORS[vendor]
+
+
+def test_unknown_chunks_fall_back_to_the_generic_processor():
+    wrapper = consume([object()], None)
+
+    assert wrapper._chunk_processor is StreamWrapper.process_generic_chunk
+
+
+class AsyncStream:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("vendor", sorted(STREAMS))
+async def test_async_stream_matches_sync_stream(vendor):
+    chunks = STREAMS[vendor](5)
+
+    sync = consume(chunks, vendor)
+    wrapper = StreamWrapper(AsyncStream(chunks), INVALID_SPAN, vendor=vendor)
+    received = [chunk async for chunk in wrapper]
+
+    assert received == chunks
+    assert wrapper.result_content.text() == sync.result_content.text()
+    assert wrapper.prompt_tokens == sync.prompt_tokens
+    assert wrapper.completion_tokens == sync.completion_tokens
@@ -0,0 +1,107 @@
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from obiguard_trace_python_sdk.bench.streaming import openai_stream
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    LLM_INTER_CHUNK_GAP_MAX,
+    LLM_INTER_CHUNK_GAP_P50,
+    LLM_INTER_CHUNK_GAP_P99,
+    LLM_TIME_TO_FIRST_CHUNK,
+    LLM_TIME_TO_FIRST_TOKEN,
+    LLM_TOKENS_PER_SECOND,
+)
+from obiguard_trace_python_sdk.utils import stream_timing
+from obiguard_trace_python_sdk.utils.llm import StreamWrapper
+from obiguard_trace_python_sdk.utils.stream_timing import MAX_GAP_SAMPLES, StreamTimer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(stream_timing, "perf_counter", clock)
+    return clock
+
+
+def test_stream_timer_attributes(clock):
+    timer = StreamTimer()
+    for at, has_content in ((0.5, False), (0.75, True), (1.0, True), (2.0, True)):
+        clock.now = at
+        timer.chunk()
+        if has_content:
+            timer.content()
+
+    assert timer.attributes(output_tokens=25) == {
+        LLM_TIME_TO_FIRST_CHUNK: 0.5,
+        LLM_TIME_TO_FIRST_TOKEN: 0.75,
+        LLM_TOKENS_PER_SECOND: 20.0,
+        LLM_INTER_CHUNK_GAP_P50: 0.25,
+        LLM_INTER_CHUNK_GAP_P99: 1.0,
+        LLM_INTER_CHUNK_GAP_MAX: 1.0,
+    }
+
+
+def test_stream_timer_keeps_a_fixed_number_of_gaps(clock):
+    timer = StreamTimer()
+    timer.chunk()
+    clock.now = 10.0
+    timer.chunk()
+    for _ in range(MAX_GAP_SAMPLES):
+        clock.now += 0.01
+        timer.chunk()
+
+    assert len(timer.gaps()) == MAX_GAP_SAMPLES
+    attributes = timer.attributes()
+    assert attributes[LLM_INTER_CHUNK_GAP_MAX] == 10.0
+    assert attributes[LLM_INTER_CHUNK_GAP_P99] == pytest.approx(0.01)
+    assert LLM_TIME_TO_FIRST_TOKEN not in attributes
+
+
+def test_stream_wrapper_records_timing_attributes_and_metrics(monkeypatch):
+    reader = InMemoryMetricReader()
+    meter_provider = MeterProvider(metric_readers=[reader])
+    instruments = stream_timing.get_stream_instruments(meter_provider)
+    monkeypatch.setattr(stream_timing, "get_stream_instruments", lambda: instruments)
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+    span = tracer_provider.get_tracer(__name__).start_span(
+        "stream", attributes={"gen_ai.system": "openai"}
+    )
+
+    for _ in StreamWrapper(iter(openai_stream(10)), span, vendor="openai"):
+        pass
+
+    (finished,) = exporter.get_finished_spans()
+    for key in (
+        LLM_TIME_TO_FIRST_CHUNK,
+        LLM_TIME_TO_FIRST_TOKEN,
+        LLM_INTER_CHUNK_GAP_MAX,
+    ):
+        assert finished.attributes[key] >= 0
+
+    (resource_metrics,) = reader.get_metrics_data().resource_metrics
+    (scope_metrics,) = resource_metrics.scope_metrics
+    points = {
+        metric.name: metric.data.data_points[0] for metric in scope_metrics.metrics
+    }
+    # One point per stream, not one per gap.
+    for statistic in ("p50", "p99", "max"):
+        assert points[f"gen_ai.client.stream.inter_chunk_gap.{statistic}"].count == 1
+    assert points["gen_ai.client.stream.inter_chunk_gap.max"].max == (
+        finished.attributes[LLM_INTER_CHUNK_GAP_MAX]
+    )
+    assert points["gen_ai.client.stream.time_to_first_chunk"].attributes == {
+        "gen_ai.system": "openai"
+    }
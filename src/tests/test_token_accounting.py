@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+from langtrace.trace_attributes import SpanAttributes
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from obiguard_trace_python_sdk.bench.streaming import (
+    openai_stream,
+    openai_stream_without_usage,
+)
+from obiguard_trace_python_sdk import reload_config
+from obiguard_trace_python_sdk.utils import llm, runtime_config, token_accounting
+from obiguard_trace_python_sdk.utils.llm import StreamWrapper, count_prompt_tokens
+from obiguard_trace_python_sdk.utils.token_accounting import (
+    TokenAccountingSpanProcessor,
+    defers_token_counts,
+)
+from obiguard_trace_python_sdk.utils.tokenizers import model_encoding
+
+PROMPT = ['{"role": "user", "content": "Hello there"}']
+
+
+@pytest.fixture
+def deferred():
+    exporter = InMemorySpanExporter()
+    processor = TokenAccountingSpanProcessor(SimpleSpanProcessor(exporter))
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    yield provider.get_tracer(__name__), processor, exporter
+    processor.shutdown()
+
+
+def read_stream(tracer, chunks):
+    span = tracer.start_span("stream")
+    prompt_tokens, estimated = count_prompt_tokens(PROMPT, "gpt-4", span)
+    wrapper = StreamWrapper(
+        iter(chunks),
+        span,
+        prompt_tokens,
+        vendor="openai",
+        prompt_tokens_estimated=estimated,
+    )
+    for _ in wrapper:
+        pass
+    return wrapper
+
+
+def test_streams_are_counted_off_the_request_thread(deferred, monkeypatch):
+    tracer, processor, exporter = deferred
+    caller = threading.get_ident()
+    estimate = llm.estimate_tokens_using_tiktoken
+
+    def off_thread(*args):
+        assert threading.get_ident() != caller
+        return estimate(*args)
+
+    monkeypatch.setattr(llm, "estimate_tokens_using_tiktoken", off_thread)
+    chunks = openai_stream_without_usage(100)
+
+    wrapper = read_stream(tracer, chunks)
+    assert processor.force_flush()
+
+    assert wrapper.prompt_tokens is None
+    assert wrapper._token_counter is None
+    (span,) = exporter.get_finished_spans()
+    prompt_tokens, _ = count_prompt_tokens(PROMPT, "gpt-4")
+    completion = "".join(chunk.choices[0].delta.content for chunk in chunks)
+    completion_tokens = estimate(completion, model_encoding(chunks[0].model)[0])
+    assert span.attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] == prompt_tokens
+    assert (
+        span.attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS]
+        == completion_tokens
+    )
+    assert (
+        span.attributes[SpanAttributes.LLM_USAGE_TOTAL_TOKENS]
+        == prompt_tokens + completion_tokens
+    )
+    assert not token_accounting._pending
+
+
+def test_reported_usage_is_not_counted_again(deferred):
+    tracer, processor, exporter = deferred
+
+    read_stream(tracer, openai_stream(10))
+    assert processor.force_flush()
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] == 12
+    assert span.attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS] == 10
+    assert not token_accounting._pending
+
+
+def test_prompts_are_counted_inline_without_a_processor():
+    span = TracerProvider().get_tracer(__name__).start_span("stream")
+
+    prompt_tokens, _ = count_prompt_tokens(PROMPT, "gpt-4", span)
+
+    assert not defers_token_counts(span)
+    assert prompt_tokens == count_prompt_tokens(PROMPT, "gpt-4")[0]
+
+
+def test_shutdown_stops_deferring():
+    exporter = InMemorySpanExporter()
+    processor = TokenAccountingSpanProcessor(SimpleSpanProcessor(exporter))
+    span = TracerProvider().get_tracer(__name__).start_span("stream")
+    assert defers_token_counts(span)
+
+    processor.shutdown()
+
+    assert not defers_token_counts(span)
+
+
+def test_streams_counted_inline_keep_their_completion_tokens(deferred, monkeypatch):
+    tracer, processor, exporter = deferred
+    monkeypatch.setattr(runtime_config, "_config", runtime_config.get_config())
+    reload_config(stream_capture_limit=100000)
+    chunks = openai_stream_without_usage(50)
+
+    wrapper = read_stream(tracer, chunks)
+    assert processor.force_flush()
+
+    completion_tokens = wrapper.completion_tokens
+    assert completion_tokens > 0
+    (span,) = exporter.get_finished_spans()
+    prompt_tokens, _ = count_prompt_tokens(PROMPT, "gpt-4")
+    assert span.attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] == prompt_tokens
+    assert (
+        span.attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS]
+        == completion_tokens
+    )
+    assert (
+        span.attributes[SpanAttributes.LLM_USAGE_TOTAL_TOKENS]
+        == prompt_tokens + completion_tokens
+    )
+    assert not token_accounting._pending
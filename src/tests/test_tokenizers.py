@@ -0,0 +1,105 @@
+import os
+import shutil
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from obiguard_trace_python_sdk import reload_config
+from obiguard_trace_python_sdk.bench.streaming import openai_chunk
+from obiguard_trace_python_sdk.constants.instrumentation.common import (
+    LLM_USAGE_TOKENS_ESTIMATED,
+)
+from obiguard_trace_python_sdk.utils import runtime_config, tokenizers
+from obiguard_trace_python_sdk.utils.llm import StreamWrapper, count_prompt_tokens
+from obiguard_trace_python_sdk.utils.tokenizers import (
+    _cached_bpe_file,
+    load_encoding,
+    model_encoding,
+    resolve_encoding,
+)
+
+DEFAULT_CACHE_DIR = tokenizers.tokenizer_cache_dir()
+
+
+@pytest.mark.parametrize(
+    "model, encoding_name",
+    [
+        ("gpt-4o", "o200k_base"),
+        ("gpt-4o-mini-2024-07-18", "o200k_base"),
+        ("openai/gpt-4o-mini", "o200k_base"),
+        ("ft:gpt-4o-mini:acme::abc123", "o200k_base"),
+        ("o3-mini", "o200k_base"),
+        ("gpt-4-turbo", "cl100k_base"),
+        ("gpt-3.5-turbo", "cl100k_base"),
+        ("llama-3.1-8b-instant", None),
+        (None, None),
+    ],
+)
+def test_models_resolve_by_name_prefix_and_family(model, encoding_name):
+    assert resolve_encoding(model) == encoding_name
+
+
+@pytest.fixture
+def empty_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(runtime_config, "_config", runtime_config.get_config())
+    monkeypatch.setattr(tokenizers, "_encodings", {})
+    reload_config(tokenizer_cache_dir=str(tmp_path))
+    return tmp_path
+
+
+def test_missing_bpe_file_is_not_fetched(empty_cache_dir, monkeypatch):
+    def fail(name):
+        raise AssertionError(f"{name} was loaded")
+
+    monkeypatch.setattr(tokenizers, "get_encoding", fail)
+
+    assert load_encoding("o200k_base") is None
+    assert model_encoding("gpt-4o") == (None, False)
+
+
+def test_encoding_is_loaded_from_the_cache_dir_once(empty_cache_dir):
+    source = _cached_bpe_file("cl100k_base", DEFAULT_CACHE_DIR)
+    if not os.path.exists(source):
+        pytest.skip("cl100k_base is not cached on this machine")
+    shutil.copy(source, _cached_bpe_file("cl100k_base", str(empty_cache_dir)))
+
+    encoding = load_encoding("cl100k_base")
+
+    assert encoding is not None
+    assert load_encoding("cl100k_base") is encoding
+    assert model_encoding("gpt-4") == ("cl100k_base", True)
+    assert model_encoding("llama-3.1-8b-instant") == ("cl100k_base", False)
+
+
+def test_unknown_models_are_flagged_as_estimated():
+    _, estimated = count_prompt_tokens(["Hello there"], "llama-3.1-8b-instant")
+
+    assert estimated
+
+
+@pytest.mark.parametrize("model", ["gpt-4", "llama-3.1-8b-instant"])
+def test_stream_without_usage_flags_estimated_counts(model):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    span = provider.get_tracer(__name__).start_span("stream")
+    chunks = [openai_chunk(" tok") for _ in range(10)]
+    for chunk in chunks:
+        chunk.model = model
+    prompt_tokens, estimated = count_prompt_tokens(["Hello there"], model)
+
+    wrapper = StreamWrapper(
+        iter(chunks),
+        span,
+        prompt_tokens,
+        vendor="openai",
+        prompt_tokens_estimated=estimated,
+    )
+    for _ in wrapper:
+        pass
+
+    (finished,) = exporter.get_finished_spans()
+    _, exact = model_encoding(model)
+    assert finished.attributes.get(LLM_USAGE_TOKENS_ESTIMATED, False) is not exact
@@ -0,0 +1,102 @@
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON
+from opentelemetry.trace import StatusCode
+
+from obiguard_trace_python_sdk.instrumentation.chroma import patch as chroma_patch
+from obiguard_trace_python_sdk.instrumentation.openai import patch as openai_patch
+from obiguard_trace_python_sdk.utils.llm import StreamWrapper
+
+
+class FakeClient:
+    class _client:
+        base_url = "https://api.openai.com/v1/"
+
+
+class FakeCollection:
+    name = "collection"
+
+
+def get_tracer(sampler):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(sampler=sampler)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider.get_tracer(__name__), exporter
+
+
+def test_dropped_span_skips_attribute_construction(monkeypatch):
+    calls = []
+
+    def counting_request_attributes(*args, **kwargs):
+        calls.append(1)
+        return {}
+
+    monkeypatch.setattr(
+        openai_patch, "get_llm_request_attributes", counting_request_attributes
+    )
+    tracer, exporter = get_tracer(ALWAYS_OFF)
+    stream = iter(["chunk"])
+    traced = openai_patch.chat_completions_create("1.0.0", tracer)
+
+    result = traced(
+        lambda **kwargs: stream,
+        FakeClient(),
+        (),
+        {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}], "stream": True},
+    )
+
+    assert result is stream
+    assert not isinstance(result, StreamWrapper)
+    assert calls == []
+    assert exporter.get_finished_spans() == ()
+
+
+def test_dropped_span_still_runs_the_wrapped_call():
+    tracer, exporter = get_tracer(ALWAYS_OFF)
+    traced = chroma_patch.collection_patch("ADD", "1.0.0", tracer)
+
+    assert traced(lambda **kwargs: "added", FakeCollection(), (), {"ids": ["1"]}) == "added"
+    assert exporter.get_finished_spans() == ()
+
+
+def test_sampled_span_is_recorded():
+    tracer, exporter = get_tracer(ALWAYS_ON)
+    traced = chroma_patch.collection_patch("ADD", "1.0.0", tracer)
+
+    assert traced(lambda **kwargs: "added", FakeCollection(), (), {"ids": ["1"]}) == "added"
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 1
+    assert spans[0].attributes["db.system"] == "chromadb"
+    assert spans[0].attributes["db.collection.name"] == "collection"
+
+
+def test_span_is_ended_when_its_attributes_cannot_be_built(monkeypatch):
+    def failing_request_attributes(*args, **kwargs):
+        raise ValueError("bad request")
+
+    monkeypatch.setattr(
+        openai_patch, "get_llm_request_attributes", failing_request_attributes
+    )
+    tracer, exporter = get_tracer(ALWAYS_ON)
+    traced = openai_patch.chat_completions_create("1.0.0", tracer)
+
+    with pytest.raises(ValueError):
+        traced(lambda **kwargs: None, FakeClient(), (), {"model": "gpt-4o"})
+
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 1
+    assert spans[0].status.status_code == StatusCode.ERROR
+
+
+def test_span_is_ended_when_its_query_cannot_be_serialized():
+    tracer, exporter = get_tracer(ALWAYS_ON)
+    traced = chroma_patch.collection_patch("ADD", "1.0.0", tracer)
+
+    with pytest.raises(TypeError):
+        traced(lambda **kwargs: "added", FakeCollection(), (), {"ids": object()})
+
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 1
+    assert spans[0].status.status_code == StatusCode.ERROR